@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Compare benchmark results (from ``run.py --output``) against a baseline.
+
+Every benchmark in both files is listed with the ratio of its median time to
+the baseline's.  Benchmarks slower than the baseline by more than the
+threshold are flagged as regressions and the exit status is 1 if there are
+any.
+
+Usage::
+
+    python benchmarks/compare.py [--threshold FRACTION] BASELINE RESULTS
+
+'''
+
+import argparse
+import json
+import sys
+
+
+def load(file_name):
+    with open(file_name) as fh:
+        return json.load(fh)['results']
+
+
+def compare(baseline, results, threshold):
+    '''Return a list of (key, baseline median, median, ratio, regressed).'''
+
+    comparisons = []
+
+    for key in sorted(set(baseline.keys()) & set(results.keys())):
+        before = baseline[key]['median']
+        after = results[key]['median']
+
+        ratio = after / before if before else float('inf')
+
+        comparisons.append(( key, before, after, ratio, ratio > 1 + threshold ))
+
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n\n')[0])
+    parser.add_argument('--threshold', type = float, default = 0.1, help = 'fraction slower than the baseline that is a regression (default: 0.1)')
+    parser.add_argument('baseline')
+    parser.add_argument('results')
+    arguments = parser.parse_args()
+
+    baseline = load(arguments.baseline)
+    results = load(arguments.results)
+
+    regressions = 0
+
+    for key, before, after, ratio, regressed in compare(baseline, results, arguments.threshold):
+        regressions += regressed
+
+        print('{:<45} {:>12.3f}µs {:>12.3f}µs {:>7.2f}x{}'.format(key, before * 1e6, after * 1e6, ratio, '  REGRESSION' if regressed else ''))
+
+    for key in sorted(set(baseline.keys()) - set(results.keys())):
+        print('{:<45} missing from {}'.format(key, arguments.results))
+
+    print('{} regression(s) (threshold {:.0%})'.format(regressions, arguments.threshold))
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
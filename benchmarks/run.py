@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Measure registration, parsing, lookups, and re-reads at scale.
+
+Each benchmark is run for every combination of its sizes and reported as the
+median (and minimum) time per operation over several repeats.  Results are
+printed and, if ``--output`` is given, written as JSON for ``compare.py``.
+
+Benchmarks:
+
+:``add_parameter``:   Registering N parameters.
+:``parse``:           Parsing an argv with a value for each of N parameters.
+:``lookup_cold``:     First lookup of each of N parameters from F files.
+:``lookup_hot``:      Repeated lookups of a parameter from F files.
+:``lookup_inotify``:  Repeated lookups with inotify watching F files (skipped
+                      if pyinotify is not available).
+:``snapshot``:        Resolving all N parameters together.
+:``complete``:        Completing an option from the index of N parameters.
+:``reload``:          ``read_configuration_files`` with F files.
+
+Usage::
+
+    python benchmarks/run.py [--quick] [--repeat N] [--filter NAME]
+                             [--output FILE]
+
+'''
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crumbs import Parameters  # noqa: E402
+from crumbs import _pyinotify_loaded  # noqa: E402
+from crumbs.completion import complete  # noqa: E402
+from crumbs.completion import index  # noqa: E402
+
+PARAMETERS = ( 10, 100, 1000, 10000 )
+FILES = ( 1, 10, 50 )
+
+QUICK_PARAMETERS = ( 10, 100 )
+QUICK_FILES = ( 1, 10 )
+
+
+def generate(directory, files, parameters):
+    '''Write the configuration files and return their names.
+
+    Parameters are spread over 10 groups ('group0' … 'group9') with options
+    'option0' … 'optionN' and every file sets every parameter (the last file
+    wins).
+
+    '''
+
+    file_names = []
+
+    for f in range(files):
+        file_name = os.path.join(directory, 'crumbs{}.ini'.format(f))
+
+        with open(file_name, 'w') as fh:
+            for g in range(10):
+                fh.write('[group{}]\n'.format(g))
+
+                for p in range(g, parameters, 10):
+                    fh.write('option{} = value {}\n'.format(p, f))
+
+                fh.write('\n')
+
+        file_names.append(file_name)
+
+    return file_names
+
+
+def build(parameters, file_names = (), **kwargs):
+    p = Parameters(**kwargs)
+
+    for _ in range(parameters):
+        p.add_parameter(group = 'group{}'.format(_ % 10), options = [ '--option{}'.format(_) ])
+
+    for file_name in file_names:
+        p.add_configuration_file(file_name)
+
+    return p
+
+
+def names(parameters):
+    return [ 'group{}.option{}'.format(_ % 10, _) for _ in range(parameters) ]
+
+
+def bench_add_parameter(directory, parameters):
+    def _():
+        build(parameters)
+
+    return _, parameters
+
+
+def bench_parse(directory, parameters):
+    argv = [ 'crumbs' ]
+    for _ in range(parameters):
+        argv.extend([ '--group{}-option{}'.format(_ % 10, _), 'argument' ])
+
+    p = build(parameters)
+
+    def _():
+        original_argv, sys.argv = sys.argv, argv
+
+        try:
+            p.parse()
+        finally:
+            sys.argv = original_argv
+
+    return _, 1
+
+
+def bench_lookup_cold(directory, parameters, files):
+    file_names = generate(directory, files, parameters)
+    keys = names(parameters)
+
+    def _():
+        p = build(parameters, file_names)
+        p.parse()
+
+        for key in keys:
+            p[key]
+
+    return _, parameters
+
+
+def bench_lookup_hot(directory, parameters, files, **kwargs):
+    file_names = generate(directory, files, parameters)
+
+    p = build(parameters, file_names, **kwargs)
+    p.parse()
+
+    key = names(parameters)[-1]
+    p[key]
+
+    def _():
+        for __ in range(1000):
+            p[key]
+
+    return _, 1000
+
+
+def bench_lookup_inotify(directory, parameters, files):
+    return bench_lookup_hot(directory, parameters, files, inotify = True)
+
+
+def bench_snapshot(directory, parameters):
+    file_names = generate(directory, 1, parameters)
+
+    p = build(parameters, file_names)
+    p.parse()
+
+    def _():
+        p.snapshot()
+
+    return _, 1
+
+
+def bench_complete(directory, parameters):
+    data = index(build(parameters))
+
+    def _():
+        complete(data, [ '--group1-option1' ])
+
+    return _, 1
+
+
+def bench_reload(directory, parameters, files):
+    file_names = generate(directory, files, parameters)
+
+    p = build(parameters, file_names)
+    p.parse()
+
+    def _():
+        p.read_configuration_files()
+        p[names(parameters)[-1]]
+
+    return _, 1
+
+
+def benchmarks(quick = False):
+    '''Yield (name, function, arguments) for every benchmark to run.'''
+
+    parameters = QUICK_PARAMETERS if quick else PARAMETERS
+    files = QUICK_FILES if quick else FILES
+
+    for n in parameters:
+        yield 'add_parameter', bench_add_parameter, { 'parameters': n }
+        yield 'parse', bench_parse, { 'parameters': n }
+        yield 'snapshot', bench_snapshot, { 'parameters': n }
+        yield 'complete', bench_complete, { 'parameters': n }
+
+    for n in parameters:
+        for f in files:
+            if n * f > 50000:
+                continue
+
+            yield 'lookup_cold', bench_lookup_cold, { 'parameters': n, 'files': f }
+            yield 'lookup_hot', bench_lookup_hot, { 'parameters': n, 'files': f }
+
+            if _pyinotify_loaded:
+                yield 'lookup_inotify', bench_lookup_inotify, { 'parameters': n, 'files': f }
+
+            yield 'reload', bench_reload, { 'parameters': n, 'files': f }
+
+
+def measure(function, operations, repeat):
+    '''Return the per operation times of ``repeat`` calls of the function.'''
+
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter() if hasattr(time, 'perf_counter') else time.time()
+        function()
+        stop = time.perf_counter() if hasattr(time, 'perf_counter') else time.time()
+
+        times.append((stop - start) / operations)
+
+    return times
+
+
+def key(name, arguments):
+    return ' '.join([ name ] + [ '{}={}'.format(_, arguments[_]) for _ in sorted(arguments.keys()) ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n\n')[0])
+    parser.add_argument('--quick', action = 'store_true', help = 'only run the smaller sizes')
+    parser.add_argument('--repeat', type = int, default = 5)
+    parser.add_argument('--filter', action = 'append', default = [], help = 'only run benchmarks with this name')
+    parser.add_argument('--output', help = 'write the results as JSON to this file')
+    arguments = parser.parse_args()
+
+    # Parameters.parse reads sys.argv.
+    sys.argv[1:] = []
+
+    results = {}
+
+    for name, benchmark, benchmark_arguments in benchmarks(arguments.quick):
+        if arguments.filter and name not in arguments.filter:
+            continue
+
+        directory = tempfile.mkdtemp()
+
+        try:
+            function, operations = benchmark(directory, **benchmark_arguments)
+            times = measure(function, operations, arguments.repeat)
+        finally:
+            shutil.rmtree(directory)
+
+        times.sort()
+
+        result = {
+            'name': name,
+            'arguments': benchmark_arguments,
+            'median': times[len(times) // 2],
+            'min': times[0],
+            'times': times,
+        }
+
+        results[key(name, benchmark_arguments)] = result
+
+        print('{:<45} {:>12.3f}µs (min {:.3f}µs)'.format(key(name, benchmark_arguments), result['median'] * 1e6, result['min'] * 1e6))
+        sys.stdout.flush()
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as fh:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'time': time.time(),
+                'results': results,
+            }, fh, indent = 2, sort_keys = True)
+
+
+if __name__ == '__main__':
+    main()
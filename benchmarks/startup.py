@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Compare CLI startup with a cold and a warm configuration cache.
+
+Generates configuration files in a temporary directory and repeatedly runs a
+fresh interpreter that registers the files with ``Parameters``, parses, and
+looks up a value.  Cold runs remove the cache before each run; warm runs reuse
+the cache written by the previous run.
+
+Usage::
+
+    python benchmarks/startup.py [--files N] [--sections N] [--options N]
+                                 [--runs N]
+
+'''
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PROGRAM = '''
+import sys
+from crumbs import Parameters
+
+cache_name, file_names, sys.argv[1:] = sys.argv[1], sys.argv[2:], []
+
+p = Parameters(configuration_cache = cache_name or None)
+p.add_parameter(group = 'section0', options = [ '--option0' ])
+
+for file_name in file_names:
+    p.add_configuration_file(file_name)
+
+p.parse()
+p['section0.option0']
+'''
+
+
+def generate(directory, files, sections, options):
+    file_names = []
+
+    for f in range(files):
+        file_name = os.path.join(directory, 'crumbs{}.ini'.format(f))
+
+        with open(file_name, 'w') as fh:
+            for s in range(sections):
+                fh.write('[section{}]\n'.format(s))
+
+                for o in range(options):
+                    fh.write('option{} = value {} %(here)s\n'.format(o, f))
+
+                fh.write('here = {}\n\n'.format(directory))
+
+        file_names.append(file_name)
+
+    return file_names
+
+
+def run(cache_name, file_names):
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join([ os.path.dirname(os.path.dirname(os.path.abspath(__file__))), environment.get('PYTHONPATH', '') ])
+
+    start = time.time()
+    subprocess.check_call([ sys.executable, '-c', PROGRAM, cache_name ] + file_names, env = environment)
+    return time.time() - start
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split('\n\n')[0])
+    parser.add_argument('--files', type = int, default = 10)
+    parser.add_argument('--sections', type = int, default = 50)
+    parser.add_argument('--options', type = int, default = 50)
+    parser.add_argument('--runs', type = int, default = 5)
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+
+    try:
+        file_names = generate(directory, arguments.files, arguments.sections, arguments.options)
+        cache_name = os.path.join(directory, 'crumbs.cache')
+
+        results = {}
+
+        results['no cache'] = [ run('', file_names) for _ in range(arguments.runs) ]
+
+        cold = []
+        for _ in range(arguments.runs):
+            if os.path.exists(cache_name):
+                os.remove(cache_name)
+
+            cold.append(run(cache_name, file_names))
+        results['cold cache'] = cold
+
+        results['warm cache'] = [ run(cache_name, file_names) for _ in range(arguments.runs) ]
+
+        print('{} files × {} sections × {} options'.format(arguments.files, arguments.sections, arguments.options))
+
+        for name in ( 'no cache', 'cold cache', 'warm cache' ):
+            print('{:>10}: {:.3f}s (median of {})'.format(name, median(results[name]), arguments.runs))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,10 @@
 
 :``Parameters``:        Queryable collection of parameters whose values are set
                         by the user.
+:``Source``:            Base class for providers of parameter values (cf.
+                        ``Parameters.add_source``).
+:``ValidationError``:   Parameters' values are invalid (cf. ``Parameters``'
+                        ``strict`` mode).
 :``information``:       Miscellaneous information about crumbs (i.e. version).
 :``_pyinotify_loaded``: Not technically publically exposed but evaluates as True
                         if pyinotify is successfully loaded and False if not.
@@ -16,33 +20,56 @@
 '''
 
 import argparse
-import copy
-import inspect
+import base64
+import contextlib
 import logging
 import os
+import pickle
 import re
+import select
+import signal
 import sys
+import tempfile
+import threading
+import time
 import warnings
+import weakref
 
 try:
     from configparser import SafeConfigParser
-    from configparser import NoOptionError
-    from configparser import NoSectionError
 except ImportError:
     from ConfigParser import SafeConfigParser
-    from ConfigParser import NoOptionError
-    from ConfigParser import NoSectionError
+
+from crumbs.cache import ConfigurationCache
+from crumbs.completion import INDEX_ENVIRONMENT
+from crumbs.completion import write_index
+from crumbs.group import Group
+from crumbs.overlay import Overlay
+from crumbs.remote import HTTPConfiguration
+from crumbs.schema import Schema
+from crumbs.schema import insert
+from crumbs.schema import search
+from crumbs.schema import ValidationError  # noqa: F401 — re-exported
+from crumbs.snapshot import SnapshotWriter
+from crumbs.stats import Statistics
+from crumbs.sources import ArgumentSource
+from crumbs.sources import ConfigurationSource
+from crumbs.sources import EnvironmentSource
+from crumbs.sources import Source  # noqa: F401 — re-exported
+from crumbs.sources import record_consumed
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
 try:
-    logger.addHandler(logging.NullHandler())
+    _null_handler = logging.NullHandler()
 except:  # noqa: E722
     class NullHandler(logging.Handler):
         def emit(self, record):
             pass
 
-    logger.addHandler(NullHandler())
+    _null_handler = NullHandler()
+
+logger.addHandler(_null_handler)
 
 _pyinotify_loaded = True
 try:
@@ -51,6 +78,13 @@ except ImportError:
     logger.warn('could not load pyinotify—all inotify behavior ignored')
     _pyinotify_loaded = False
 
+_contextvars_loaded = True
+try:
+    import contextvars
+except ImportError:
+    logger.info('could not load contextvars—Parameters.override unavailable')
+    _contextvars_loaded = False
+
 try:
     import builtins
 except ImportError:
@@ -60,6 +94,39 @@ if 'ResourceWarning' not in vars(builtins):
     class ResourceWarning(Warning):
         pass
 
+_instances = weakref.WeakSet()
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+# References to other parameters in values (i.e. '${db.host}').
+_REFERENCE = re.compile(r'\$\{([^}]+)\}')
+
+
+def _logging_enabled():
+    '''Return True if crumbs' logger emits INFO messages anywhere.'''
+
+    return logger.isEnabledFor(logging.INFO) and any([ _ is not _null_handler for _ in logger.handlers ])
+
+
+if _contextvars_loaded:
+    # Overrides in the current context (cf. Parameters.override) mapping
+    # id(Parameters) to a dictionary mapping parameter name to value.
+    _overrides = contextvars.ContextVar('crumbs_overrides', default = {})
+
+if _pyinotify_loaded:
+    _SOURCE_EVENTS = pyinotify.IN_MODIFY | pyinotify.IN_CLOSE_WRITE | pyinotify.IN_CREATE | pyinotify.IN_DELETE | pyinotify.IN_MOVED_TO
+
+
+def _after_fork_in_child():
+    '''Reset every ``Parameters``' watchers in a newly forked child.'''
+
+    for parameters in list(_instances):
+        parameters._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child = _after_fork_in_child)
+
 
 class Parameters(object):
     '''Queryable collection of parameters whose values are set by the user.
@@ -79,6 +146,9 @@ class Parameters(object):
     :environment variables:  Values set in environment variables.
     :defaults:               Default value (if set for the parameter).
 
+    Additional sources (cf. ``crumbs.Source``) can be added with the
+    ``add_source`` method and are consulted according to their precedence.
+
     Parameters are added via the ``add_parameter`` method.  Configuration files
     that should be searched can be added with the ``add_configuration_file``
     method.  Environment variables are prefixed with an uppercase program name
@@ -98,10 +168,35 @@ class Parameters(object):
                                    object.
     :``add_configuration_file``:   Add a file path to be searched for parameter
                                    values.
+    :``add_configuration_url``:    Add an HTTP(S) URL to be searched for
+                                   parameter values.
     :``add_parameter``:            Add a parameter to ``Parameters`` object.
+    :``add_source``:               Add a source to be searched for parameter
+                                   values.
+    :``bind``:                     Return an object with a group's values as
+                                   attributes.
+    :``export``:                   Return all parameters (and their values) in
+                                   a form that can be handed to another
+                                   process (cf. ``from_export``).
+    :``find``:                     Return the values of parameters matching a
+                                   pattern (i.e. 'service.cache.*').
+    :``from_export``:              Return a ``Parameters`` with the parameters
+                                   (and values) of an exported ``Parameters``.
+    :``group``:                    Return a mapping of a group's values.
+    :``overlay``:                  Return a view with some parameters' values
+                                   replaced.
+    :``override``:                 Replace some parameters' values for the
+                                   current context (i.e. request).
     :``parse``:                    Prepare ``Parameters`` for queries and ensure
                                    parameter values can be found.
+    :``publish``:                  Share all parameters' values with other
+                                   processes through a memory mapped file.
     :``read_configuration_files``: Read all configuration files' values.
+    :``reload_on_signal``:         Read all configuration files' values when a
+                                   signal (i.e. SIGHUP) is received.
+    :``snapshot``:                 Return all parameters' values.
+    :``stats``:                    Return lookup and re-read instrumentation.
+    :``trace``:                    Return how a parameter's value is resolved.
 
     **Properties**
 
@@ -113,15 +208,34 @@ class Parameters(object):
     :``grouped_parameters``:  Dictionary mapping parameter group to parameter
                               dictionary (see parameters property).  Default:
                               { 'default': {} }.
-    :``configuration_files``: Dictionary mapping configuration file path to an
-                              active ``ConfigParser.ConfigParser``.  Default:
-                              {}.
+    :``configuration_files``: Dictionary mapping configuration file path (or
+                              URL) to an active ``ConfigParser.ConfigParser``
+                              (or ``crumbs.remote.HTTPConfiguration``).
+                              Default: {}.
     :``groups``:              Set of all parameter groups.  Always includes at
                               least the 'default' group.  Default:
                               set(['default']).
+    :``schema``:              ``crumbs.schema.Schema`` holding the parameters
+                              (``defaults``, ``parameters``,
+                              ``grouped_parameters``, and ``groups`` are its
+                              properties).
     :``parsed``:              True if ``Parameters`` has been parsed with the
                               ``parse`` method; otherwise, False.  Default:
                               False.
+    :``sources``:             List of ``crumbs.Source`` in the order they are
+                              searched (decreasing precedence).  Default:
+                              [ argument, configuration, environment ].
+    :``unparsed_lookups``:    Dictionary mapping (module, function, line) of
+                              each place that looked up a value before
+                              ``parse`` to the number of lookups it made.
+                              Each place is only warned about once and a
+                              summary is logged by ``parse``.  Default: {}.
+    :``tracing``:             True if lookups log their diagnostics (cf.
+                              ``trace``).  Set to True if crumbs' logger has a
+                              handler (and is enabled for INFO) when
+                              ``Parameters`` is created or parsed unless it
+                              has been set explicitly.  Lookups never touch
+                              the logger when False.
 
     **Example**
 
@@ -150,14 +264,57 @@ class Parameters(object):
 
         **Arguments**
 
+        :``configuration_cache``: Path of a cache of parsed configuration files
+                                  (cf. ``crumbs.cache.ConfigurationCache``).
+                                  Unchanged files are loaded from the cache
+                                  instead of being parsed.  If None, files are
+                                  always parsed.  Default: None.
         :``group_prefix``: If True, prefix command line arguments with the group
                            name (i.e. group ← 'foo' and long option ← '--bar'
                            will produce a replacement long option '--foo-bar');
                            otherwise, leave long options as they are specified.
                            Default: True.
+        :``incremental``:  If True, ``parse`` splits ``sys.argv`` once and each
+                           call only parses the arguments of parameters added
+                           since the previous call from the arguments no
+                           previous call consumed (i.e. bootstrap options,
+                           then plugins' options).  Default: False.
+
+                           .. note::
+                               Abbreviated long options only match options
+                               added in the same phase.
+
+        :``instrument``:   If True, record lookup counts, the source that
+                           provided each value, and lookup and re-read
+                           durations (cf. ``stats``).  Default: False.
         :``inotify``:      Use pyinotify (if present) to re-read configuration
                            files as they are modified.  Default: False.
 
+                           .. note::
+                               Forked children do not share the parent's
+                               inotify instance.  Each child creates its own
+                               the first time it looks up a value (on Pythons
+                               with ``os.register_at_fork``).
+
+        :``schema``:       ``crumbs.schema.Schema`` with the parameters (and
+                           the argument parser) to use.  The schema is frozen
+                           and can be shared by many ``Parameters``; the other
+                           ``argparse.ArgumentParser`` arguments and
+                           ``group_prefix`` are taken from it.  If None, a
+                           private schema is created (and ``add_parameter``
+                           adds to it).  Default: None.
+        :``strict``:       If True, every parameter's value is resolved,
+                           converted, and validated (cf.
+                           ``crumbs.schema.Schema.convert``) once when parsed
+                           and again whenever the configuration files are
+                           re-read.  All invalid values are reported together
+                           in a ``crumbs.ValidationError`` and an invalid
+                           re-read is rejected (the previous values are kept).
+                           Lookups return the stored values without
+                           converting them; changes in sources other than
+                           configuration files are seen after the next
+                           re-read.  Default: False.
+
         .. note::
             All other arguments are directly passed to
             ``argparse.ArgumentParser`` and are not used by ``Parameters``.
@@ -166,54 +323,159 @@ class Parameters(object):
 
         logger.info('STARTING: initializing Parameters object')
 
-        self.defaults = {}
-        self.parameters = {}
-        self.grouped_parameters = { 'default': {} }
         self.configuration_files = {}
-        self.groups = set([ 'default' ])
         self.parsed = False
+        self.unparsed_lookups = {}
 
-        self._group_prefix = kwargs.pop('group_prefix', True)
+        self._tracing = _logging_enabled()
+        self._tracing_explicit = False
 
         self._inotify = kwargs.pop('inotify', False) and _pyinotify_loaded
 
-        self._group_parsers = { 'default': argparse.ArgumentParser(*args, **kwargs) }
+        self._strict = kwargs.pop('strict', False)
+
+        self._incremental = kwargs.pop('incremental', False)
+        self._remaining_arguments = None
+        self._help_requested = False
+        self._parsed_actions = set()
+
+        self.subcommand = None
+
+        self._subcommands = {}
+        self._subcommand_action = None
+
+        self._statistics = None
+        if kwargs.pop('instrument', False):
+            self._statistics = Statistics()
+
+        self._configuration_cache = kwargs.pop('configuration_cache', None)
+        if self._configuration_cache is not None:
+            self._configuration_cache = ConfigurationCache(self._configuration_cache)
+
+        self.schema = kwargs.pop('schema', None)
+
+        if self.schema is None:
+            self.schema = Schema(*args, **kwargs)
+        else:
+            self.schema.freeze()
+
         self._argument_namespace = argparse.Namespace()
 
-        if self._inotify:
-            self._watch_manager = pyinotify.WatchManager()
+        self._publisher = None
 
-            class EventHandler(pyinotify.ProcessEvent):
-                def my_init(self, configuration_files):
-                    self.configuration_files = configuration_files
+        self._values = None
 
-                def process_IN_MODIFY(self, event):
-                    logger.info('re-reading %s', event.pathname)
+        self._reload_lock = threading.Lock()
+        self._reload_pipe = None
 
-                    self.configuration_files[event.pathname].read(event.pathname)
+        self._generation = 0
+
+        self._bound_classes = {}
+        self._bound_groups = weakref.WeakKeyDictionary()
+        self._bindings = weakref.WeakSet()
+
+        # Interpolated values by parameter name: ( unconverted value,
+        # interpolated value ), and the references (dependencies) of each
+        # parameter with references and their reverse (dependents).
+        self._interpolations = {}
+        self._dependencies = {}
+        self._dependents = {}
+
+        # Derived parameters by name: ( function, dependencies ), their
+        # remembered values, and a prefix trie of their names (cf. find).
+        self._derived = {}
+        self._derived_values = {}
+        self._derived_trie = {}
+
+        self._configuration = ConfigurationSource(self.configuration_files, cache = self._configuration_cache)
+
+        self.sources = [
+            ArgumentSource(self._argument_namespace, group_prefix = self._group_prefix),
+            self._configuration,
+            EnvironmentSource(self.parameters),
+        ]
 
-            self._notifier = pyinotify.Notifier(self._watch_manager, EventHandler(configuration_files = self.configuration_files))
-            self._notifier.coalesce_events()
+        self._watch_manager = None
+        self._notifier = None
+
+        if self._inotify:
+            self._watch()
+
+        _instances.add(self)
 
         logger.info('STOPPING: initializing Parameters object')
 
+    @property
+    def defaults(self):
+        return self.schema.defaults
+
+    @property
+    def parameters(self):
+        return self.schema.parameters
+
+    @property
+    def grouped_parameters(self):
+        return self.schema.grouped_parameters
+
+    @property
+    def tracing(self):
+        return self._tracing
+
+    @tracing.setter
+    def tracing(self, tracing):
+        self._tracing = tracing
+        self._tracing_explicit = True
+
+    @property
+    def groups(self):
+        return self.schema.groups
+
+    @property
+    def _group_prefix(self):
+        return self.schema.group_prefix
+
+    @property
+    def _group_parsers(self):
+        return self.schema.group_parsers
+
     def __del__(self):
         '''Prepare for garbage collection.
 
-        Attempt to stop the ``pyinotify.Notifier`` if inotify is in use.
+        Attempt to stop the ``pyinotify.Notifier`` if inotify is in use, stop
+        refreshing any configuration URLs, close any published snapshot, and
+        stop the thread re-reading configuration files on signals (cf.
+        ``reload_on_signal``).
 
         '''
 
         if self._inotify and self._notifier is not None:
             self._notifier.stop()
 
+        for configuration_file in self.configuration_files.values():
+            if isinstance(configuration_file, HTTPConfiguration):
+                configuration_file.stop()
+
+        if self._publisher is not None:
+            self._publisher.close()
+
+        if self._reload_pipe is not None:
+            write_fd = self._reload_pipe[1]
+
+            self._reload_pipe = None
+
+            # Wake the crumbs-reload thread; it closes the pipe as it exits.
+            try:
+                os.write(write_fd, b'\0')
+            except OSError:  # Pipe is full; the thread is already awake.
+                pass
+
     def __getitem__(self, parameter_name):
         '''Return the value of the requested parameter (by name).
 
         Given the ``parameter_name``, this method returns the found value for
-        that parameter.  All three sources are searched for values.  The
-        expected value is returned from the highest precedence source containing
-        a value.
+        that parameter.  All sources are searched for values.  The expected
+        value is returned from the highest precedence source containing a
+        value.
 
         The ``parameter_name`` must be prefixed with the group name and a dot
         '.' (i.e. group.long_option where group is the group name and
@@ -223,6 +485,19 @@ class Parameters(object):
         difference between hyphens '-' and underscores '_'; thus these
         characters can be used interchangeably.
 
+        Values (from any source) can reference other parameters' values (i.e.
+        'path = ${service.base}/log').  References are replaced with the
+        referenced parameters' unconverted values (found with the same
+        precedence) before the value is converted; references to names that
+        are not parameters are left as they are.  Interpolated values are
+        remembered until a value they depend on changes (i.e. when the
+        configuration files are re-read).  Circular references raise a
+        ``crumbs.ValidationError``.
+
+        Overridden values (cf. ``override`` and ``overlay``) are used by the
+        values that reference them and by derived parameters that depend on
+        them.
+
         **Arguments**
 
         :``parameter_name``: Name of the parameter whose value is returned.
@@ -233,97 +508,110 @@ class Parameters(object):
 
         '''
 
-        if self._inotify and self._notifier.check_events(timeout = 10):
-            logger.debug('events available: %s', self._notifier.check_events())
-            logger.info('processing inotifications')
-            self._notifier.read_events()
-            self._notifier.process_events()
+        statistics = self._statistics
 
-        parameter_name = parameter_name.replace('-', '_')
+        if statistics is not None:
+            start = _timer()
 
-        logger.info('finding value of %s', parameter_name)
+        self._process_events()
 
-        if parameter_name not in self.parameters:
-            parameter_name = '.'.join([ 'default', parameter_name ])
+        if self._tracing:
+            logger.info('finding value of %s', parameter_name)
 
-            if parameter_name not in self.parameters:
-                raise KeyError(parameter_name.replace('default.', '', 1))
+        parameter_name = self._name(parameter_name)
 
         if not self.parsed:
-            logger.warn('retrieving values from unparsed Parameters')
-
-            caller_frame = inspect.stack()[1]
+            caller_frame = sys._getframe(1)
+            caller = ( caller_frame.f_globals.get('__name__'), caller_frame.f_code.co_name, caller_frame.f_lineno )
 
-            caller_module = inspect.getmodule(caller_frame[0])
-            caller_function = caller_frame[3]
-            caller_line = caller_frame[2]
+            if caller in self.unparsed_lookups:
+                self.unparsed_lookups[caller] += 1
+            else:
+                self.unparsed_lookups[caller] = 1
 
-            logger.warn('called from %s.%s:%s', caller_module, caller_function, caller_line)
+                logger.warn('retrieving values from unparsed Parameters')
+                logger.warn('called from %s.%s:%s', *caller)
 
-            warnings.warn('retrieving values from unparsed Parameters', RuntimeWarning)
+                warnings.warn('retrieving values from unparsed Parameters', RuntimeWarning, stacklevel = 2)
 
-        default = self.defaults.get(parameter_name)
+        value = self._lookup([ parameter_name ], record = statistics is not None)[parameter_name]
 
-        logger.info('default: %s', default)
+        if statistics is not None:
+            statistics.record_lookup(parameter_name, _timer() - start)
 
-        logger.debug('self.paramters[%s][environment_prefix]: %s', parameter_name, self.parameters[parameter_name]['environment_prefix'])
+        return value
 
-        _ = '_'.join(parameter_name.replace('default.', '', 1).split('.')).upper()
+    def __getstate__(self):
+        '''Return the state to pickle.
 
-        if self.parameters[parameter_name]['environment_prefix'] is not None:
-            _ = self.parameters[parameter_name]['environment_prefix'] + '_' + _
+        Only the parameters' definitions and resolved values are pickled (not
+        the argument parser, configuration files, or sources).  Definitions'
+        attributes that cannot be pickled (i.e. a lambda ``type``) are
+        omitted.
 
-        logger.debug('environment variable: %s', _)
+        '''
 
-        value = os.environ.get(_, default)
-        try:
-            value = os.path.expandvars(value)
-        except TypeError:
-            pass
+        def _picklable(definition):
+            state = {}
 
-        logger.info('environment: %s', value)
+            for key, value in definition.items():
+                try:
+                    pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    logger.info('not exporting %s: %s', key, value)
+                    continue
 
-        configuration_value = default
-        for configuration_file_name, configuration_file in self.configuration_files.items():
-            logger.info('searching %s', configuration_file_name)
+                state[key] = value
 
-            try:
-                configuration_value = configuration_file.get(*parameter_name.split('.', 1))
-            except (NoOptionError, NoSectionError):
-                logger.info('%s not found', parameter_name)
-                continue
+            return state
 
-            logger.info('value: %s', configuration_value)
+        parameters = dict([ ( _, _picklable(definition) ) for _, definition in self.parameters.items() ])
 
-        logger.debug('configuration_value: %s', configuration_value)
+        grouped_parameters = {}
+        for parameter_name, definition in parameters.items():
+            grouped_parameters.setdefault(definition['group'], {})[parameter_name.replace(definition['group'] + '.', '')] = definition
 
-        if configuration_value != default:
-            value = configuration_value
+        return {
+            'version': 1,
+            'group_prefix': self._group_prefix,
+            'defaults': self.defaults,
+            'parameters': parameters,
+            'grouped_parameters': grouped_parameters,
+            'groups': self.groups,
+            'derived': list(self._derived.keys()),
+            'values': self.snapshot(),
+        }
 
-        logger.info('configuration: %s', value)
+    def __setstate__(self, state):
+        '''Restore a pickled state (cf. ``__getstate__``).
 
-        argument_name = parameter_name
+        The restored ``Parameters`` is parsed and returns the pickled values
+        without consulting any sources.
 
-        if self._group_prefix:
-            argument_name = argument_name.replace('.', '_', 1)
-        else:
-            _, argument_name = argument_name.split('.', 1)
+        '''
 
-        argument_name = argument_name.replace('default_', '', 1)
+        if state.get('version') != 1:
+            raise ValueError('unsupported Parameters state version: {}'.format(state.get('version')))
 
-        argument_value = getattr(self._argument_namespace, argument_name, default)
+        self.__init__(group_prefix = state['group_prefix'])
 
-        logger.debug('argument_value: %s', argument_value)
+        self.defaults.update(state['defaults'])
+        self.parameters.update(state['parameters'])
+        self.grouped_parameters.update(state['grouped_parameters'])
+        self.groups.update(state['groups'])
 
-        if argument_value != default:
-            value = argument_value
+        for parameter_name in state['parameters']:
+            self.schema._index(parameter_name)
 
-        logger.info('argument: %s', value)
+        # Derived values are restored with the others; they are never
+        # computed so their functions are not needed.
+        for parameter_name in state.get('derived', ()):
+            self._derived[parameter_name] = ( None, [] )
+            insert(self._derived_trie, parameter_name)
 
-        if value is not None:
-            value = self.parameters[parameter_name]['type'](value)
+        self._values = state['values']
 
-        return value
+        self.parsed = True
 
     def add_configuration_file(self, file_name):
         '''Register a file path from which to read parameter values.
@@ -343,16 +631,121 @@ class Parameters(object):
 
         logger.info('adding %s to configuration files', file_name)
 
-        if file_name not in self.configuration_files and self._inotify:
+        if file_name not in self.configuration_files and self._watch_manager is not None:
             self._watch_manager.add_watch(file_name, pyinotify.IN_MODIFY)
 
         if os.access(file_name, os.R_OK):
-            self.configuration_files[file_name] = SafeConfigParser()
-            self.configuration_files[file_name].read(file_name)
+            self.configuration_files[file_name], self._configuration.versions[file_name] = self._read_configuration_file(file_name)
+            self._configuration.invalidate()
+
+            if self._strict and self.parsed:
+                self._forget()
+                self._values = self._validate()
+
+            self._changed()
+
+            if self.parsed and self._configuration_cache is not None:
+                self._configuration_cache.save()
         else:
             logger.warn('could not read %s', file_name)
             warnings.warn('could not read {}'.format(file_name), ResourceWarning)
 
+    def add_configuration_url(self, url, refresh = True, **kwargs):
+        '''Register an HTTP(S) URL from which to read parameter values.
+
+        The document at the URL is expected to be ``ini`` formatted and its
+        values are searched exactly like those of configuration files (cf.
+        ``add_configuration_file``).  The document is fetched immediately and,
+        if ``refresh`` is True, re-fetched periodically in the background.
+        Re-fetches are conditional so unchanged documents are not transferred
+        again.
+
+        **Arguments**
+
+        :``url``:     URL of the document to add to the parameter search.
+        :``refresh``: If True, refresh the document in the background;
+                      otherwise, the document is only fetched when
+                      ``read_configuration_files`` is called.  Default: True.
+
+        All other arguments are passed to ``crumbs.remote.HTTPConfiguration``
+        (i.e. ``interval``, ``jitter``, ``cache_file``, and ``timeout``).
+
+        '''
+
+        logger.info('adding %s to configuration files', url)
+
+        if url in self.configuration_files:
+            self.configuration_files[url].stop()
+
+        reference = weakref.ref(self)
+
+        def _():
+            parameters = reference()
+
+            if parameters is not None:
+                parameters._configuration.invalidate()
+                parameters._changed()
+
+        self.configuration_files[url] = HTTPConfiguration(url, on_change = _, **kwargs)
+
+        self._configuration.invalidate()
+
+        self.configuration_files[url].read()
+
+        if refresh:
+            self.configuration_files[url].start()
+
+    def add_derived_parameter(self, name, function, depends_on):
+        '''Add a parameter whose value is computed from other parameters.
+
+        The value is computed (by calling the function with the dependencies'
+        values in order) when it is first looked up and remembered until a
+        dependency's value changes (i.e. when the configuration files are
+        re-read or ``refresh`` is called).  Derived parameters are looked up
+        (cf. ``__getitem__``) and included in ``snapshot`` like any other
+        parameter but are not command line arguments and are not found in
+        any source.
+
+        .. note::
+            While overrides are in effect (cf. ``override``), derived values
+            are computed from the overridden values and are not remembered.
+
+        **Arguments**
+
+        :``name``:       Name of the parameter (i.e. group.option; the group
+                         can be ommitted for the 'default' group).
+        :``function``:   Callable computing the value from the dependencies'
+                         values (as positional arguments).
+        :``depends_on``: List of the names of the parameters (including other
+                         derived parameters) the value is computed from.
+
+        **Exceptions**
+
+        :``KeyError``:   A dependency is not a parameter.
+        :``ValueError``: A parameter with the name already exists.
+
+        '''
+
+        name = name.replace('-', '_')
+
+        if '.' not in name:
+            name = '.'.join([ 'default', name ])
+
+        if name in self.parameters or name in self._derived:
+            raise ValueError('parameter {} already exists'.format(name))
+
+        depends_on = [ self._name(_) for _ in depends_on ]
+
+        logger.info('adding derived parameter %s (depends on %s)', name, depends_on)
+
+        self._derived[name] = ( function, depends_on )
+        insert(self._derived_trie, name)
+
+        self._dependencies[name] = set(depends_on)
+
+        for dependency in depends_on:
+            self._dependents.setdefault(dependency, set()).add(name)
+
     def add_parameter(self, **kwargs):
         '''Add the parameter to ``Parameters``.
 
@@ -374,7 +767,10 @@ class Parameters(object):
                                  os.path.basename(sys.argv[0]).
         :``group``:              Group (namespace or prefix) for parameter
                                  (corresponds to section name in configuration
-                                 files).  Default: 'default'.
+                                 files).  Groups can be nested by separating
+                                 their names with dots '.' (i.e.
+                                 'service.cache') (cf. ``find``).  Default:
+                                 'default'.
         :``options``:            REQUIRED.  The list of options to match for
                                  this parameter in argv.
         :``only``:               Iterable containing the components that this
@@ -407,61 +803,318 @@ class Parameters(object):
 
         '''
 
-        parameter_name = max(kwargs['options'], key = len).lstrip('-')
-
-        if 'dest' in kwargs:
-            parameter_name = kwargs['dest']
+        parameter_name = self.schema.add_parameter(**kwargs)
 
-        group = kwargs.pop('group', 'default')
-        self.groups.add(group)
-
-        parameter_name = '.'.join([ group, parameter_name ]).lstrip('.').replace('-', '_')
-
-        logger.info('adding parameter %s', parameter_name)
+        # The group's keys changed; ``group`` views must resolve it again.
+        self._generation += 1
 
         if self.parsed:
             logger.warn('adding parameter %s after parse', parameter_name)
             warnings.warn('adding parameter {} after parse'.format(parameter_name), RuntimeWarning)
 
-        self.parameters[parameter_name] = copy.copy(kwargs)
-        self.parameters[parameter_name]['group'] = group
-        self.parameters[parameter_name]['type'] = kwargs.get('type', str)
-        self.parameters[parameter_name]['environment_prefix'] = kwargs.pop('environment_prefix', os.path.basename(sys.argv[0]))
+    def add_source(self, source):
+        '''Add a source to be searched for parameter values.
 
-        if self.parameters[parameter_name]['environment_prefix'] is not None:
-            self.parameters[parameter_name]['environment_prefix'] = self.parameters[parameter_name]['environment_prefix'].upper().replace('-', '_')
+        Sources are searched in order of decreasing precedence.  The built in
+        sources have the following precedences:
 
-        logger.info('group: %s', group)
+        :argument:      300
+        :configuration: 200
+        :environment:   100
 
-        self.grouped_parameters.setdefault(group, {}).setdefault(parameter_name.replace(group + '.', ''), self.parameters[parameter_name])
+        Sources with equal precedence are searched in the order they were
+        added.
 
-        action_defaults = {
-            'store': kwargs.get('default'),
-            'store_const': kwargs.get('const'),
-            'store_true': False,
-            'store_false': True,
-            'append': [],
-            'append_const': [],
-            'count': 0,
-        }
+        If inotify is in use, the source's ``paths`` are watched for changes.
+
+        **Arguments**
+
+        :``source``: ``crumbs.Source`` to add to the parameter search.
+
+        '''
 
-        self.defaults[parameter_name] = action_defaults[kwargs.get('action', 'store')]
+        logger.info('adding %s source with precedence %s', source.name, source.precedence)
 
-        logger.info('default value: %s', kwargs.get('default'))
+        if self._watch_manager is not None:
+            for path in source.paths:
+                self._watch_manager.add_watch(path, _SOURCE_EVENTS)
 
-        if 'argument' in kwargs.pop('only', [ 'argument' ]):
-            if group not in self._group_parsers:
-                self._group_parsers[group] = self._group_parsers['default'].add_argument_group(group)
+        source.watched = self._inotify and bool(source.paths)
 
-            if self._group_prefix and group != 'default':
-                long_option = max(kwargs['options'], key = len)
+        self.sources.append(source)
+        self.sources.sort(key = lambda _: -_.precedence)
 
-                kwargs['options'].remove(long_option)
-                kwargs['options'].append(long_option.replace('--', '--' + group.replace('_', '-') + '-'))
+        if self._strict and self.parsed:
+            self._values = self._validate()
 
-                logger.debug('options: %s', kwargs['options'])
+        self._changed()
 
-            self._group_parsers[group].add_argument(*kwargs.pop('options'), **kwargs)
+    def add_subcommand(self, name, callback, help = None):
+        '''Add a subcommand whose parameters are added when it is selected.
+
+        The first subcommand added also adds the 'subcommand' parameter (an
+        optional positional command line argument choosing one of the
+        subcommands; None if no subcommand is given).
+        When ``parse`` is first called, the command line is scanned for the
+        selected subcommand and only its callback is called; other
+        subcommands' parameters are never added (and do not appear in
+        ``--help``).
+
+        .. note::
+            Callbacks add parameters to the schema so subcommands cannot be
+            used with a shared (frozen) schema (cf. ``__init__``).
+
+        **Arguments**
+
+        :``name``:     Name of the subcommand on the command line.
+        :``callback``: Called with this ``Parameters`` when the subcommand is
+                       selected; it should add the subcommand's parameters
+                       (i.e. with ``group = name``).
+        :``help``:     A brief description of what the subcommand does.
+
+        '''
+
+        logger.info('adding subcommand %s', name)
+
+        if self._subcommand_action is None:
+            self.add_parameter(options = [ 'subcommand' ], nargs = '?', choices = [], only = [ 'argument' ])
+            self._subcommand_action = [ _ for _ in self._group_parsers['default']._actions if _.dest == 'subcommand' ][-1]
+
+        self._subcommands[name] = ( callback, help )
+
+        self._subcommand_action.choices.append(name)
+        self._subcommand_action.help = '; '.join([ '{}: {}'.format(_, self._subcommands[_][1]) for _ in self._subcommand_action.choices if self._subcommands[_][1] is not None ]) or None
+
+    def bind(self, group):
+        '''Return an object with the group's values as attributes.
+
+        The object's class is generated for the group with a slot for each
+        parameter (i.e. ``p.bind('db').pool_size``) and its attributes hold
+        the converted values.  Reading an attribute does no lookup at all;
+        the values are updated whenever the command line is parsed, the
+        configuration files are re-read (cf. ``read_configuration_files``),
+        or a configuration file or source is added.  Changes in other sources
+        are not seen until then.
+
+        **Arguments**
+
+        :``group``: Name of the parameter group.
+
+        **Return**
+
+        Instance of a generated class with an attribute for each parameter in
+        the group (named by the parameter's name without the group).
+
+        **Exceptions**
+
+        :``KeyError``:   No such group.
+        :``ValueError``: A parameter's name (i.e. from an option like
+                         '--2fa') is not a valid attribute name.
+
+        '''
+
+        parameter_names = tuple(sorted(self.grouped_parameters[group].keys()))
+
+        bound_class = self._bound_classes.get(group)
+
+        if bound_class is None or bound_class.__slots__[:-1] != parameter_names:
+            logger.info('generating bound class for %s', group)
+
+            invalid = [ _ for _ in parameter_names if not re.match(r'[A-Za-z_]\w*$', _) ]
+
+            if invalid:
+                raise ValueError('cannot bind {}: parameter names are not identifiers: {}'.format(group, ', '.join(invalid)))
+
+            bound_class = type(str('Parameters[{}]'.format(group)), ( object, ), {
+                '__slots__': parameter_names + ( '__weakref__', ),
+            })
+
+            self._bound_classes[group] = bound_class
+            self._bound_groups[bound_class] = group
+
+        bound = bound_class()
+
+        self._process_events()
+        self._populate(bound)
+        self._bindings.add(bound)
+
+        return bound
+
+    def export(self, environment = None, fd = False):
+        '''Return all parameters (and their values) for another process.
+
+        Parameters are resolved and exported with their definitions (cf.
+        ``__getstate__``) so another process can restore them with
+        ``from_export`` without parsing ``sys.argv`` or reading any
+        configuration files.
+
+        **Arguments**
+
+        :``environment``: If set, also store the export in this environment
+                          variable (inherited by child processes).  Default:
+                          None.
+        :``fd``:          If True, return an inheritable file descriptor from
+                          which the export can be read instead of the export
+                          itself.  Default: False.
+
+        **Return**
+
+        The export (``bytes``) or, if ``fd`` is True, a file descriptor
+        (``int``) to pass to the child (i.e. with ``subprocess``'s
+        ``pass_fds``).
+
+        '''
+
+        data = pickle.dumps(self, protocol = pickle.HIGHEST_PROTOCOL)
+
+        if environment is not None:
+            os.environ[environment] = base64.b64encode(data).decode('ascii')
+
+        if not fd:
+            return data
+
+        with tempfile.TemporaryFile() as fh:
+            fh.write(data)
+            fh.flush()
+
+            exported_fd = os.dup(fh.fileno())
+
+        os.lseek(exported_fd, 0, os.SEEK_SET)
+
+        if hasattr(os, 'set_inheritable'):
+            os.set_inheritable(exported_fd, True)
+
+        return exported_fd
+
+    def find(self, pattern):
+        '''Return the values of parameters matching the pattern.
+
+        Groups can be nested by naming them with dots '.' (i.e.
+        ``add_parameter(group = 'service.cache.redis', options = [
+        '--timeout' ])``).  Patterns are matched against a prefix trie of
+        parameter names (cf. ``crumbs.schema.Schema.find``) and the matching
+        parameters (including derived parameters) are resolved together.  The
+        group can be ommitted for the 'default' group.
+
+        **Arguments**
+
+        :``pattern``: Dotted parameter name that may contain '*' segments (i.e.
+                      'service.cache.*' for every parameter in 'service.cache'
+                      and its nested groups).
+
+        **Return**
+
+        Dictionary mapping parameter name to value.
+
+        '''
+
+        self._process_events()
+
+        return self._lookup(sorted(set(self.schema.find(pattern)) | set(search(self._derived_trie, pattern))))
+
+    @classmethod
+    def from_export(cls, data = None, environment = None, fd = None):
+        '''Return a ``Parameters`` restored from an export (cf. ``export``).
+
+        Exactly one of the arguments should be provided.
+
+        **Arguments**
+
+        :``data``:        Export returned by ``export``.
+        :``environment``: Environment variable the export was stored in.
+        :``fd``:          File descriptor returned by ``export`` (it is closed
+                          after it is read).
+
+        '''
+
+        if environment is not None:
+            data = base64.b64decode(os.environ[environment].encode('ascii'))
+        elif fd is not None:
+            with os.fdopen(fd, 'rb') as fh:
+                data = fh.read()
+
+        if data is None:
+            raise ValueError('data, environment, or fd must be provided')
+
+        parameters = pickle.loads(data)
+
+        if not isinstance(parameters, cls):
+            raise ValueError('export does not contain {}'.format(cls.__name__))
+
+        return parameters
+
+    def overlay(self, overrides):
+        '''Return a view of these parameters with some values replaced.
+
+        The returned ``crumbs.overlay.Overlay`` shares everything but the
+        overridden values with this ``Parameters`` (i.e. a tenant's overrides
+        on top of a shared configuration).  Overlays can be layered with their
+        own ``overlay`` method.
+
+        **Arguments**
+
+        :``overrides``: Dictionary mapping parameter name to value.
+
+        **Return**
+
+        ``crumbs.overlay.Overlay`` of this ``Parameters``.
+
+        '''
+
+        return Overlay(self, overrides)
+
+    @contextlib.contextmanager
+    def override(self, overrides):
+        '''Replace some values for the current context (i.e. request).
+
+        Within the ``with`` block, lookups made in the same thread or asyncio
+        task (and tasks it creates) return the overridden values; other
+        threads and tasks are unaffected.  Overrides nest.
+
+        **Arguments**
+
+        :``overrides``: Dictionary mapping parameter name to value.
+
+        '''
+
+        if not _contextvars_loaded:
+            raise NotImplementedError('contextvars is not available')
+
+        context_overrides = dict(_overrides.get())
+        context_overrides[id(self)] = dict(context_overrides.get(id(self), {}), **dict([ ( self._name(_), value ) for _, value in overrides.items() ]))
+
+        token = _overrides.set(context_overrides)
+
+        try:
+            yield self
+        finally:
+            _overrides.reset(token)
+
+    def group(self, group):
+        '''Return a read-only mapping of the group's values.
+
+        The values of all parameters in the group are resolved together (each
+        source is queried once) the first time a value is requested and again
+        after the command line is parsed, the configuration files are re-read,
+        or a configuration file or source is added.  Iterating over the
+        mapping's keys does not resolve any values.
+
+        **Arguments**
+
+        :``group``: Name of the parameter group.
+
+        **Return**
+
+        ``crumbs.group.Group`` mapping parameter name (without the group) to
+        value.
+
+        **Exceptions**
+
+        :``KeyError``: No such group.
+
+        '''
+
+        return Group(self, group)
 
     def parse(self, only_known = False):
         '''Ensure all sources are ready to be queried.
@@ -471,7 +1124,8 @@ class Parameters(object):
         set to True, it is inadvisable to add more parameters (cf.
         ``add_parameter``).  Also, if ``parsed`` is not set to True, retrieving
         items (cf. ``__getitem__``) will result in a warning that values are
-        being retrieved from an uparsed Parameters.
+        being retrieved from an uparsed Parameters (once for each place
+        retrieving them; cf. ``unparsed_lookups``).
 
         **Arguments**
 
@@ -485,36 +1139,1084 @@ class Parameters(object):
                              that these parameters' default behavior would be
                              desired at this stage of execution.
 
+        If the ``CRUMBS_COMPLETION_INDEX`` environment variable is set, the
+        index of the command line options is written to the path it names
+        and the program exits instead (cf. ``crumbs.completion``).
+
+        If the Parameters was created with ``incremental = True``, each call
+        only parses the arguments of parameters added since the previous call
+        (from the arguments earlier calls did not consume).
+
         '''
 
+        if not only_known and not self.parsed and self.unparsed_lookups:
+            logger.warn('%s lookups from %s places before parsing:', sum(self.unparsed_lookups.values()), len(self.unparsed_lookups))
+
+            for caller, count in sorted(self.unparsed_lookups.items(), key = lambda _: -_[1]):
+                logger.warn('  %s.%s:%s (%s)', caller[0], caller[1], caller[2], count)
+
         self.parsed = not only_known or self.parsed
 
+        if not self._tracing_explicit:
+            self._tracing = _logging_enabled()
+
         logger.info('parsing parameters')
 
         logger.debug('sys.argv: %s', sys.argv)
 
-        if only_known:
-            args = [ _ for _ in copy.copy(sys.argv) if not re.match('-h|--help', _) ]
+        if not only_known and os.environ.get(INDEX_ENVIRONMENT):
+            write_index(self, os.environ[INDEX_ENVIRONMENT])
+            sys.exit(0)
+
+        if self._subcommands and self.subcommand is None:
+            self.subcommand = self._selected_subcommand(sys.argv[1:])
+
+            if self.subcommand is not None:
+                logger.info('adding parameters of subcommand %s', self.subcommand)
+
+                self._subcommands[self.subcommand][0](self)
+
+        if self._incremental:
+            self._parse_incrementally(only_known)
+        elif only_known:
+            args = [ _ for _ in sys.argv[1:] if not re.match('-h|--help', _) ]
 
             self._group_parsers['default'].parse_known_args(args = args, namespace = self._argument_namespace)
         else:
             self._group_parsers['default'].parse_args(namespace = self._argument_namespace)
 
-    def read_configuration_files(self):
-        '''Explicitly read the configuration files.
+        if not only_known:
+            if self._configuration_cache is not None:
+                self._configuration.ensure_index()
+                self._configuration_cache.save()
 
-        Reads all configuration files in this Parameters object.  Even if
-        inotify is watching or a read has already occurred.
+            if self._strict:
+                self._values = self._validate()
 
-        .. note::
+        self._changed()
 
-           The order that the configuration files are read is not guaranteed.
+    def publish(self, path, capacity = 65536, mode = 0o600):
+        '''Share all parameters' values with other processes.
 
-        '''
+        Writes a snapshot (cf. ``snapshot``) of all parameters' values to a
+        memory mapped file that other processes (i.e. pre-forked workers) can
+        read with ``crumbs.snapshot.SharedSnapshot`` instead of building their
+        own ``Parameters``.  Once published, the snapshot is published again
+        (as a new generation) whenever the configuration files are re-read
+        with ``read_configuration_files``.  Call ``publish`` again to publish
+        changes from other sources.
 
-        for file_name, configuration_parser in self.configuration_files.items():
-            if os.access(file_name, os.R_OK):
-                configuration_parser.read(file_name)
+        **Arguments**
+
+        :``path``:     Path of the memory mapped file.
+        :``capacity``: Initial size (in bytes) reserved for a snapshot (cf.
+                       ``crumbs.snapshot.SnapshotWriter``).  Default: 65536.
+        :``mode``:     Permissions of the file (i.e. 0o644 if workers read it
+                       after dropping privileges).  Default: 0o600.
+
+        '''
+
+        if self._publisher is None or self._publisher.path != path:
+            if self._publisher is not None:
+                self._publisher.close()
+
+            self._publisher = SnapshotWriter(path, capacity = capacity, mode = mode)
+
+        self._publisher.publish(self.snapshot())
+
+    def read_configuration_files(self):
+        '''Explicitly read the configuration files.
+
+        Reads all configuration files in this Parameters object.  Even if
+        inotify is watching or a read has already occurred.
+
+        The files are read into new parsers that replace the current ones
+        (and the configuration index is rebuilt) all at once, so concurrent
+        lookups see either the old or the new values but never a mix.
+        Lookups are not blocked while the files are read.
+
+        In ``strict`` mode, the new values are validated before they are
+        used; if any are invalid, the previous parsers are restored and a
+        ``crumbs.ValidationError`` is raised.
+
+        .. note::
+
+           The order that the configuration files are read is not guaranteed.
+
+        '''
+
+        with self._reload_lock:
+            if self._statistics is not None:
+                start = _timer()
+
+            configuration_files = {}
+            versions = {}
+
+            for file_name, configuration_parser in list(self.configuration_files.items()):
+                if isinstance(configuration_parser, HTTPConfiguration):
+                    configuration_parser.read()
+                elif os.access(file_name, os.R_OK):
+                    configuration_files[file_name], versions[file_name] = self._read_configuration_file(file_name)
+                else:
+                    logger.warn('could not read %s', file_name)
+                    warnings.warn('could not read {}'.format(file_name), ResourceWarning)
+
+            previous_configuration_files = dict(self.configuration_files)
+            previous_versions = dict(self._configuration.versions)
+            previous_index = self._configuration.index
+
+            self.configuration_files.update(configuration_files)
+            self._configuration.versions.update(versions)
+            self._configuration.rebuild()
+
+            index = self._configuration.index
+            changed = set([ _ for _ in set(previous_index.keys()) | set(index.keys()) if previous_index.get(_) != index.get(_) ])
+            changed = [ _ for _ in self.parameters if ( _.rsplit('.', 1)[0], _.rsplit('.', 1)[1].lower() ) in changed ]
+
+            if self._strict and self.parsed:
+                self._forget(changed)
+
+                try:
+                    self._values = self._validate()
+                except ValidationError:
+                    logger.warn('rejecting invalid configuration files')
+
+                    self.configuration_files.update(previous_configuration_files)
+                    self._configuration.versions.clear()
+                    self._configuration.versions.update(previous_versions)
+                    self._configuration.rebuild()
+
+                    # Forget what was remembered from the rejected values.
+                    self._forget(changed)
+
+                    raise
+
+            self._changed(changed)
+
+            if self._configuration_cache is not None:
+                self._configuration_cache.save()
+
+            if self._publisher is not None:
+                self._publisher.publish(self.snapshot())
+
+            if self._statistics is not None:
+                self._statistics.record_reload(_timer() - start)
+
+    def reload_on_signal(self, signum = getattr(signal, 'SIGHUP', None)):
+        '''Re-read the configuration files when the process receives a signal.
+
+        The signal handler only writes a byte to a pipe.  A background thread
+        waits on the pipe and calls ``read_configuration_files``; signals that
+        arrive while it is busy are coalesced into a single additional re-read.
+
+        .. note::
+            Like ``signal.signal``, this must be called from the main thread.
+
+        **Arguments**
+
+        :``signum``: Signal that triggers a re-read.  Default: SIGHUP.
+
+        '''
+
+        logger.info('re-reading configuration files on signal %s', signum)
+
+        if self._reload_pipe is None:
+            self._start_reloader()
+
+        previous_handler = signal.getsignal(signum)
+        reference = weakref.ref(self)
+
+        def _(signum, frame):
+            parameters = reference()
+
+            if parameters is not None and parameters._reload_pipe is not None:
+                try:
+                    os.write(parameters._reload_pipe[1], b'\0')
+                except OSError:  # Pipe is full; a re-read is already pending.
+                    pass
+
+            if callable(previous_handler):
+                previous_handler(signum, frame)
+
+        signal.signal(signum, _)
+
+    def snapshot(self):
+        '''Return all parameters' values.
+
+        All parameters are resolved together so each source is only queried
+        once.
+
+        **Return**
+
+        Dictionary mapping parameter name (i.e. group.long_option) to the
+        value ``__getitem__`` would return.
+
+        '''
+
+        self._process_events()
+
+        return self._lookup(list(self.parameters.keys()) + list(self._derived.keys()))
+
+    def refresh(self, parameter_names = None):
+        '''Note that parameters' values may have changed.
+
+        Sources' cached values (cf. ``crumbs.Source``) and remembered
+        interpolated and derived values (cf. ``add_derived_parameter``) that
+        depend on the parameters are discarded.  Changes crumbs is not told
+        about (i.e. the environment was modified) are otherwise not seen by
+        remembered values.
+
+        **Arguments**
+
+        :``parameter_names``: Names of the parameters that may have changed.
+                              If None, all of them.  Default: None.
+
+        '''
+
+        if parameter_names is not None:
+            parameter_names = [ self._name(_) for _ in parameter_names ]
+
+        logger.info('refreshing %s', 'all parameters' if parameter_names is None else parameter_names)
+
+        for source in self.sources:
+            source.invalidate(parameter_names)
+
+        self._changed(parameter_names)
+
+    def stats(self, reset = False):
+        '''Return the recorded instrumentation (cf. ``instrument``).
+
+        **Arguments**
+
+        :``reset``: If True, discard what has been recorded after returning
+                    it.  Default: False.
+
+        **Return**
+
+        Dictionary of lookup counts, winning sources, and lookup and re-read
+        duration histograms (cf. ``crumbs.stats.Statistics.as_dict``) or None
+        if ``Parameters`` was not created with ``instrument = True``.
+
+        '''
+
+        if self._statistics is None:
+            return None
+
+        statistics = self._statistics.as_dict()
+
+        if reset:
+            self._statistics.reset()
+
+        return statistics
+
+    def trace(self, parameter_name):
+        '''Return how the parameter's value is resolved.
+
+        Every source is queried (not only until a value is found) so the
+        returned path shows each candidate value and which one is used.
+        Nothing is recorded for ordinary lookups.
+
+        **Arguments**
+
+        :``parameter_name``: Name of the parameter (cf. ``__getitem__``).
+
+        **Return**
+
+        Dictionary with the following keys:
+
+        :``parameter``: Normalized parameter name.
+        :``value``:     Value ``__getitem__`` returns.
+        :``source``:    Name of the source that provided the value.
+        :``path``:      List of dictionaries (in precedence order) with the
+                        ``source`` name, whether it has a value (``found``),
+                        the ``value`` (if found), and whether it was ``used``.
+
+        '''
+
+        self._process_events()
+
+        parameter_name = self._name(parameter_name)
+
+        path = []
+
+        overrides = self._context_overrides()
+        if overrides is not None and parameter_name in overrides:
+            path.append({ 'source': 'override', 'found': True, 'value': overrides[parameter_name] })
+
+        if self._values is not None and parameter_name in self._values:
+            path.append({ 'source': 'stored', 'found': True, 'value': self._values[parameter_name] })
+
+        if parameter_name in self._derived:
+            path.append({ 'source': 'derived', 'found': True, 'value': self._lookup([ parameter_name ])[parameter_name] })
+        else:
+            for source in self.sources:
+                found = source.fetch([ parameter_name ])
+
+                if parameter_name in found:
+                    path.append({ 'source': source.name, 'found': True, 'value': found[parameter_name] })
+                else:
+                    path.append({ 'source': source.name, 'found': False })
+
+            path.append({ 'source': 'default', 'found': True, 'value': self.defaults.get(parameter_name) })
+
+        used = [ _ for _ in path if _['found'] ][0]
+
+        for step in path:
+            step['used'] = step is used
+
+        return {
+            'parameter': parameter_name,
+            'value': self._lookup([ parameter_name ])[parameter_name],
+            'source': used['source'],
+            'path': path,
+        }
+
+    def _after_fork(self):
+        '''Drop state that must not be shared with the parent process.
+
+        The inherited inotify instance is closed (the parent's remains open)
+        and a new one is created the next time a value is looked up.
+        Configuration URLs and sources reconnect and restart their background
+        work (cf. ``after_fork`` on each).  If re-reading on a signal, a new
+        pipe and thread are created for the child.
+
+        '''
+
+        if self._notifier is not None:
+            self._notifier.stop()
+
+        self._notifier = None
+        self._watch_manager = None
+
+        for configuration_file in self.configuration_files.values():
+            if isinstance(configuration_file, HTTPConfiguration):
+                configuration_file.after_fork()
+
+        for source in self.sources:
+            source.after_fork()
+
+        self._reload_lock = threading.Lock()
+
+        if self._reload_pipe is not None:
+            for fd in self._reload_pipe:
+                os.close(fd)
+
+            self._start_reloader()
+
+    def _process_events(self):
+        '''Re-read the configuration files and sources with pending inotify
+        events.
+
+        Starts watching the configuration files (cf. ``_watch``) the first time
+        it is called when ``inotify`` is enabled.  Every method that looks up
+        values for the caller calls it first; watched sources (i.e.
+        ``crumbs.sources.SecretsSource``) rely on it instead of checking for
+        changes themselves.
+
+        '''
+
+        if self._inotify and self._notifier is None:
+            self._watch()
+
+        if self._inotify and self._notifier.check_events(timeout = 10):
+            logger.debug('events available: %s', self._notifier.check_events())
+            logger.info('processing inotifications')
+            self._notifier.read_events()
+            self._notifier.process_events()
+
+            if self._strict and self.parsed:
+                self._forget()
+
+                try:
+                    self._values = self._validate()
+                except ValidationError as error:
+                    logger.warn('ignoring invalid configuration: %s', error)
+
+            self._changed()
+
+    def _context_overrides(self):
+        '''Return the overrides in the current context (cf. ``override``).
+
+        **Return**
+
+        Dictionary mapping parameter name to value or None if nothing is
+        overridden.
+
+        '''
+
+        if not _contextvars_loaded:
+            return None
+
+        return _overrides.get().get(id(self))
+
+    def _lookup(self, parameter_names, context = True, stack = (), record = False, overrides = None):
+        '''Return the converted values for the requested parameters.
+
+        Overridden values (cf. ``override`` and ``overlay``) and values that
+        have already been converted (i.e. imported with ``from_export``) are
+        returned as they are; derived parameters are computed (cf.
+        ``_derive``); all others are resolved (cf. ``_resolve``) and converted
+        to the parameter's type.  Stored values that depend on overridden
+        values are resolved again.
+
+        **Arguments**
+
+        :``parameter_names``: Normalized names of the parameters to look up.
+        :``context``:         If False, ignore overrides in the current
+                              context (i.e. when the values are cached beyond
+                              it).  Default: True.
+        :``stack``:           Names of the parameters being interpolated or
+                              derived that requested these (cf. ``_resolve``).
+                              Default: ().
+        :``record``:          If True, record which source provided each
+                              value (cf. ``stats``); only lookups by
+                              ``__getitem__`` are recorded.  Default: False.
+        :``overrides``:       Dictionary mapping parameter name to value that
+                              replaces the value (i.e. an ``Overlay``'s);
+                              these take precedence over the overrides in the
+                              current context.  Default: None.
+
+        **Return**
+
+        Dictionary mapping parameter name to value.
+
+        '''
+
+        values = {}
+        remaining = parameter_names
+
+        context_overrides = self._context_overrides() if context else None
+
+        if context_overrides is not None:
+            context_overrides = dict(context_overrides)
+            context_overrides.update(overrides or {})
+
+            overrides = context_overrides
+
+        affected = ()
+
+        if overrides is not None:
+            remaining = []
+
+            for parameter_name in parameter_names:
+                try:
+                    values[parameter_name] = overrides[parameter_name]
+                except KeyError:
+                    remaining.append(parameter_name)
+
+            if record:
+                self._statistics.record_sources('override', [ _ for _ in parameter_names if _ in overrides ])
+
+            affected = self._dependents_of(overrides.keys())
+
+        if self._values is not None:
+            parameter_names, remaining = remaining, []
+
+            for parameter_name in parameter_names:
+                if parameter_name in self._values and parameter_name not in affected:
+                    values[parameter_name] = self._values[parameter_name]
+                else:
+                    remaining.append(parameter_name)
+
+            if record:
+                self._statistics.record_sources('stored', [ _ for _ in parameter_names if _ in values ])
+
+        derived = []
+
+        if self._derived:
+            parameter_names, remaining = remaining, []
+
+            for parameter_name in parameter_names:
+                if parameter_name in self._derived:
+                    derived.append(parameter_name)
+                else:
+                    remaining.append(parameter_name)
+
+        if remaining:
+            for parameter_name, value in self._resolve(remaining, stack, record, overrides).items():
+                if value is not None:
+                    value = self.parameters[parameter_name]['type'](value)
+
+                values[parameter_name] = value
+
+        if derived:
+            values.update(self._derive(derived, overrides, stack, record))
+
+        return values
+
+    def _name(self, parameter_name):
+        '''Return the normalized name of the parameter.
+
+        Hyphens '-' are replaced with underscores '_' and the 'default' group
+        is added if the group was ommitted.
+
+        **Arguments**
+
+        :``parameter_name``: Name of the parameter (cf. ``__getitem__``).
+
+        **Exceptions**
+
+        :``KeyError``: No such parameter.
+
+        '''
+
+        parameter_name = parameter_name.replace('-', '_')
+
+        if parameter_name not in self.parameters and parameter_name not in self._derived:
+            parameter_name = '.'.join([ 'default', parameter_name ])
+
+            if parameter_name not in self.parameters and parameter_name not in self._derived:
+                raise KeyError(parameter_name.replace('default.', '', 1))
+
+        return parameter_name
+
+    def _populate(self, bound):
+        '''Set the attributes of an object returned by ``bind``.'''
+
+        group = self._bound_groups[type(bound)]
+        values = self._lookup([ '.'.join([ group, _ ]) for _ in type(bound).__slots__[:-1] ], context = False)
+
+        for parameter_name, value in values.items():
+            setattr(bound, parameter_name.replace(group + '.', '', 1), value)
+
+    def _parse_incrementally(self, only_known):
+        '''Parse the arguments of parameters added since the last parse.
+
+        ``sys.argv`` is split (and any help options removed) on the first
+        call.  Each call parses the arguments left over by earlier calls
+        with a parser holding only the new parameters' actions.
+
+        **Arguments**
+
+        :``only_known``: If True, leave unknown arguments for a later call;
+                         otherwise, they are errors (cf. ``parse``).
+
+        '''
+
+        parser = self._group_parsers['default']
+
+        if self._remaining_arguments is None:
+            arguments = sys.argv[1:]
+
+            self._help_requested = any([ re.match('-h|--help', _) for _ in arguments ])
+            self._remaining_arguments = [ _ for _ in arguments if not re.match('-h|--help', _) ]
+
+        if not only_known and self._help_requested:
+            parser.parse_args(args = sys.argv[1:], namespace = self._argument_namespace)
+
+        actions = [ _ for _ in parser._actions if id(_) not in self._parsed_actions and not isinstance(_, argparse._HelpAction) ]
+
+        logger.info('parsing %s new arguments from %s remaining', len(actions), len(self._remaining_arguments))
+
+        exclusive_actions = set([ id(_) for group in parser._mutually_exclusive_groups for _ in group._group_actions ])
+
+        if any([ id(_) in exclusive_actions for _ in actions ]):
+            phase_parser = parser
+        else:
+            phase_arguments = {
+                'prog': parser.prog,
+                'add_help': False,
+                'prefix_chars': parser.prefix_chars,
+                'fromfile_prefix_chars': parser.fromfile_prefix_chars,
+                'argument_default': parser.argument_default,
+            }
+
+            if hasattr(parser, 'allow_abbrev'):
+                phase_arguments['allow_abbrev'] = parser.allow_abbrev
+
+            phase_parser = argparse.ArgumentParser(**phase_arguments)
+            phase_parser.error = parser.error
+
+            record_consumed(phase_parser)
+
+            for action in actions:
+                phase_parser._add_action(action)
+
+        _, self._remaining_arguments = phase_parser.parse_known_args(args = self._remaining_arguments, namespace = self._argument_namespace)
+
+        self._parsed_actions.update([ id(_) for _ in actions ])
+
+        if not only_known and self._remaining_arguments:
+            parser.error('unrecognized arguments: {}'.format(' '.join(self._remaining_arguments)))
+
+    def _read_configuration_file(self, file_name):
+        '''Return a parser that has read the configuration file.
+
+        If there is a configuration cache, a cached parser is returned when the
+        file is unchanged.  The parser is not added to ``configuration_files``.
+
+        **Arguments**
+
+        :``file_name``: Path of the configuration file.
+
+        **Return**
+
+        Tuple of the ``ConfigParser.ConfigParser`` and the file's version (cf.
+        ``crumbs.cache.ConfigurationCache.key``) or None if there is no
+        configuration cache.
+
+        '''
+
+        if self._configuration_cache is None:
+            configuration_parser = SafeConfigParser()
+            configuration_parser.read(file_name)
+
+            return configuration_parser, None
+
+        version = self._configuration_cache.key(file_name)
+
+        if version is not None and version == self._configuration.versions.get(file_name) and file_name in self.configuration_files:
+            logger.info('%s is unchanged', file_name)
+            return self.configuration_files[file_name], version
+
+        configuration_parser = self._configuration_cache.get(version)
+
+        if configuration_parser is None:
+            configuration_parser = SafeConfigParser()
+            configuration_parser.read(file_name)
+
+            self._configuration_cache.put(version, configuration_parser)
+
+        return configuration_parser, version
+
+    def _changed(self, parameter_names = None):
+        '''Note that values may have changed (i.e. after parsing or re-reading).
+
+        Increments ``_generation`` (so ``group`` views resolve their values
+        again), forgets the interpolated and derived values that depend on
+        the changed parameters (cf. ``_forget``), and updates every object
+        returned by ``bind``.
+
+        **Arguments**
+
+        :``parameter_names``: Names of the parameters whose values changed.
+                              If None, any value may have changed.  Default:
+                              None.
+
+        '''
+
+        self._forget(parameter_names)
+
+        self._generation += 1
+
+        for bound in list(self._bindings):
+            self._populate(bound)
+
+    def _forget(self, parameter_names = None):
+        '''Forget the interpolated and derived values that depend on the
+        parameters.
+
+        Must be called before values are resolved again after a change (i.e.
+        before ``strict`` validation).
+
+        **Arguments**
+
+        :``parameter_names``: Names of the parameters whose values changed.
+                              If None, forget all of them.  Default: None.
+
+        '''
+
+        if parameter_names is None:
+            self._interpolations.clear()
+            self._derived_values.clear()
+        else:
+            dependents = self._dependents_of(parameter_names)
+
+            logger.info('forgetting interpolated and derived values of %s', sorted(dependents))
+
+            for dependent in dependents:
+                self._interpolations.pop(dependent, None)
+                self._derived_values.pop(dependent, None)
+
+    def _dependents_of(self, parameter_names):
+        '''Return the names of the parameters whose values depend on the
+        parameters (directly or through other parameters).
+
+        Only references that have been interpolated and derived parameters'
+        dependencies are known (cf. ``_dependencies``).
+
+        '''
+
+        parameter_names = list(parameter_names)
+        dependents = set()
+
+        while parameter_names:
+            parameter_name = parameter_names.pop()
+
+            for dependent in self._dependents.get(parameter_name, ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    parameter_names.append(dependent)
+
+        return dependents
+
+    def _derive(self, parameter_names, overrides = None, stack = (), record = False):
+        '''Return the values of the derived parameters.
+
+        Remembered values are returned; others are computed from their
+        dependencies' values (cf. ``_lookup``) and remembered unless values
+        changed while they were computed.
+
+        **Arguments**
+
+        :``parameter_names``: Normalized names of derived parameters.
+        :``overrides``:       Overrides in effect (cf. ``_lookup``).  If not
+                              None, values are computed with them and are not
+                              remembered.  Default: None.
+        :``stack``:           Names of the parameters being interpolated or
+                              derived that requested these (cf. ``_resolve``).
+                              Default: ().
+        :``record``:          If True, record that the values were derived
+                              (cf. ``_lookup``).  Default: False.
+
+        **Return**
+
+        Dictionary mapping parameter name to value.
+
+        **Exceptions**
+
+        :``ValidationError``: The dependencies (including references) are
+                              circular.
+
+        '''
+
+        values = {}
+
+        for parameter_name in parameter_names:
+            if overrides is None:
+                try:
+                    values[parameter_name] = self._derived_values[parameter_name]
+                    continue
+                except KeyError:
+                    pass
+
+            if parameter_name in stack:
+                raise ValidationError({ parameter_name: 'circular reference: {}'.format(' -> '.join(stack[stack.index(parameter_name):] + ( parameter_name, ))) })
+
+            generation = self._generation
+
+            function, depends_on = self._derived[parameter_name]
+
+            dependencies = self._lookup(depends_on, context = False, stack = stack + ( parameter_name, ), overrides = overrides)
+
+            value = function(*[ dependencies[_] for _ in depends_on ])
+
+            if self._tracing:
+                logger.info('derived %s: %s', parameter_name, value)
+
+            if overrides is None and generation == self._generation:
+                self._derived_values[parameter_name] = value
+
+            values[parameter_name] = value
+
+        if record:
+            self._statistics.record_sources('derived', parameter_names)
+
+        return values
+
+    def _interpolate(self, parameter_name, value, stack, overrides = None):
+        '''Return the value with references to other parameters replaced.
+
+        **Arguments**
+
+        :``parameter_name``: Normalized name of the parameter with the value.
+        :``value``:          Unconverted value of the parameter.
+        :``stack``:          Names of the parameters being interpolated that
+                             led to this one (cf. ``_resolve``).
+        :``overrides``:      Overrides in effect (cf. ``_lookup``).  If not
+                             None, references are replaced with them and the
+                             value is not remembered.  Default: None.
+
+        **Return**
+
+        The value with every reference to a parameter replaced by that
+        parameter's interpolated (but unconverted) value.
+
+        **Exceptions**
+
+        :``ValidationError``: The references are circular.
+
+        '''
+
+        try:
+            if '${' not in value:
+                return value
+        except TypeError:
+            return value
+
+        if overrides is None:
+            interpolation = self._interpolations.get(parameter_name)
+
+            if interpolation is not None and interpolation[0] == value:
+                return interpolation[1]
+
+        names = {}
+
+        for reference in _REFERENCE.findall(value):
+            try:
+                names[reference] = self._name(reference)
+            except KeyError:
+                pass
+
+        references = set(names.values())
+
+        for reference in self._dependencies.get(parameter_name, ()):
+            self._dependents[reference].discard(parameter_name)
+
+        self._dependencies[parameter_name] = references
+
+        for reference in references:
+            self._dependents.setdefault(reference, set()).add(parameter_name)
+
+        stack = stack + ( parameter_name, )
+
+        for reference in references:
+            if reference in stack:
+                raise ValidationError({ parameter_name: 'circular reference: {}'.format(' -> '.join(stack[stack.index(reference):] + ( reference, ))) })
+
+        values = {}
+
+        if overrides is not None:
+            values.update([ ( _, overrides[_] ) for _ in references if _ in overrides ])
+
+        references = [ _ for _ in references if _ not in values ]
+
+        derived = [ _ for _ in references if _ in self._derived ]
+
+        values.update(self._resolve([ _ for _ in references if _ not in self._derived ], stack, overrides = overrides))
+        values.update(self._derive(derived, overrides, stack))
+
+        def _(match):
+            if match.group(1) not in names:
+                return match.group(0)
+
+            reference = values[names[match.group(1)]]
+
+            return '' if reference is None else str(reference)
+
+        interpolated = _REFERENCE.sub(_, value)
+
+        if self._tracing:
+            logger.info('interpolated %s: %s', parameter_name, interpolated)
+
+        if overrides is None:
+            self._interpolations[parameter_name] = ( value, interpolated )
+
+        return interpolated
+
+    def _resolve(self, parameter_names, stack = (), record = False, overrides = None):
+        '''Return the highest precedent values for the requested parameters.
+
+        Each source is queried once for every parameter that has not been
+        found in a higher precedence source.  Parameters not found in any
+        source resolve to their (expanded) default value.  References to
+        other parameters are then interpolated (cf. ``_interpolate``).
+
+        **Arguments**
+
+        :``parameter_names``: Normalized names of the parameters to resolve.
+        :``stack``:           Names of the parameters being interpolated that
+                              requested these (for detecting circular
+                              references).  Default: ().
+        :``record``:          If True, record which source provided each
+                              value (cf. ``_lookup``).  Default: False.
+        :``overrides``:       Overrides in effect (cf. ``_interpolate``).
+                              Default: None.
+
+        **Return**
+
+        Dictionary mapping parameter name to unconverted value.
+
+        '''
+
+        tracing = self._tracing
+
+        values = {}
+        remaining = list(parameter_names)
+
+        for source in self.sources:
+            if not remaining:
+                break
+
+            found = source.fetch(remaining)
+
+            if not found:
+                continue
+
+            if tracing:
+                logger.info('%s: %s', source.name, found)
+
+            for parameter_name in remaining:
+                if parameter_name in found:
+                    values[parameter_name] = found[parameter_name]
+
+            remaining = [ _ for _ in remaining if _ not in values ]
+
+            if record:
+                self._statistics.record_sources(source.name, [ _ for _ in found if _ in values ])
+
+        for parameter_name in remaining:
+            value = self.defaults.get(parameter_name)
+
+            try:
+                value = os.path.expandvars(value)
+            except TypeError:
+                pass
+
+            if tracing:
+                logger.info('default: %s', value)
+
+            values[parameter_name] = value
+
+        if record and remaining:
+            self._statistics.record_sources('default', remaining)
+
+        for parameter_name, value in values.items():
+            values[parameter_name] = self._interpolate(parameter_name, value, stack, overrides)
+
+        return values
+
+    def _selected_subcommand(self, arguments):
+        '''Return the subcommand selected by the arguments or None.
+
+        Options (and the values of options known so far) are skipped; the
+        first remaining argument that names a subcommand is selected.
+
+        '''
+
+        parser = self._group_parsers['default']
+
+        arguments = iter(arguments)
+
+        for argument in arguments:
+            if argument == '--':
+                return next(( _ for _ in arguments if _ in self._subcommands ), None)
+
+            if argument[:1] in parser.prefix_chars and len(argument) > 1:
+                action = parser._option_string_actions.get(argument)
+
+                if action is not None:
+                    values = { None: 1, '?': 0, '*': 0, '+': 1 }.get(action.nargs, action.nargs)
+
+                    if isinstance(values, int):
+                        for _ in range(values):
+                            next(arguments, None)
+
+                continue
+
+            if argument in self._subcommands:
+                return argument
+
+        return None
+
+    def _start_reloader(self):
+        '''Start the thread that re-reads configuration files when signalled.'''
+
+        read_fd, write_fd = os.pipe()
+
+        for fd in ( read_fd, write_fd ):
+            if hasattr(os, 'set_blocking'):
+                os.set_blocking(fd, False)
             else:
-                logger.warn('could not read %s', file_name)
-                warnings.warn('could not read {}'.format(file_name), ResourceWarning)
+                # Not available on every platform (i.e. Windows); only needed
+                # by reload_on_signal.
+                import fcntl
+
+                fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+        self._reload_pipe = ( read_fd, write_fd )
+
+        reference = weakref.ref(self)
+
+        def _():
+            while True:
+                select.select([ read_fd ], [], [])
+
+                try:
+                    while os.read(read_fd, 4096):
+                        pass
+                except OSError:  # Drained.
+                    pass
+
+                parameters = reference()
+                if parameters is None or parameters._reload_pipe != ( read_fd, write_fd ):
+                    break
+
+                logger.info('re-reading configuration files (signalled)')
+
+                try:
+                    parameters.read_configuration_files()
+                except Exception:
+                    logger.exception('re-reading configuration files failed')
+
+                del parameters
+
+            os.close(read_fd)
+            os.close(write_fd)
+
+        thread = threading.Thread(target = _, name = 'crumbs-reload')
+        thread.daemon = True
+        thread.start()
+
+    def _validate(self):
+        '''Return every parameter's converted value (cf. ``strict``).
+
+        All parameters are resolved together (ignoring any stored values) and
+        converted with ``crumbs.schema.Schema.convert``.
+
+        **Exceptions**
+
+        :``crumbs.ValidationError``: Any values are invalid.
+
+        '''
+
+        logger.info('validating all parameters')
+
+        return self.schema.convert(self._resolve(list(self.parameters.keys())))
+
+    def _watch(self):
+        '''Create the inotify instance and watch all configuration files.
+
+        Watches every local configuration file and the ``paths`` of every
+        source.
+
+        '''
+
+        logger.info('starting inotify watches')
+
+        self._watch_manager = pyinotify.WatchManager()
+
+        class EventHandler(pyinotify.ProcessEvent):
+            def my_init(self, configuration_files, configuration, sources):
+                self.configuration_files = configuration_files
+                self.configuration = configuration
+                self.sources = sources
+
+            def process_IN_MODIFY(self, event):
+                if event.pathname in self.configuration_files:
+                    logger.info('re-reading %s', event.pathname)
+
+                    self.configuration_files[event.pathname].read(event.pathname)
+                    self.configuration.versions.pop(event.pathname, None)
+                    self.configuration.invalidate()
+
+                self.process_default(event)
+
+            def process_default(self, event):
+                for source in self.sources:
+                    for path in source.paths:
+                        if event.pathname == path or event.pathname.startswith(os.path.join(path, '')):
+                            logger.info('%s changed for %s source', event.pathname, source.name)
+
+                            source.changed(event.pathname)
+
+        self._notifier = pyinotify.Notifier(self._watch_manager, EventHandler(configuration_files = self.configuration_files, configuration = self._configuration, sources = self.sources))
+        self._notifier.coalesce_events()
+
+        for file_name, configuration_file in self.configuration_files.items():
+            if not isinstance(configuration_file, HTTPConfiguration):
+                self._watch_manager.add_watch(file_name, pyinotify.IN_MODIFY)
+
+        for source in self.sources:
+            for path in source.paths:
+                self._watch_manager.add_watch(path, _SOURCE_EVENTS)
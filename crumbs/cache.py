@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''On-disk cache of parsed configuration files.
+
+:``ConfigurationCache``: Parsed configuration files (and their merged index)
+                         saved between runs.
+
+'''
+
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def _key(file_name):
+    '''Return the (size, mtime, inode) identifying a version of the file.'''
+
+    stat = os.stat(file_name)
+
+    return ( stat.st_size, getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_ino )
+
+
+class ConfigurationCache(object):
+    '''Parsed configuration files (and their merged index) saved between runs.
+
+    Each file's parser is stored with the file's size, modification time, and
+    inode and is only used if all three still match the file.  The cache is
+    loaded with a single read when created and written (atomically) by
+    ``save`` if it has changed.  An unreadable, corrupt, or outdated cache is
+    ignored and the files are parsed normally.
+
+    .. note::
+        The cache is a pickle and loading it can execute arbitrary code.  It
+        must not be writable by anyone not trusted to run code as this
+        process.
+
+    **Arguments**
+
+    :``path``: Path of the cache file.
+
+    '''
+
+    version = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.dirty = False
+
+        self._files = {}
+        self._index = ( None, None )
+
+        self.load()
+
+    def load(self):
+        '''Load the cache from ``path`` (discarding anything unsaved).'''
+
+        self._files = {}
+        self._index = ( None, None )
+        self.dirty = False
+
+        try:
+            with open(self.path, 'rb') as fh:
+                cache = pickle.loads(fh.read())
+        except (IOError, OSError):
+            logger.info('no cache in %s', self.path)
+            return
+        except Exception as error:
+            logger.warn('ignoring corrupt cache in %s: %s', self.path, error)
+            return
+
+        if not isinstance(cache, dict) or cache.get('version') != self.version:
+            logger.warn('ignoring outdated cache in %s', self.path)
+            return
+
+        self._files = cache['files']
+        self._index = cache['index']
+
+    def save(self):
+        '''Atomically write the cache to ``path`` if it has changed.'''
+
+        if not self.dirty:
+            return
+
+        logger.info('writing cache %s', self.path)
+
+        cache = {
+            'version': self.version,
+            'files': self._files,
+            'index': self._index,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        try:
+            fd, name = tempfile.mkstemp(dir = directory, prefix = '.crumbs-')
+        except (IOError, OSError) as error:
+            logger.warn('could not write %s: %s', self.path, error)
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(cache, fh, protocol = pickle.HIGHEST_PROTOCOL)
+
+            os.rename(name, self.path)
+        except Exception as error:
+            logger.warn('could not write %s: %s', self.path, error)
+
+            if os.path.exists(name):
+                os.unlink(name)
+
+            return
+
+        self.dirty = False
+
+    def key(self, file_name):
+        '''Return the key identifying the current version of the file.
+
+        **Arguments**
+
+        :``file_name``: Path of the configuration file.
+
+        **Return**
+
+        Tuple of the file's absolute path, size, modification time, and inode
+        or None if the file cannot be examined.
+
+        '''
+
+        try:
+            return ( os.path.abspath(file_name), ) + _key(file_name)
+        except (IOError, OSError):
+            return None
+
+    def get(self, key):
+        '''Return the cached parser for the file version or None.
+
+        **Arguments**
+
+        :``key``: Key of the file version (cf. ``key``).
+
+        '''
+
+        if key is None:
+            return None
+
+        cached_key, parser = self._files.get(key[0], ( None, None ))
+
+        if cached_key != key:
+            return None
+
+        logger.info('using cached %s', key[0])
+
+        return parser
+
+    def put(self, key, parser):
+        '''Store the parser for the file version.
+
+        **Arguments**
+
+        :``key``:    Key of the file version (cf. ``key``).
+        :``parser``: ``ConfigParser.ConfigParser`` that read the file.
+
+        '''
+
+        if key is None:
+            return
+
+        self._files[key[0]] = ( key, parser )
+        self.dirty = True
+
+    def get_index(self, keys):
+        '''Return the cached merged index for the file versions or None.
+
+        **Arguments**
+
+        :``keys``: Sequence of file version keys in merge order.
+
+        '''
+
+        cached_keys, index = self._index
+
+        if cached_keys != tuple(keys):
+            return None
+
+        logger.info('using cached configuration index')
+
+        return index
+
+    def put_index(self, keys, index):
+        '''Store the merged index for the file versions.
+
+        **Arguments**
+
+        :``keys``:  Sequence of file version keys in merge order.
+        :``index``: Dictionary mapping (section, option) to value.
+
+        '''
+
+        self._index = ( tuple(keys), index )
+        self.dirty = True
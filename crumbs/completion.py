@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Shell completion from a precomputed index of command line options.
+
+Completing a command line should not import the application (and every
+module that adds parameters) on each key press.  Instead, the application
+writes an index of its options once and completions are answered from it.
+
+1. Write the index by running the application with the
+   ``CRUMBS_COMPLETION_INDEX`` environment variable set to the index's path
+   (``Parameters.parse`` writes the index and exits)::
+
+       CRUMBS_COMPLETION_INDEX=~/.cache/app.json app
+
+2. Complete with the index (i.e. in bash)::
+
+       complete -C 'python /path/to/crumbs/completion.py ~/.cache/app.json' app
+
+   This module only uses the standard library and runs as a script so
+   completing does not import ``crumbs`` (or the application) at all.
+
+:``INDEX_ENVIRONMENT``: Name of the environment variable that selects the
+                        index ``Parameters.parse`` writes.
+:``index``:             Return the index of a ``Parameters``' options.
+:``write_index``:       Atomically write a ``Parameters``' index to a file.
+:``load_index``:        Read an index written by ``write_index``.
+:``complete``:          Return the completions of a command line's last word.
+
+'''
+
+import json
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+INDEX_ENVIRONMENT = 'CRUMBS_COMPLETION_INDEX'
+
+VERSION = 1
+
+
+def _options(parser, actions):
+    '''Return the index entries of the parser's actions with option strings.'''
+
+    groups = {}
+    for group in parser._action_groups:
+        for action in group._group_actions:
+            groups[id(action)] = group.title
+
+    entries = []
+
+    for action in actions:
+        if not action.option_strings:
+            continue
+
+        entries.append({
+            'options': list(action.option_strings),
+            'group': groups.get(id(action)),
+            'choices': [ str(_) for _ in action.choices ] if action.choices is not None else None,
+            'value': action.nargs != 0,
+            'help': action.help,
+        })
+
+    return entries
+
+
+def index(parameters):
+    '''Return the index of the parameters' command line options.
+
+    Options are listed as they appear on the command line (i.e. with the
+    group prefix applied; cf. ``Parameters.__init__``).  The parameters of
+    subcommands that have not been selected are added (by calling their
+    callbacks; cf. ``Parameters.add_subcommand``) so their options can be
+    listed separately.  Thus, the ``Parameters`` should not be used
+    afterwards.
+
+    **Arguments**
+
+    :``parameters``: ``Parameters`` with all parameters added.
+
+    **Return**
+
+    Dictionary with the following keys:
+
+    :``version``:     Version of the index's format.
+    :``prog``:        Name of the program.
+    :``options``:     List of options; each is a dictionary with the option
+                      strings (``options``), the parameter group (``group``),
+                      the valid values (``choices``; None if any value is
+                      valid), whether the option takes a value (``value``),
+                      and its description (``help``).
+    :``subcommands``: Dictionary mapping subcommand name to a dictionary with
+                      its description (``help``) and its options (``options``;
+                      as above).
+
+    '''
+
+    parser = parameters._group_parsers['default']
+
+    entries = _options(parser, parser._actions)
+
+    subcommands = {}
+
+    for name in sorted(parameters._subcommands.keys()):
+        callback, help = parameters._subcommands[name]
+
+        actions = []
+
+        if name != parameters.subcommand:
+            known = set([ id(_) for _ in parser._actions ])
+
+            callback(parameters)
+
+            actions = [ _ for _ in parser._actions if id(_) not in known ]
+
+        subcommands[name] = {
+            'help': help,
+            'options': _options(parser, actions),
+        }
+
+    return {
+        'version': VERSION,
+        'prog': parser.prog,
+        'options': entries,
+        'subcommands': subcommands,
+    }
+
+
+def write_index(parameters, path):
+    '''Atomically write the index of the parameters' options to the path.
+
+    **Arguments**
+
+    :``parameters``: ``Parameters`` with all parameters added (cf. ``index``).
+    :``path``:       Path of the index to write.
+
+    '''
+
+    # Only needed when writing an index; completing does not pay for it.
+    import tempfile
+
+    logger.info('writing completion index %s', path)
+
+    directory = os.path.dirname(os.path.abspath(path))
+
+    fd, name = tempfile.mkstemp(dir = directory, prefix = '.crumbs-')
+
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(index(parameters), fh, sort_keys = True)
+
+        os.rename(name, path)
+    except Exception:
+        if os.path.exists(name):
+            os.remove(name)
+
+        raise
+
+
+def load_index(path):
+    '''Read an index written by ``write_index``.
+
+    **Arguments**
+
+    :``path``: Path of the index to read.
+
+    **Return**
+
+    The index (cf. ``index``).
+
+    **Exceptions**
+
+    :``ValueError``: The index is not valid JSON or has an unsupported
+                     version.
+
+    '''
+
+    with open(path) as fh:
+        data = json.load(fh)
+
+    if data.get('version') != VERSION:
+        raise ValueError('unsupported completion index version: {}'.format(data.get('version')))
+
+    return data
+
+
+def complete(index, words):
+    '''Return the completions of the last of the words.
+
+    If the previous word is an option that takes a value, its choices are
+    completed; if the last word starts with a '-', options (including the
+    selected subcommand's) are completed; otherwise, subcommands are
+    completed (if none has been given).
+
+    **Arguments**
+
+    :``index``: Index of the program's options (cf. ``load_index``).
+    :``words``: Words of the command line after the program's name up to
+                (and including) the partial word being completed ('' if a new
+                word is started).
+
+    **Return**
+
+    Sorted list of completions.
+
+    '''
+
+    current = words[-1] if words else ''
+    previous = words[-2] if len(words) > 1 else None
+
+    entries = list(index['options'])
+
+    subcommand = None
+
+    for word in words[:-1]:
+        if word in index['subcommands']:
+            subcommand = word
+            entries.extend(index['subcommands'][word]['options'])
+            break
+
+    options = {}
+    for entry in entries:
+        for option in entry['options']:
+            options[option] = entry
+
+    if previous in options and options[previous]['value']:
+        return sorted([ _ for _ in options[previous]['choices'] or [] if _.startswith(current) ])
+
+    if current.startswith('-'):
+        return sorted([ _ for _ in options if _.startswith(current) ])
+
+    if subcommand is None:
+        return sorted([ _ for _ in index['subcommands'] if _.startswith(current) ])
+
+    return []
+
+
+def main(arguments = None, environment = None):
+    '''Print the completions of a bash ``complete -C`` request.
+
+    The index is the first argument and the command line is read from the
+    ``COMP_LINE`` and ``COMP_POINT`` environment variables.
+
+    '''
+
+    if arguments is None:
+        arguments = sys.argv[1:]
+
+    if environment is None:
+        environment = os.environ
+
+    line = environment.get('COMP_LINE', '')
+    line = line[:int(environment.get('COMP_POINT', len(line)))]
+
+    words = line.split()
+    if not line or line[-1].isspace():
+        words.append('')
+
+    try:
+        data = load_index(os.path.expanduser(arguments[0]))
+    except (IndexError, IOError, OSError, ValueError) as error:
+        logger.warn('could not load completion index: %s', error)
+        return 1
+
+    for completion in complete(data, words[1:]):
+        sys.stdout.write(completion + '\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
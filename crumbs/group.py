@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Read-only views of a parameter group's values.
+
+:``Group``: Mapping of a group's parameter names to values (cf.
+            ``Parameters.group``).
+
+'''
+
+import logging
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+logger = logging.getLogger(__name__)
+
+
+class Group(Mapping):
+    '''Mapping of a group's parameter names to values.
+
+    Keys are parameter names without the group (i.e. 'pool_size' in the 'db'
+    group) and, like ``Parameters``, are insensitive to the difference between
+    hyphens '-' and underscores '_'.
+
+    All of the group's values are resolved together the first time one is
+    requested and again after the ``Parameters`` changes (i.e. is parsed or
+    re-reads its configuration files).  Iterating over keys and ``len`` never
+    resolve values.
+
+    **Arguments**
+
+    :``parameters``: ``Parameters`` with the group.
+    :``group``:      Name of the parameter group.
+
+    '''
+
+    def __init__(self, parameters, group):
+        self.parameters = parameters
+        self.group = group
+
+        self._parameters = parameters.grouped_parameters[group]
+
+        self._generation = None
+        self._values = {}
+
+    def __getitem__(self, parameter_name):
+        parameter_name = parameter_name.replace('-', '_')
+
+        if parameter_name not in self._parameters:
+            raise KeyError(parameter_name)
+
+        self.parameters._process_events()
+
+        if self.parameters._context_overrides() is not None:
+            # Values can depend on the overrides; they are not cached.
+            parameter_name = '.'.join([ self.group, parameter_name ])
+
+            return self.parameters._lookup([ parameter_name ])[parameter_name]
+
+        if self._generation != self.parameters._generation:
+            self._load()
+
+        return self._values[parameter_name]
+
+    def __iter__(self):
+        return iter(self._parameters)
+
+    def __len__(self):
+        return len(self._parameters)
+
+    def __contains__(self, parameter_name):
+        return parameter_name.replace('-', '_') in self._parameters
+
+    def _load(self):
+        logger.info('resolving %s parameters', self.group)
+
+        generation = self.parameters._generation
+
+        values = self.parameters._lookup([ '.'.join([ self.group, _ ]) for _ in self._parameters.keys() ], context = False)
+
+        self._values = dict([ ( _.replace(self.group + '.', '', 1), value ) for _, value in values.items() ])
+        self._generation = generation
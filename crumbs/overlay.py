@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Overrides layered on top of a shared ``Parameters``.
+
+:``Overlay``: View of a ``Parameters`` (or another ``Overlay``) with some
+              parameters' values replaced (cf. ``Parameters.overlay``).
+
+'''
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Overlay(object):
+    '''View of a ``Parameters`` with some parameters' values replaced.
+
+    Only the overridden values are stored; everything else (parameters,
+    sources, and resolved values) is shared with the underlying
+    ``Parameters``.  Creating an overlay costs time proportional to the number
+    of overrides (and the overrides of the overlays it is layered on).
+
+    Overrides are converted to their parameter's type (cf.
+    ``crumbs.schema.Schema.convert``); overridden derived parameters are
+    returned as given.  Values that reference overridden parameters and
+    derived parameters that depend on them are resolved with the overrides
+    (cf. ``Parameters.__getitem__``).
+
+    **Arguments**
+
+    :``base``:      ``Parameters`` or ``Overlay`` whose values are overridden.
+    :``overrides``: Dictionary mapping parameter name to value.  Names follow
+                    the same rules as ``Parameters.__getitem__``.
+
+    **Exceptions**
+
+    :``crumbs.ValidationError``: Any overrides could not be converted.
+
+    '''
+
+    def __init__(self, base, overrides):
+        self.base = base
+
+        overrides = dict([ ( base._name(_), value ) for _, value in overrides.items() ])
+
+        if isinstance(base, Overlay):
+            self._parameters = base._parameters
+            self._overrides = dict(base._overrides)
+        else:
+            self._parameters = base
+            self._overrides = {}
+
+        schema = self._parameters.schema
+
+        self._overrides.update(schema.convert(dict([ ( _, value ) for _, value in overrides.items() if _ in schema.parameters ])))
+        self._overrides.update([ ( _, value ) for _, value in overrides.items() if _ not in schema.parameters ])
+
+    def __getitem__(self, parameter_name):
+        '''Return the overridden value or the base's value (cf.
+        ``Parameters.__getitem__``).
+
+        '''
+
+        parameter_name = self._name(parameter_name)
+
+        self._parameters._process_events()
+
+        return self._parameters._lookup([ parameter_name ], overrides = self._overrides)[parameter_name]
+
+    def _name(self, parameter_name):
+        return self.base._name(parameter_name)
+
+    def overlay(self, overrides):
+        '''Return an ``Overlay`` of this overlay (cf. ``Parameters.overlay``).'''
+
+        return Overlay(self, overrides)
+
+    def snapshot(self):
+        '''Return all parameters' values (cf. ``Parameters.snapshot``).'''
+
+        parameters = self._parameters
+        parameters._process_events()
+
+        return parameters._lookup(list(parameters.parameters.keys()) + list(parameters._derived.keys()), overrides = self._overrides)
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Configuration documents served over HTTP.
+
+:``HTTPConfiguration``: ``ini`` document fetched (and kept up to date) from an
+                        HTTP(S) URL.
+
+'''
+
+import io
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+
+try:
+    from configparser import SafeConfigParser
+except ImportError:
+    from ConfigParser import SafeConfigParser
+
+try:
+    from http.client import HTTPConnection
+    from http.client import HTTPException
+    from http.client import HTTPSConnection
+except ImportError:
+    from httplib import HTTPConnection
+    from httplib import HTTPException
+    from httplib import HTTPSConnection
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+def _parse(body):
+    '''Return a ``SafeConfigParser`` populated from the ``ini`` text.'''
+
+    parser = SafeConfigParser()
+
+    if hasattr(parser, 'read_string'):
+        parser.read_string(body)
+    else:
+        parser.readfp(io.StringIO(body))
+
+    return parser
+
+
+class HTTPConfiguration(object):
+    '''``ini`` document fetched (and kept up to date) from an HTTP(S) URL.
+
+    Behaves like the ``ConfigParser.ConfigParser`` objects created by
+    ``Parameters.add_configuration_file`` so values from the document are part
+    of the same configuration index.
+
+    Fetches are conditional (``If-None-Match`` and ``If-Modified-Since``) and
+    reuse a single keep-alive connection.  If a fetch fails, the last good copy
+    of the document continues to be served; if there is no good copy in memory
+    and ``cache_file`` is set, the copy saved there by a previous fetch is
+    used.
+
+    **Arguments**
+
+    :``url``:        HTTP(S) URL of the document.
+    :``interval``:   Seconds between background refreshes (cf. ``start``).
+                     Default: 300.
+    :``jitter``:     Fraction of ``interval`` by which each refresh is randomly
+                     advanced or delayed.  Default: 0.1.
+    :``cache_file``: Path where the last good copy of the document is saved.
+                     If None, the document is only kept in memory.  Default:
+                     None.
+    :``timeout``:    Seconds to wait for the server.  Default: 10.
+    :``on_change``:  Callable (no arguments) invoked after a new copy of the
+                     document is loaded.  Default: None.
+
+    '''
+
+    def __init__(self, url, interval = 300, jitter = 0.1, cache_file = None, timeout = 10, on_change = None):
+        self.url = url
+        self.interval = interval
+        self.jitter = jitter
+        self.cache_file = cache_file
+        self.timeout = timeout
+        self.on_change = on_change
+
+        self.etag = None
+        self.last_modified = None
+
+        self._parser = SafeConfigParser()
+
+        self._url = urlsplit(url)
+        self._connection = None
+        self._lock = threading.Lock()
+
+        self._thread = None
+        self._stopped = threading.Event()
+
+        if self.cache_file is not None:
+            self._load_cache()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return getattr(self._parser, name)
+
+    def after_fork(self):
+        '''Reset state that must not be shared with the parent process.
+
+        Called in a forked child: the inherited connection is abandoned (the
+        parent keeps using it) and, if background refreshes were running in
+        the parent, they are restarted in the child.
+
+        '''
+
+        if self._connection is not None and self._connection.sock is not None:
+            self._connection.sock.close()
+
+        self._connection = None
+        self._lock = threading.Lock()
+
+        refreshing = self._thread is not None and not self._stopped.is_set()
+
+        self._thread = None
+        self._stopped = threading.Event()
+
+        if refreshing:
+            self.start()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, 'rb') as fh:
+                cache = json.loads(fh.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            logger.info('no usable cache in %s', self.cache_file)
+            return
+
+        logger.info('loading %s from %s', self.url, self.cache_file)
+
+        self._parser = _parse(cache['body'])
+        self.etag = cache.get('etag')
+        self.last_modified = cache.get('last_modified')
+
+    def _save_cache(self, body):
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+
+        fd, name = tempfile.mkstemp(dir = directory, prefix = '.crumbs-')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(json.dumps({ 'body': body, 'etag': self.etag, 'last_modified': self.last_modified }).encode('utf-8'))
+
+            os.rename(name, self.cache_file)
+        except (IOError, OSError):
+            logger.warn('could not write %s', self.cache_file)
+
+            if os.path.exists(name):
+                os.unlink(name)
+
+    def _request(self, headers):
+        if self._connection is None:
+            connection_class = HTTPSConnection if self._url.scheme == 'https' else HTTPConnection
+            self._connection = connection_class(self._url.netloc, timeout = self.timeout)
+
+        path = self._url.path or '/'
+        if self._url.query:
+            path += '?' + self._url.query
+
+        self._connection.request('GET', path, headers = headers)
+
+        response = self._connection.getresponse()
+        body = response.read()
+
+        return response, body
+
+    def read(self, *args):
+        '''Fetch the document if it has changed since the last fetch.
+
+        Arguments are accepted (and ignored) for compatibility with
+        ``ConfigParser.ConfigParser.read``.
+
+        **Return**
+
+        True if a new copy of the document was loaded; otherwise, False.
+
+        '''
+
+        headers = {}
+
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        with self._lock:
+            for attempt in ( 1, 2 ):
+                try:
+                    response, body = self._request(headers)
+                    break
+                except (HTTPException, IOError, OSError) as error:
+                    logger.info('fetching %s failed (attempt %s): %s', self.url, attempt, error)
+
+                    if self._connection is not None:
+                        self._connection.close()
+                        self._connection = None
+            else:
+                logger.warn('could not fetch %s—serving last good copy', self.url)
+                return False
+
+        logger.debug('%s: %s', self.url, response.status)
+
+        if response.status == 304:
+            return False
+
+        if response.status != 200:
+            logger.warn('could not fetch %s (%s)—serving last good copy', self.url, response.status)
+            return False
+
+        body = body.decode('utf-8')
+
+        try:
+            parser = _parse(body)
+        except Exception as error:
+            logger.warn('could not parse %s (%s)—serving last good copy', self.url, error)
+            return False
+
+        self._parser = parser
+        self.etag = response.getheader('ETag')
+        self.last_modified = response.getheader('Last-Modified')
+
+        logger.info('loaded new copy of %s', self.url)
+
+        if self.cache_file is not None:
+            self._save_cache(body)
+
+        if self.on_change is not None:
+            self.on_change()
+
+        return True
+
+    def start(self):
+        '''Start refreshing the document in a background thread.
+
+        Refreshes happen every ``interval`` seconds (plus or minus ``jitter``)
+        until ``stop`` is called.
+
+        '''
+
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+
+        def _():
+            while not self._stopped.wait(self.interval * (1 + random.uniform(-self.jitter, self.jitter))):
+                try:
+                    self.read()
+                except Exception:
+                    logger.exception('refreshing %s failed', self.url)
+
+        self._thread = threading.Thread(target = _, name = 'crumbs-refresh-' + self.url)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''Stop background refreshes and close the connection.'''
+
+        self._stopped.set()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+        self._thread = None
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Parameter definitions shared by ``Parameters`` objects.
+
+:``Schema``:          Parameter definitions (and the
+                      ``argparse.ArgumentParser`` built from them) that can be
+                      shared by many ``Parameters``.
+:``ValidationError``: One or more parameters' values are invalid.
+:``insert``:          Add a parameter name to a prefix trie (cf.
+                      ``Schema.find``).
+:``search``:          Return the names in a prefix trie matching a pattern.
+
+'''
+
+import argparse
+import copy
+import logging
+import os
+import sys
+
+from crumbs.sources import record_explicit
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationError(ValueError):
+    '''One or more parameters' values are invalid.
+
+    **Arguments**
+
+    :``errors``: Dictionary mapping parameter name to a description of why its
+                 value is invalid.
+
+    '''
+
+    def __init__(self, errors):
+        self.errors = errors
+
+        super(ValidationError, self).__init__('invalid values for {}: {}'.format(', '.join(sorted(errors.keys())), '; '.join([ '{}: {}'.format(_, errors[_]) for _ in sorted(errors.keys()) ])))
+
+
+class Schema(object):
+    '''Parameter definitions that can be shared by many ``Parameters``.
+
+    Parameters are added (and their command line arguments registered with
+    the ``argparse.ArgumentParser``) once.  Each ``Parameters`` created with
+    the schema (i.e. ``Parameters(schema = schema)``) only binds its own
+    sources and values.
+
+    A schema is frozen when it is first shared; afterwards, adding parameters
+    raises a ``RuntimeError``.  A ``Parameters`` created without a schema has
+    a private one that is never frozen.
+
+    **Arguments**
+
+    :``group_prefix``: If True, prefix command line arguments with the group
+                       name (cf. ``Parameters.__init__``).  Default: True.
+
+    .. note::
+        All other arguments are directly passed to ``argparse.ArgumentParser``.
+
+    **Properties**
+
+    :``defaults``:           Dictionary mapping parameter name to default value.
+    :``parameters``:         Dictionary mapping parameter name to parameter
+                             arguments (arguments passed to ``add_parameter``).
+    :``grouped_parameters``: Dictionary mapping parameter group to parameter
+                             dictionary (see parameters property).
+    :``groups``:             Set of all parameter groups.  Groups can be
+                             nested by naming them with dots '.' (i.e.
+                             'service.cache').
+    :``frozen``:             True if parameters can no longer be added.
+
+    '''
+
+    def __init__(self, *args, **kwargs):
+        self.defaults = {}
+        self.parameters = {}
+        self.grouped_parameters = { 'default': {} }
+        self.groups = set([ 'default' ])
+        self.frozen = False
+
+        # Prefix trie of parameter names by segment (cf. find).  Each node is
+        # a dictionary mapping segment to node; the None key marks the end of
+        # a parameter name.
+        self._trie = {}
+
+        self.group_prefix = kwargs.pop('group_prefix', True)
+
+        self.group_parsers = { 'default': argparse.ArgumentParser(*args, **kwargs) }
+
+    def add_parameter(self, **kwargs):
+        '''Add the parameter to the schema (cf. ``Parameters.add_parameter``).
+
+        **Return**
+
+        Name of the added parameter (i.e. group.long_option).
+
+        **Exceptions**
+
+        :``RuntimeError``: The schema is frozen.
+
+        '''
+
+        parameter_name = max(kwargs['options'], key = len).lstrip('-')
+
+        if 'dest' in kwargs:
+            parameter_name = kwargs['dest']
+
+        group = kwargs.pop('group', 'default')
+
+        parameter_name = '.'.join([ group, parameter_name ]).lstrip('.').replace('-', '_')
+
+        if self.frozen:
+            raise RuntimeError('cannot add parameter {} to a frozen schema'.format(parameter_name))
+
+        self.groups.add(group)
+
+        logger.info('adding parameter %s', parameter_name)
+
+        self.parameters[parameter_name] = copy.copy(kwargs)
+        self.parameters[parameter_name]['group'] = group
+        self.parameters[parameter_name]['type'] = kwargs.get('type', str)
+        self.parameters[parameter_name]['environment_prefix'] = kwargs.pop('environment_prefix', os.path.basename(sys.argv[0]))
+
+        if self.parameters[parameter_name]['environment_prefix'] is not None:
+            self.parameters[parameter_name]['environment_prefix'] = self.parameters[parameter_name]['environment_prefix'].upper().replace('-', '_')
+
+        logger.info('group: %s', group)
+
+        self.grouped_parameters.setdefault(group, {}).setdefault(parameter_name.replace(group + '.', ''), self.parameters[parameter_name])
+
+        self._index(parameter_name)
+
+        action_defaults = {
+            'store': kwargs.get('default'),
+            'store_const': kwargs.get('const'),
+            'store_true': False,
+            'store_false': True,
+            'append': [],
+            'append_const': [],
+            'count': 0,
+        }
+
+        self.defaults[parameter_name] = action_defaults[kwargs.get('action', 'store')]
+
+        logger.info('default value: %s', kwargs.get('default'))
+
+        if 'argument' in kwargs.pop('only', [ 'argument' ]):
+            if group not in self.group_parsers:
+                self.group_parsers[group] = self.group_parsers['default'].add_argument_group(group)
+
+            if self.group_prefix and group != 'default':
+                long_option = max(kwargs['options'], key = len)
+
+                kwargs['options'].remove(long_option)
+                kwargs['options'].append(long_option.replace('--', '--' + group.replace('_', '-').replace('.', '-') + '-'))
+
+                logger.debug('options: %s', kwargs['options'])
+
+            record_explicit(self.group_parsers[group].add_argument(*kwargs.pop('options'), **kwargs), self.group_parsers['default'])
+
+        return parameter_name
+
+    def find(self, pattern):
+        '''Return the names of parameters matching the pattern.
+
+        Groups can be nested by naming them with dots '.' (i.e.
+        'service.cache.redis') and patterns are matched segment by segment.  A
+        '*' segment matches any single segment; a trailing '*' matches
+        everything below the preceding segments (i.e. 'service.cache.*'
+        matches 'service.cache.redis.timeout').  Only the subtrees selected by
+        the pattern are visited.
+
+        **Arguments**
+
+        :``pattern``: Dotted parameter name (the group can be ommitted for the
+                      'default' group) that may contain '*' segments.
+
+        **Return**
+
+        Sorted list of matching parameter names.
+
+        '''
+
+        return search(self._trie, pattern)
+
+    def convert(self, values):
+        '''Return the values converted to their parameters' types.
+
+        Each value (that is not None) is passed through its parameter's
+        ``type`` and checked against its parameter's ``choices`` (every item
+        is checked if the value is a list).  All values are checked before
+        any errors are reported.
+
+        **Arguments**
+
+        :``values``: Dictionary mapping parameter name to unconverted value.
+
+        **Return**
+
+        Dictionary mapping parameter name to converted value.
+
+        **Exceptions**
+
+        :``ValidationError``: Any values could not be converted or are not
+                              valid choices.
+
+        '''
+
+        converted = {}
+        errors = {}
+
+        for parameter_name, value in values.items():
+            definition = self.parameters[parameter_name]
+
+            if value is not None:
+                try:
+                    value = definition['type'](value)
+                except Exception as error:
+                    errors[parameter_name] = 'could not convert {!r}: {}'.format(value, error)
+                    continue
+
+                choices = definition.get('choices')
+
+                if choices is not None:
+                    invalid = [ _ for _ in (value if isinstance(value, list) else [ value ]) if _ not in choices ]
+
+                    if invalid:
+                        errors[parameter_name] = 'invalid choice {!r} (choose from {})'.format(invalid[0], ', '.join([ repr(_) for _ in choices ]))
+                        continue
+
+            converted[parameter_name] = value
+
+        if errors:
+            raise ValidationError(errors)
+
+        return converted
+
+    def freeze(self):
+        '''Prevent any more parameters from being added.'''
+
+        self.frozen = True
+
+    def _index(self, parameter_name):
+        '''Add the parameter name to the prefix trie (cf. ``find``).'''
+
+        insert(self._trie, parameter_name)
+
+
+def insert(trie, parameter_name):
+    '''Add the parameter name to the prefix trie.
+
+    **Arguments**
+
+    :``trie``:           Prefix trie of parameter names by segment; each node
+                         is a dictionary mapping segment to node and the None
+                         key marks the end of a parameter name.
+    :``parameter_name``: Normalized name of the parameter.
+
+    '''
+
+    node = trie
+
+    for segment in parameter_name.split('.'):
+        node = node.setdefault(segment, {})
+
+    node[None] = parameter_name
+
+
+def search(trie, pattern):
+    '''Return the names in the prefix trie matching the pattern.
+
+    If nothing matches, the pattern is matched in the 'default' group (i.e.
+    'host' matches 'default.host'; cf. ``Parameters.__getitem__``).
+
+    **Arguments**
+
+    :``trie``:    Prefix trie of parameter names (cf. ``insert``).
+    :``pattern``: Dotted parameter name that may contain '*' segments (cf.
+                  ``Schema.find``).
+
+    **Return**
+
+    Sorted list of matching parameter names.
+
+    '''
+
+    segments = pattern.replace('-', '_').split('.')
+
+    names = _match(trie, segments)
+
+    if not names and segments[0] != 'default':
+        names = _match(trie, [ 'default' ] + segments)
+
+    return names
+
+
+def _match(trie, segments):
+    '''Return the names in the prefix trie matching the pattern's segments.'''
+
+    names = []
+    nodes = [ trie ]
+
+    for position, segment in enumerate(segments):
+        if segment == '*' and position == len(segments) - 1:
+            while nodes:
+                node = nodes.pop()
+
+                for key, child in node.items():
+                    if key is None:
+                        continue
+
+                    if None in child:
+                        names.append(child[None])
+
+                    nodes.append(child)
+
+            return sorted(names)
+
+        if segment == '*':
+            nodes = [ child for node in nodes for key, child in node.items() if key is not None ]
+        else:
+            nodes = [ node[segment] for node in nodes if segment in node ]
+
+    return sorted([ node[None] for node in nodes if None in node ])
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Resolved parameter values shared between processes.
+
+:``SnapshotWriter``: Publishes generations of resolved values to a memory
+                     mapped file (cf. ``Parameters.publish``).
+:``SharedSnapshot``: Read-only view of the latest generation published to a
+                     memory mapped file.
+
+The file starts with a header (magic, generation, offset and length of the
+current generation) followed by two slots.  Each generation is written to the
+slot not holding the current generation and the header is then updated, so
+readers never see a partially written generation.  The generation is odd while
+the header is being updated.
+
+'''
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'CRUMBS\x00\x01'
+_HEADER = struct.Struct('<8sQQQ')
+_INDEX_LENGTH = struct.Struct('<Q')
+
+# Generation of a file that has been replaced by a larger one.
+_MOVED = 2 ** 64 - 1
+
+
+def _encode(values):
+    '''Return the slot contents for the values.'''
+
+    blobs = []
+    index = {}
+    position = 0
+
+    for name, value in values.items():
+        blob = pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+        index[name] = ( position, len(blob) )
+
+        blobs.append(blob)
+        position += len(blob)
+
+    index = pickle.dumps(index, protocol = pickle.HIGHEST_PROTOCOL)
+
+    return _INDEX_LENGTH.pack(len(index)) + index + b''.join(blobs)
+
+
+class SnapshotWriter(object):
+    '''Publishes generations of resolved values to a memory mapped file.
+
+    **Arguments**
+
+    :``path``:     Path of the file to publish to.
+    :``capacity``: Initial size (in bytes) of each slot.  Slots grow (by
+                   replacing the file) if a generation does not fit.  Default:
+                   65536.
+    :``mode``:     Permissions of the file.  Readers only need read access
+                   (i.e. 0o640 to share with workers in the writer's group
+                   after they drop privileges).  Default: 0o600.
+
+    '''
+
+    def __init__(self, path, capacity = 65536, mode = 0o600):
+        self.path = path
+        self.capacity = capacity
+        self.mode = mode
+        self.generation = 0
+
+        self._file = None
+        self._mmap = None
+
+        self._create(capacity)
+
+    def _create(self, capacity, body = None):
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        fd, name = tempfile.mkstemp(dir = directory, prefix = '.crumbs-')
+
+        os.fchmod(fd, self.mode)
+        os.ftruncate(fd, _HEADER.size + 2 * capacity)
+
+        mapping = mmap.mmap(fd, 0)
+
+        generation = self.generation
+        length = 0
+
+        if body is not None:
+            generation += 2
+            length = len(body)
+
+            mapping[_HEADER.size:_HEADER.size + length] = body
+
+        _HEADER.pack_into(mapping, 0, _MAGIC, generation, _HEADER.size, length)
+
+        os.rename(name, self.path)
+
+        if self._mmap is not None:
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, _MOVED, 0, 0)
+
+            self._mmap.close()
+            os.close(self._file)
+
+        self._file = fd
+        self._mmap = mapping
+
+        self.capacity = capacity
+        self.generation = generation
+
+    def publish(self, values):
+        '''Publish a new generation of values.
+
+        **Arguments**
+
+        :``values``: Dictionary mapping parameter name to value.  Values must
+                     be picklable.
+
+        '''
+
+        body = _encode(values)
+
+        if len(body) > self.capacity:
+            logger.info('growing %s to %s byte slots', self.path, 2 * len(body))
+
+            self._create(2 * len(body), body)
+            return
+
+        _, generation, offset, _ = _HEADER.unpack_from(self._mmap, 0)
+
+        if offset == _HEADER.size:
+            offset = _HEADER.size + self.capacity
+        else:
+            offset = _HEADER.size
+
+        self._mmap[offset:offset + len(body)] = body
+
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, generation + 1, offset, len(body))
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, generation + 2, offset, len(body))
+
+        self.generation = generation + 2
+
+        logger.info('published generation %s to %s', self.generation, self.path)
+
+    def close(self):
+        '''Unmap and close the file (leaving it in place for readers).'''
+
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._file)
+
+            self._mmap = None
+            self._file = None
+
+
+class SharedSnapshot(Mapping):
+    '''Read-only view of the latest generation published to a file.
+
+    Values are only unpickled when requested and are then kept until a new
+    generation is published.  Every lookup compares the published generation
+    to the one that has been loaded; nothing else is read unless it changed.
+
+    Like ``Parameters``, names may omit the 'default' group and are insensitive
+    to the difference between hyphens '-' and underscores '_'.
+
+    **Arguments**
+
+    :``path``: Path of the file published to by a ``SnapshotWriter``.
+
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.generation = None
+
+        self._file = None
+        self._mmap = None
+
+        self._index = {}
+        self._offset = 0
+        self._values = {}
+
+        self._open()
+
+    def _open(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._file)
+
+        self._file = os.open(self.path, os.O_RDONLY)
+        self._mmap = mmap.mmap(self._file, 0, access = mmap.ACCESS_READ)
+
+        self.generation = None
+
+    def _current_generation(self):
+        return _HEADER.unpack_from(self._mmap, 0)[1]
+
+    def _load(self):
+        while True:
+            magic, generation, offset, length = _HEADER.unpack_from(self._mmap, 0)
+
+            if magic != _MAGIC:
+                raise ValueError('{} is not a crumbs snapshot'.format(self.path))
+
+            if generation == _MOVED:
+                self._open()
+                continue
+
+            if generation % 2:
+                time.sleep(0)
+                continue
+
+            try:
+                if length:
+                    index_length, = _INDEX_LENGTH.unpack_from(self._mmap, offset)
+                    index = pickle.loads(self._mmap[offset + _INDEX_LENGTH.size:offset + _INDEX_LENGTH.size + index_length])
+                else:
+                    index_length, index = 0, {}
+            except Exception:
+                if self._current_generation() == generation:
+                    raise
+
+                continue
+
+            if self._current_generation() == generation:
+                break
+
+        logger.debug('loaded generation %s of %s', generation, self.path)
+
+        self.generation = generation
+
+        self._index = index
+        self._offset = offset + _INDEX_LENGTH.size + index_length
+        self._values = {}
+
+    def _name(self, parameter_name):
+        if self.generation != self._current_generation():
+            self._load()
+
+        parameter_name = parameter_name.replace('-', '_')
+
+        if parameter_name not in self._index:
+            parameter_name = '.'.join([ 'default', parameter_name ])
+
+            if parameter_name not in self._index:
+                raise KeyError(parameter_name.replace('default.', '', 1))
+
+        return parameter_name
+
+    def __getitem__(self, parameter_name):
+        while True:
+            parameter_name = self._name(parameter_name)
+
+            try:
+                return self._values[parameter_name]
+            except KeyError:
+                pass
+
+            position, length = self._index[parameter_name]
+            position += self._offset
+
+            try:
+                value = pickle.loads(self._mmap[position:position + length])
+            except Exception:
+                if self._current_generation() == self.generation:
+                    raise
+
+                continue
+
+            if self._current_generation() == self.generation:
+                self._values[parameter_name] = value
+                return value
+
+    def __iter__(self):
+        if self.generation != self._current_generation():
+            self._load()
+
+        return iter(list(self._index.keys()))
+
+    def __len__(self):
+        if self.generation != self._current_generation():
+            self._load()
+
+        return len(self._index)
+
+    def close(self):
+        '''Unmap and close the file.'''
+
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._file)
+
+            self._mmap = None
+            self._file = None
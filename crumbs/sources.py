@@ -0,0 +1,755 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Sources of parameter values.
+
+:``Source``:              Base class for providers of parameter values.
+:``ArgumentSource``:      Values parsed from ``sys.argv``.
+:``ConfigurationSource``: Values set in registered ``ini`` files.
+:``EnvironmentSource``:   Values set in environment variables.
+:``SQLiteSource``:        Values stored in a SQLite database.
+:``SecretsSource``:       Values stored one per file in a directory.
+:``record_explicit``:     Make an ``argparse`` action record when it is given
+                          on the command line (cf. ``ArgumentSource``).
+:``record_consumed``:     Make an ``argparse`` parser note whether each action
+                          it invokes consumed any arguments.
+
+'''
+
+import collections
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from configparser import InterpolationError
+except ImportError:
+    from ConfigParser import InterpolationError
+
+logger = logging.getLogger(__name__)
+
+_clock = getattr(time, 'monotonic', time.time)
+
+_MISSING = object()
+
+# Attribute of the argparse.Namespace holding the set of destinations given
+# on the command line (cf. record_explicit).
+EXPLICIT = '_crumbs_explicit'
+
+# Attribute of an argparse.Action set to True if it consumed any arguments
+# when it was last invoked (cf. record_consumed).
+_CONSUMED = '_crumbs_consumed'
+
+# Generated subclasses of argparse.Action (cf. record_explicit) by class.
+_EXPLICIT_ACTIONS = {}
+
+
+def record_consumed(parser):
+    '''Make the argparse parser note whether each action consumed arguments.
+
+    Before the parser invokes an action, the action's ``_crumbs_consumed``
+    attribute is set to True if any arguments were consumed for it (cf.
+    ``record_explicit``).  Recording more than once has no further effect.
+
+    **Arguments**
+
+    :``parser``: ``argparse.ArgumentParser`` that parses the arguments.
+
+    '''
+
+    if getattr(parser, _CONSUMED, False):
+        return
+
+    get_values = parser._get_values
+
+    def _get_values(action, arg_strings):
+        setattr(action, _CONSUMED, bool(arg_strings))
+
+        return get_values(action, arg_strings)
+
+    parser._get_values = _get_values
+
+    setattr(parser, _CONSUMED, True)
+
+
+def record_explicit(action, parser):
+    '''Make the argparse action record when it is given on the command line.
+
+    The action's class is replaced with a generated subclass that adds the
+    action's ``dest`` to the namespace's ``EXPLICIT`` set whenever argparse
+    invokes it.  Positional arguments that consumed nothing (i.e. ``nargs``
+    of '*' or '?' with no arguments) are not recorded; the parser is made to
+    note what each action consumed (cf. ``record_consumed``).
+
+    **Arguments**
+
+    :``action``: ``argparse.Action`` returned by ``add_argument``.
+    :``parser``: ``argparse.ArgumentParser`` that parses the action's
+                 arguments (not an argument group).
+
+    **Return**
+
+    The action.
+
+    '''
+
+    record_consumed(parser)
+
+    action_class = type(action)
+
+    explicit_class = _EXPLICIT_ACTIONS.get(action_class)
+
+    if explicit_class is None:
+        def __call__(self, parser, namespace, values, option_string = None):
+            super(explicit_class, self).__call__(parser, namespace, values, option_string)
+
+            if not self.option_strings and not getattr(self, _CONSUMED, True):
+                return
+
+            explicit = getattr(namespace, EXPLICIT, None)
+
+            if explicit is None:
+                explicit = set()
+                setattr(namespace, EXPLICIT, explicit)
+
+            explicit.add(self.dest)
+
+        explicit_class = type(action_class.__name__, ( action_class, ), { '__call__': __call__ })
+
+        _EXPLICIT_ACTIONS[action_class] = explicit_class
+
+    action.__class__ = explicit_class
+
+    return action
+
+
+class Source(object):
+    '''Provider of values for parameters.
+
+    ``Parameters`` consults its sources in order of decreasing ``precedence``
+    and the first source to provide a value for a parameter wins.  Each source
+    is asked for all outstanding parameters at once (cf. ``get_many``) so
+    sources that are expensive to query can answer a batch of keys with a
+    single request.
+
+    Subclasses must implement ``get_many``.  ``Parameters`` calls ``fetch``
+    which, if ``ttl`` is set, answers from a cache of recent results before
+    falling back to ``get_many`` for the keys it does not have.
+
+    Sources whose values come from the filesystem can list files or
+    directories in ``paths``.  If ``Parameters`` is watching for changes with
+    inotify, it watches these paths as well, sets ``watched`` to True, and
+    calls ``changed`` when they are modified.
+
+    **Arguments**
+
+    :``precedence``: Order in which this source is consulted; higher values are
+                     consulted first.  Default: 0.
+    :``ttl``:        Seconds that results (including misses) from ``get_many``
+                     are cached.  If None, nothing is cached.  Default: None.
+    :``maxsize``:    Maximum number of cached keys.  The least recently used
+                     keys are evicted first.  Default: 1024.
+
+    '''
+
+    name = 'source'
+
+    paths = ()
+    watched = False
+
+    def __init__(self, precedence = 0, ttl = None, maxsize = 1024):
+        self.precedence = precedence
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def get_many(self, keys):
+        '''Return the values this source has for the requested keys.
+
+        **Arguments**
+
+        :``keys``: Iterable of parameter names (i.e. group.long_option).
+
+        **Return**
+
+        Dictionary mapping parameter name to value for those keys the source
+        has a value for.  Keys without a value are omitted.
+
+        '''
+
+        raise NotImplementedError('{} does not implement get_many'.format(type(self).__name__))
+
+    def fetch(self, keys):
+        '''Return the values for the requested keys (consulting the cache).
+
+        **Arguments**
+
+        :``keys``: Iterable of parameter names (i.e. group.long_option).
+
+        **Return**
+
+        Dictionary mapping parameter name to value (cf. ``get_many``).
+
+        '''
+
+        if self.ttl is None:
+            return self.get_many(keys)
+
+        now = _clock()
+
+        values = {}
+        missing = []
+
+        with self._cache_lock:
+            for key in keys:
+                expires, value = self._cache.pop(key, ( None, _MISSING ))
+
+                if expires is None or expires < now:
+                    missing.append(key)
+                    continue
+
+                self._cache[key] = ( expires, value )
+
+                if value is not _MISSING:
+                    values[key] = value
+
+        if not missing:
+            return values
+
+        logger.debug('%s cache misses: %s', self.name, missing)
+
+        found = self.get_many(missing)
+        expires = now + self.ttl
+
+        with self._cache_lock:
+            for key in missing:
+                self._cache[key] = ( expires, found.get(key, _MISSING) )
+
+                if key in found:
+                    values[key] = found[key]
+
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last = False)
+
+        return values
+
+    def invalidate(self, keys = None):
+        '''Forget cached results.
+
+        **Arguments**
+
+        :``keys``: Iterable of parameter names to forget.  If None, forget all
+                   cached results.  Default: None.
+
+        '''
+
+        with self._cache_lock:
+            if keys is None:
+                self._cache.clear()
+            else:
+                for key in keys:
+                    self._cache.pop(key, None)
+
+    def after_fork(self):
+        '''Reset state that must not be shared with the parent process.
+
+        Called in a forked child.  By default, the cache's lock (which may
+        have been held by another thread when the process forked) is
+        replaced.
+
+        '''
+
+        self._cache_lock = threading.Lock()
+
+    def changed(self, path):
+        '''Handle a modification of one of ``paths`` (or a file below them).
+
+        By default, all cached results are forgotten.
+
+        **Arguments**
+
+        :``path``: Path of the modified file.
+
+        '''
+
+        self.invalidate()
+
+
+class ArgumentSource(Source):
+    '''Values parsed from ``sys.argv``.
+
+    Only arguments that were given on the command line (cf.
+    ``record_explicit``) have values; an argument given with its default value
+    still takes precedence over other sources.
+
+    **Arguments**
+
+    :``namespace``:    ``argparse.Namespace`` populated by ``Parameters.parse``.
+    :``group_prefix``: True if long options are prefixed with their group.
+
+    All other arguments are passed to ``Source``.
+
+    '''
+
+    name = 'argument'
+
+    def __init__(self, namespace, group_prefix = True, precedence = 300, **kwargs):
+        super(ArgumentSource, self).__init__(precedence = precedence, **kwargs)
+
+        self._namespace = namespace
+        self._group_prefix = group_prefix
+
+    def get_many(self, keys):
+        explicit = getattr(self._namespace, EXPLICIT, None)
+
+        values = {}
+
+        if not explicit:
+            return values
+
+        for key in keys:
+            if self._group_prefix:
+                argument_name = key.replace('.', '_')
+            else:
+                _, argument_name = key.rsplit('.', 1)
+
+            argument_name = argument_name.replace('default_', '', 1)
+
+            if argument_name in explicit:
+                values[key] = getattr(self._namespace, argument_name)
+
+        return values
+
+
+class ConfigurationSource(Source):
+    '''Values set in registered ``ini`` files.
+
+    All registered files are merged into a single index mapping section and
+    option to value.  The index is built on first use and rebuilt after
+    ``invalidate`` (i.e. after a configuration file is added or re-read).
+
+    If a ``crumbs.cache.ConfigurationCache`` is provided, the merged index is
+    stored in it and reused as long as every file's version (recorded in
+    ``versions`` when the file is read) is unchanged.
+
+    **Arguments**
+
+    :``configuration_files``: Dictionary mapping configuration file path to an
+                              active ``ConfigParser.ConfigParser``.
+    :``cache``:               ``crumbs.cache.ConfigurationCache`` that stores
+                              the merged index.  Default: None.
+
+    All other arguments are passed to ``Source``.
+
+    '''
+
+    name = 'configuration'
+
+    def __init__(self, configuration_files, cache = None, precedence = 200, **kwargs):
+        super(ConfigurationSource, self).__init__(precedence = precedence, **kwargs)
+
+        self._configuration_files = configuration_files
+
+        self.cache = cache
+        self.versions = {}
+
+        self._index = None
+        self._generation = 0
+
+    @property
+    def index(self):
+        '''Dictionary mapping (section, option) to value.'''
+
+        return self.ensure_index()
+
+    def ensure_index(self):
+        '''Build the index (and store it in the cache) if it is not built.
+
+        **Return**
+
+        The index (cf. ``index``).
+
+        '''
+
+        index = self._index
+
+        if index is None:
+            generation = self._generation
+
+            index = self._build()
+
+            if generation == self._generation:
+                self._index = index
+
+        return index
+
+    def _build(self):
+        logger.info('indexing configuration files')
+
+        configuration_files = list(self._configuration_files.items())
+
+        index = None
+
+        versions = None
+        if self.cache is not None:
+            versions = [ self.versions.get(_) for _, __ in configuration_files ]
+
+            if None in versions:
+                versions = None
+            else:
+                index = self.cache.get_index(versions)
+
+        if index is None:
+            index = {}
+
+            for configuration_file_name, configuration_file in configuration_files:
+                logger.debug('indexing %s', configuration_file_name)
+
+                for section in configuration_file.sections():
+                    for option in configuration_file.options(section):
+                        try:
+                            index[( section, option )] = configuration_file.get(section, option)
+                        except InterpolationError as error:
+                            index[( section, option )] = error
+
+            if versions is not None:
+                self.cache.put_index(versions, index)
+
+        return index
+
+    def get_many(self, keys):
+        index = self.index
+
+        values = {}
+
+        for key in keys:
+            section, option = key.rsplit('.', 1)
+
+            value = index.get(( section, option.lower() ), _MISSING)
+
+            if value is _MISSING:
+                continue
+
+            if isinstance(value, InterpolationError):
+                raise value
+
+            values[key] = value
+
+        return values
+
+    def invalidate(self, keys = None):
+        super(ConfigurationSource, self).invalidate(keys)
+
+        self._generation += 1
+        self._index = None
+
+    def rebuild(self):
+        '''Rebuild the index and replace the current one with it.
+
+        Unlike ``invalidate``, lookups continue to use the current index while
+        the new one is built.
+
+        '''
+
+        self._generation += 1
+        self._index = self._build()
+
+        super(ConfigurationSource, self).invalidate()
+
+
+class EnvironmentSource(Source):
+    '''Values set in environment variables.
+
+    Variables are named by the parameter's ``environment_prefix`` and name
+    uppercased with dots '.' replaced by underscores (i.e.
+    PREFIX_GROUP_LONG_OPTION where group is ommitted if it is 'default').
+    Values have environment variables in them expanded.
+
+    **Arguments**
+
+    :``parameters``: Dictionary mapping parameter name to parameter arguments
+                     (cf. ``Parameters.parameters``).
+
+    All other arguments are passed to ``Source``.
+
+    '''
+
+    name = 'environment'
+
+    def __init__(self, parameters, precedence = 100, **kwargs):
+        super(EnvironmentSource, self).__init__(precedence = precedence, **kwargs)
+
+        self._parameters = parameters
+
+    def get_many(self, keys):
+        environment = os.environ
+
+        values = {}
+
+        for key in keys:
+            variable = '_'.join(key.replace('default.', '', 1).split('.')).upper()
+
+            environment_prefix = self._parameters[key]['environment_prefix']
+            if environment_prefix is not None:
+                variable = environment_prefix + '_' + variable
+
+            try:
+                values[key] = os.path.expandvars(environment[variable])
+            except KeyError:
+                continue
+
+        return values
+
+
+class SQLiteSource(Source):
+    '''Values stored in a SQLite database.
+
+    Values are kept in a table with the following schema (created if it does
+    not exist)::
+
+        CREATE TABLE parameters (
+            tenant  TEXT NOT NULL DEFAULT '',
+            section TEXT NOT NULL,
+            option  TEXT NOT NULL,
+            value   TEXT,
+            PRIMARY KEY (tenant, section, option)
+        )
+
+    where section and option correspond to the group and long option of a
+    parameter.  Only the rows of a single tenant are visible to a source.
+
+    Values are looked up as they are requested (nothing is loaded up front) and
+    kept in a bounded least recently used cache.  At most every
+    ``check_interval`` seconds, ``PRAGMA data_version`` is consulted to detect
+    changes committed by other connections; when it changes, only the cached
+    values that differ from the database are invalidated (cf. ``refresh``).
+
+    **Arguments**
+
+    :``path``:           Path to the SQLite database.
+    :``tenant``:         Tenant whose values are provided.  Default: ''.
+    :``table``:          Name of the table holding values.  Default:
+                         'parameters'.
+    :``check_interval``: Seconds between checks for changes.  Default: 1.
+
+    All other arguments are passed to ``Source``.  The ``precedence`` defaults
+    to 250 (between arguments and configuration files), ``ttl`` defaults to
+    forever (values are only invalidated by changes), and ``maxsize`` defaults
+    to 65536.
+
+    '''
+
+    name = 'sqlite'
+
+    _batch_size = 500
+
+    def __init__(self, path, tenant = '', table = 'parameters', check_interval = 1, precedence = 250, ttl = float('inf'), maxsize = 65536, **kwargs):
+        super(SQLiteSource, self).__init__(precedence = precedence, ttl = ttl, maxsize = maxsize, **kwargs)
+
+        self.path = path
+        self.tenant = tenant
+        self.table = table
+        self.check_interval = check_interval
+
+        self._connection = sqlite3.connect(path, check_same_thread = False)
+        self._connection_lock = threading.Lock()
+
+        with self._connection_lock:
+            self._connection.executescript(
+                'CREATE TABLE IF NOT EXISTS "{0}" ('
+                '    tenant  TEXT NOT NULL DEFAULT \'\','
+                '    section TEXT NOT NULL,'
+                '    option  TEXT NOT NULL,'
+                '    value   TEXT,'
+                '    PRIMARY KEY (tenant, section, option)'
+                ');'.format(table)
+            )
+
+            self._data_version = self._connection.execute('PRAGMA data_version').fetchone()[0]
+
+        self._checked = _clock()
+
+    def after_fork(self):
+        '''Reconnect to the database (connections must not cross a fork).'''
+
+        super(SQLiteSource, self).after_fork()
+
+        self._connection = sqlite3.connect(self.path, check_same_thread = False)
+        self._connection_lock = threading.Lock()
+
+    def close(self):
+        '''Close the connection to the database.'''
+
+        with self._connection_lock:
+            self._connection.close()
+
+    def get_many(self, keys):
+        sections = {}
+
+        for key in keys:
+            section, option = key.rsplit('.', 1)
+            sections.setdefault(section, []).append(option)
+
+        values = {}
+
+        with self._connection_lock:
+            for section, options in sections.items():
+                for offset in range(0, len(options), self._batch_size):
+                    batch = options[offset:offset + self._batch_size]
+
+                    rows = self._connection.execute(
+                        'SELECT option, value FROM "{0}" WHERE tenant = ? AND section = ? AND option IN ({1})'.format(self.table, ', '.join('?' * len(batch))),
+                        [ self.tenant, section ] + batch,
+                    )
+
+                    for option, value in rows:
+                        values[section + '.' + option] = value
+
+        return values
+
+    def fetch(self, keys):
+        if _clock() - self._checked >= self.check_interval:
+            self.refresh()
+
+        return super(SQLiteSource, self).fetch(keys)
+
+    def refresh(self):
+        '''Invalidate cached values that changed in the database.
+
+        Does nothing unless ``PRAGMA data_version`` reports that another
+        connection has committed changes since the last check.
+
+        **Return**
+
+        Set of parameter names whose cached values were invalidated.
+
+        '''
+
+        self._checked = _clock()
+
+        with self._connection_lock:
+            data_version = self._connection.execute('PRAGMA data_version').fetchone()[0]
+
+        if data_version == self._data_version:
+            return set()
+
+        logger.info('%s changed (data_version %s → %s)', self.path, self._data_version, data_version)
+
+        self._data_version = data_version
+
+        with self._cache_lock:
+            cached = dict([ ( key, value ) for key, ( _, value ) in self._cache.items() ])
+
+        found = self.get_many(list(cached.keys()))
+
+        changed = set([ key for key, value in cached.items() if found.get(key, _MISSING) != value ])
+
+        logger.debug('changed: %s', changed)
+
+        self.invalidate(changed)
+
+        return changed
+
+
+class SecretsSource(Source):
+    '''Values stored one per file in a directory.
+
+    Each parameter maps to a file in ``directory`` named after the parameter
+    (i.e. group.long_option where group and the dot are ommitted if it is
+    'default') whose contents are the parameter's value.  Files are not read
+    until their parameter is requested and are then cached.
+
+    Cached values are re-read when their file's modification time, size, or
+    inode changes.  If ``Parameters`` is watching for changes with inotify, the
+    directory is watched instead and the files are not checked on every
+    lookup.
+
+    **Arguments**
+
+    :``directory``: Directory containing the files.  Default: '/run/secrets'.
+    :``strip``:     If True, remove trailing newlines from values.  Default:
+                    True.
+
+    All other arguments are passed to ``Source``.  The ``precedence`` defaults
+    to 150 (between configuration files and environment variables).
+
+    '''
+
+    name = 'secrets'
+
+    def __init__(self, directory = '/run/secrets', strip = True, precedence = 150, **kwargs):
+        super(SecretsSource, self).__init__(precedence = precedence, **kwargs)
+
+        self.directory = directory
+        self.strip = strip
+
+        self.paths = ( directory, )
+
+        self._secrets = {}
+        self._secrets_lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key.replace('default.', '', 1))
+
+    def get_many(self, keys):
+        values = {}
+
+        for key in keys:
+            cached = self._secrets.get(key)
+
+            if cached is not None and self.watched:
+                stat = cached[0]
+            else:
+                try:
+                    stat = os.stat(self._path(key))
+                except OSError:
+                    continue
+
+                stat = ( stat.st_mtime, stat.st_size, stat.st_ino )
+
+            if cached is None or cached[0] != stat:
+                logger.info('reading secret %s', key)
+
+                try:
+                    with open(self._path(key), 'r') as fh:
+                        value = fh.read()
+                except (IOError, OSError):
+                    logger.warn('could not read %s', self._path(key))
+                    continue
+
+                if self.strip:
+                    value = value.rstrip('\r\n')
+
+                cached = ( stat, value )
+
+                with self._secrets_lock:
+                    self._secrets[key] = cached
+
+            values[key] = cached[1]
+
+        return values
+
+    def after_fork(self):
+        super(SecretsSource, self).after_fork()
+
+        self._secrets_lock = threading.Lock()
+
+    def changed(self, path):
+        super(SecretsSource, self).changed(path)
+
+        name = os.path.relpath(path, self.directory)
+
+        with self._secrets_lock:
+            if name.startswith('.') or os.sep in name:
+                self._secrets.clear()
+            else:
+                self._secrets.pop(name, None)
+                self._secrets.pop('default.' + name, None)
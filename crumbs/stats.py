@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 by Alex Brandt <alunduil@alunduil.com>
+#
+# crumbs is freely distributable under the terms of an MIT-style license.
+# See COPYING or http://www.opensource.org/licenses/mit-license.php.
+
+'''Lookup and re-read instrumentation.
+
+:``Histogram``:  Counts of durations by bucket.
+:``Statistics``: Per parameter lookup counts, winning sources, and latencies
+                 (cf. ``Parameters.stats``).
+
+'''
+
+import bisect
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the histogram buckets.  Durations longer than
+# the last bound are counted in a final, unbounded bucket.
+BOUNDS = (
+    1e-6, 2e-6, 5e-6,
+    1e-5, 2e-5, 5e-5,
+    1e-4, 2e-4, 5e-4,
+    1e-3, 2e-3, 5e-3,
+    1e-2, 2e-2, 5e-2,
+    1e-1, 2e-1, 5e-1,
+    1, 2, 5, 10,
+)
+
+
+class Histogram(object):
+    '''Counts of durations by bucket.
+
+    **Properties**
+
+    :``count``:  Number of durations added.
+    :``total``:  Sum of the durations added (in seconds).
+    :``counts``: List with the number of durations in each bucket (cf.
+                 ``BOUNDS``); the last item counts durations longer than every
+                 bound.
+
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.counts = [ 0 ] * (len(BOUNDS) + 1)
+
+    def add(self, duration):
+        '''Add a duration (in seconds).'''
+
+        self.count += 1
+        self.total += duration
+
+        self.counts[bisect.bisect_left(BOUNDS, duration)] += 1
+
+    def as_dict(self):
+        '''Return the histogram as a dictionary of plain values.'''
+
+        return {
+            'count': self.count,
+            'total': self.total,
+            'buckets': list(zip(BOUNDS + ( float('inf'), ), self.counts)),
+        }
+
+
+class Statistics(object):
+    '''Per parameter lookup counts, winning sources, and latencies.
+
+    Only collected when ``Parameters`` is created with ``instrument = True``.
+    Updates are serialized with a lock so lookups from multiple threads are
+    counted correctly.
+
+    **Properties**
+
+    :``lookups``: Dictionary mapping parameter name to the number of times it
+                  was looked up (cf. ``Parameters.__getitem__``).
+    :``sources``: Dictionary mapping parameter name to a dictionary mapping
+                  source name (i.e. 'argument', 'configuration',
+                  'environment', or 'default'; 'override' for context
+                  overrides, 'stored' for values stored by ``strict`` mode
+                  or ``from_export``, and 'derived' for derived parameters)
+                  to the number of times that source provided the
+                  parameter's value for a lookup.  Values resolved by
+                  ``snapshot``, ``group``, ``bind``, ``strict`` validation,
+                  or to interpolate or derive other values are not
+                  counted.
+    :``latency``: ``Histogram`` of lookup durations.
+    :``reloads``: ``Histogram`` of ``Parameters.read_configuration_files``
+                  durations.
+
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+        '''Discard everything recorded so far.'''
+
+        with self._lock:
+            self.lookups = {}
+            self.sources = {}
+            self.latency = Histogram()
+            self.reloads = Histogram()
+
+    def record_lookup(self, parameter_name, duration):
+        '''Record a lookup of the parameter that took duration seconds.'''
+
+        with self._lock:
+            self.lookups[parameter_name] = self.lookups.get(parameter_name, 0) + 1
+            self.latency.add(duration)
+
+    def record_sources(self, source_name, parameter_names):
+        '''Record that the source provided the parameters' values.'''
+
+        with self._lock:
+            for parameter_name in parameter_names:
+                sources = self.sources.setdefault(parameter_name, {})
+                sources[source_name] = sources.get(source_name, 0) + 1
+
+    def record_reload(self, duration):
+        '''Record a re-read of the configuration files that took duration
+        seconds.
+
+        '''
+
+        with self._lock:
+            self.reloads.add(duration)
+
+    def as_dict(self):
+        '''Return the statistics as a dictionary of plain values.
+
+        **Return**
+
+        Dictionary with the following keys:
+
+        :``lookups``: Dictionary mapping parameter name to lookup count.
+        :``sources``: Dictionary mapping parameter name to a dictionary mapping
+                      source name to count.
+        :``latency``: Lookup duration histogram (cf. ``Histogram.as_dict``).
+        :``reloads``: Re-read duration histogram (cf. ``Histogram.as_dict``).
+
+        '''
+
+        with self._lock:
+            return {
+                'lookups': dict(self.lookups),
+                'sources': copy.deepcopy(self.sources),
+                'latency': self.latency.as_dict(),
+                'reloads': self.reloads.as_dict(),
+            }
@@ -7,6 +7,7 @@
 
 import copy
 import logging
+import sys
 
 try:
     import unittest2 as unittest
@@ -23,3 +24,19 @@ class BaseParametersTest(unittest.TestCase):
         super(BaseParametersTest, self).setUp()
 
         self.parameters = copy.deepcopy(PARAMETERS)
+
+
+class BaseArgvTest(unittest.TestCase):
+    # Command line each test runs with; sys.argv is restored afterwards.
+    argv = [ 'crumbs' ]
+
+    def setUp(self):
+        super(BaseArgvTest, self).setUp()
+
+        original_argv = sys.argv
+
+        def _():
+            sys.argv = original_argv
+        self.addCleanup(_)
+
+        sys.argv = list(self.argv)
@@ -6,10 +6,18 @@
 # See COPYING or http://www.opensource.org/licenses/mit-license.php.
 
 import functools
+import gc
+import logging
 import os
+import pickle
+import shutil
+import signal
+import sqlite3
 import sys
 import tempfile
+import threading
 import time
+import warnings
 
 try:
     import unittest2 as unittest
@@ -21,9 +29,27 @@ try:
 except ImportError:
     from ConfigParser import SafeConfigParser
 
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+
 from crumbs import Parameters
+from crumbs import Source
+from crumbs import ValidationError
+from crumbs import _contextvars_loaded
 from crumbs import _pyinotify_loaded
-
+from crumbs.completion import complete
+from crumbs.completion import load_index
+from crumbs.completion import main
+from crumbs.schema import Schema
+from crumbs.snapshot import SharedSnapshot
+from crumbs.sources import SQLiteSource
+from crumbs.sources import SecretsSource
+
+from test_crumbs.test_common import BaseArgvTest
 from test_crumbs.test_common import BaseParametersTest
 
 
@@ -95,6 +121,320 @@ class ParametersAddConfigurationFileTest(BaseParametersTest):
         self.assertEqual('bar', self.p['default.foo'])
         self.assertEqual('foo', self.p['default.bar'])
 
+    @unittest.skipUnless(_pyinotify_loaded and hasattr(os, 'register_at_fork'), 'inotify module or os.register_at_fork not available')
+    def test_add_configuration_file_with_inotify_forked(self):
+        '''Parameters(inotify = True).add_configuration_file()—forked'''
+
+        self.p = Parameters(inotify = True)
+
+        self._assert_configuration_readable()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                with open(self.file_name, 'a') as fh:
+                    fh.write('bar = foo')
+
+                time.sleep(1)
+
+                self.p['default.foo']
+            finally:
+                os._exit(0)
+
+        os.waitpid(pid, 0)
+
+        self.assertEqual('foo', self.p['default.bar'])
+
+    @unittest.skipUnless(hasattr(signal, 'SIGHUP'), 'SIGHUP not available')
+    def test_add_configuration_file_with_reload_on_signal(self):
+        '''Parameters().reload_on_signal()—coalesced'''
+
+        self.p = Parameters()
+
+        self._assert_configuration_readable()
+
+        self.addCleanup(functools.partial(signal.signal, signal.SIGHUP, signal.getsignal(signal.SIGHUP)))
+
+        self.p.reload_on_signal()
+
+        reads = []
+        read_configuration_files = self.p.read_configuration_files
+
+        def _():
+            reads.append(None)
+            time.sleep(0.1)
+            read_configuration_files()
+
+        self.p.read_configuration_files = _
+
+        with open(self.file_name, 'a') as fh:
+            fh.write('bar = foo')
+
+        for _ in range(50):
+            os.kill(os.getpid(), signal.SIGHUP)
+
+        for _ in range(50):
+            if self.p['default.bar'] is not None:
+                break
+
+            time.sleep(0.1)
+
+        time.sleep(0.3)
+
+        self.assertEqual('foo', self.p['default.bar'])
+        self.assertLessEqual(len(reads), 2)
+
+    @unittest.skipUnless(hasattr(signal, 'SIGHUP'), 'SIGHUP not available')
+    def test_reload_on_signal_collected(self):
+        '''Parameters().reload_on_signal()—stopped when collected'''
+
+        self.addCleanup(functools.partial(signal.signal, signal.SIGHUP, signal.getsignal(signal.SIGHUP)))
+
+        threads = set(threading.enumerate())
+
+        p = Parameters()
+        p.reload_on_signal()
+
+        read_fd, write_fd = p._reload_pipe
+        thread, = [ _ for _ in threading.enumerate() if _ not in threads ]
+
+        del p
+        gc.collect()
+
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+
+        for fd in ( read_fd, write_fd ):
+            with self.assertRaises(OSError):
+                os.fstat(fd)
+
+
+class ParametersConfigurationCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(shutil.rmtree, directory))
+
+        self.file_name = os.path.join(directory, 'crumbs.ini')
+        self.cache_name = os.path.join(directory, 'crumbs.cache')
+
+        with open(self.file_name, 'w') as fh:
+            fh.write(
+                '[default]\n'
+                'foo = bar\n'
+            )
+
+    def _parameters(self):
+        p = Parameters(configuration_cache = self.cache_name)
+        p.add_parameter(options = [ '--foo' ])
+        p.add_configuration_file(self.file_name)
+        p.parse()
+
+        return p
+
+    def test_configuration_cache_written(self):
+        '''Parameters(configuration_cache = …)—cache written'''
+
+        self.assertEqual('bar', self._parameters()['foo'])
+        self.assertTrue(os.path.exists(self.cache_name))
+
+    def test_configuration_cache_used(self):
+        '''Parameters(configuration_cache = …)—unchanged file not parsed'''
+
+        self._parameters()
+
+        stat = os.stat(self.file_name)
+
+        with open(self.file_name, 'r+') as fh:
+            fh.write('[default]\nfoo = baz\n')
+
+        if hasattr(stat, 'st_mtime_ns'):
+            os.utime(self.file_name, ns = ( stat.st_atime_ns, stat.st_mtime_ns ))
+        else:
+            os.utime(self.file_name, ( stat.st_atime, stat.st_mtime ))
+
+        self.assertEqual('bar', self._parameters()['foo'])
+
+    def test_configuration_cache_changed(self):
+        '''Parameters(configuration_cache = …)—changed file parsed'''
+
+        self._parameters()
+
+        with open(self.file_name, 'w') as fh:
+            fh.write('[default]\nfoo = quux\n')
+
+        self.assertEqual('quux', self._parameters()['foo'])
+
+    def test_configuration_cache_corrupt(self):
+        '''Parameters(configuration_cache = …)—corrupt cache ignored'''
+
+        with open(self.cache_name, 'w') as fh:
+            fh.write('corrupt')
+
+        self.assertEqual('bar', self._parameters()['foo'])
+
+
+class ParametersAddConfigurationURLTest(unittest.TestCase):
+    def setUp(self):
+        self.document = { 'body': b'[default]\nfoo = bar\n', 'etag': '"1"' }
+        self.requests = []
+
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                test.requests.append(( self.client_address, self.headers.get('If-None-Match') ))
+
+                if test.document is None:
+                    self.send_response(500)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                elif self.headers.get('If-None-Match') == test.document['etag']:
+                    self.send_response(304)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                else:
+                    self.send_response(200)
+                    self.send_header('ETag', test.document['etag'])
+                    self.send_header('Content-Length', str(len(test.document['body'])))
+                    self.end_headers()
+                    self.wfile.write(test.document['body'])
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(( '127.0.0.1', 0 ), Handler)
+
+        thread = threading.Thread(target = self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.url = 'http://127.0.0.1:{}/crumbs.ini'.format(self.server.server_address[1])
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--foo' ])
+
+    def test_add_configuration_url(self):
+        '''Parameters().add_configuration_url()'''
+
+        self.p.add_configuration_url(self.url, refresh = False)
+        self.addCleanup(self.p.configuration_files[self.url].stop)
+
+        self.p.parse()
+
+        self.assertEqual('bar', self.p['foo'])
+
+    def test_add_configuration_url_conditional_read(self):
+        '''Parameters().add_configuration_url()—conditional re-read'''
+
+        self.p.add_configuration_url(self.url, refresh = False)
+        self.addCleanup(self.p.configuration_files[self.url].stop)
+
+        self.p.parse()
+
+        self.p.read_configuration_files()
+
+        self.assertEqual('bar', self.p['foo'])
+
+        self.document = { 'body': b'[default]\nfoo = baz\n', 'etag': '"2"' }
+
+        self.p.read_configuration_files()
+
+        self.assertEqual('baz', self.p['foo'])
+
+        self.assertEqual([ None, '"1"', '"1"' ], [ _[1] for _ in self.requests ])
+        self.assertEqual(1, len(set([ _[0] for _ in self.requests ])))
+
+    def test_add_configuration_url_failure(self):
+        '''Parameters().add_configuration_url()—serve last good copy'''
+
+        self.p.add_configuration_url(self.url, refresh = False)
+        self.addCleanup(self.p.configuration_files[self.url].stop)
+
+        self.p.parse()
+
+        self.document = None
+
+        self.p.read_configuration_files()
+
+        self.assertEqual('bar', self.p['foo'])
+
+    def test_add_configuration_url_cache_file(self):
+        '''Parameters().add_configuration_url(cache_file = …)'''
+
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(os.rmdir, cache_directory))
+
+        cache_file = os.path.join(cache_directory, 'crumbs.json')
+        self.addCleanup(functools.partial(os.remove, cache_file))
+
+        self.p.add_configuration_url(self.url, refresh = False, cache_file = cache_file)
+        self.p.configuration_files[self.url].stop()
+
+        self.document = None
+
+        p = Parameters()
+        p.add_parameter(options = [ '--foo' ])
+        p.add_configuration_url(self.url, refresh = False, cache_file = cache_file)
+        self.addCleanup(p.configuration_files[self.url].stop)
+
+        p.parse()
+
+        self.assertEqual('bar', p['foo'])
+
+    def test_add_configuration_url_refresh(self):
+        '''Parameters().add_configuration_url(refresh = True)'''
+
+        self.p.add_configuration_url(self.url, interval = 0.05)
+        self.addCleanup(self.p.configuration_files[self.url].stop)
+
+        self.p.parse()
+
+        self.document = { 'body': b'[default]\nfoo = baz\n', 'etag': '"2"' }
+
+        for _ in range(100):
+            if self.p['foo'] == 'baz':
+                break
+
+            time.sleep(0.05)
+
+        self.assertEqual('baz', self.p['foo'])
+
+    @unittest.skipUnless(hasattr(os, 'register_at_fork'), 'os.register_at_fork not available')
+    def test_add_configuration_url_forked(self):
+        '''Parameters().add_configuration_url()—connection not shared with fork'''
+
+        self.p.add_configuration_url(self.url, refresh = False)
+        self.addCleanup(self.p.configuration_files[self.url].stop)
+
+        self.p.parse()
+
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+
+            try:
+                os.write(write_fd, b'1' if self.p.configuration_files[self.url]._connection is None else b'0')
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+
+        with os.fdopen(read_fd, 'rb') as fh:
+            self.assertEqual(b'1', fh.read())
+
+        self.p.read_configuration_files()
+
+        self.assertEqual(1, len(set([ _[0] for _ in self.requests ])))
+
 
 class ParametersReadTest(unittest.TestCase):
     def setUp(self):
@@ -313,3 +653,1412 @@ class ParametersReadTest(unittest.TestCase):
         self.assertEqual('configuration_only', self.p['configuration_only'])
         self.assertEqual('argument_only', self.p['argument_only'])
         self.assertEqual('argument_multi', self.p['multi'])
+
+    def test_read_argument_explicit_default(self):
+        '''Parameters()[key]—argument set to the default'''
+
+        os.environ['CRUMBS_FOO'] = 'environment_foo'
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_FOO', None))
+
+        sys.argv.extend([ '--foo', 'default_foo' ])
+
+        self.addCleanup(functools.partial(sys.argv.remove, '--foo'))
+        self.addCleanup(functools.partial(sys.argv.remove, 'default_foo'))
+
+        self.p.add_parameter(options = [ '--foo' ], default = 'default_foo')
+        self.p.add_parameter(options = [ '--bar' ], default = 'default_bar')
+
+        self.p.parse()
+
+        self.assertEqual('default_foo', self.p['foo'])
+        self.assertEqual('default_bar', self.p['bar'])
+
+    def test_read_positional_omitted(self):
+        '''Parameters()[key]—optional positional omitted'''
+
+        os.environ['CRUMBS_COUNT'] = '9'
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_COUNT', None))
+
+        self.p.add_parameter(options = [ 'count' ], nargs = '?', default = '5', type = int)
+
+        self.p.parse()
+
+        self.assertEqual(9, self.p['count'])
+        self.assertEqual('environment', self.p.trace('count')['source'])
+
+    def test_read_configuration_explicit_default(self):
+        '''Parameters()[key]—configuration set to the default'''
+
+        os.environ['CRUMBS_MULTI'] = 'environment_multi'
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_MULTI', None))
+
+        self.populateConfiguration()
+        self.p.add_parameter(options = [ '--multi', ], default = 'configuration_multi')
+
+        self.p.parse()
+
+        self.assertEqual('configuration_multi', self.p['multi'])
+
+
+class DictionarySource(Source):
+    def __init__(self, values, **kwargs):
+        super(DictionarySource, self).__init__(**kwargs)
+
+        self.values = values
+        self.requests = []
+
+    def get_many(self, keys):
+        self.requests.append(list(keys))
+
+        return dict([ ( _, self.values[_] ) for _ in keys if _ in self.values ])
+
+
+class ParametersAddSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.original_argv0 = sys.argv[0]
+
+        def _():
+            sys.argv[0] = self.original_argv0
+        self.addCleanup(_)
+
+        sys.argv[0] = 'crumbs'
+
+        os.environ['CRUMBS_MULTI'] = 'environment_multi'
+        self.addCleanup(functools.partial(os.unsetenv, 'CRUMBS_MULTI'))
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--multi', ])
+
+    def test_add_source_low_precedence(self):
+        '''Parameters().add_source()—below environment'''
+
+        s = DictionarySource({ 'default.multi': 'source_multi' }, precedence = 50)
+        self.p.add_source(s)
+
+        self.p.parse()
+
+        self.assertEqual('environment_multi', self.p['multi'])
+        self.assertEqual([], s.requests)
+
+    def test_add_source_high_precedence(self):
+        '''Parameters().add_source()—above environment'''
+
+        s = DictionarySource({ 'default.multi': 'source_multi' }, precedence = 150)
+        self.p.add_source(s)
+
+        self.p.parse()
+
+        self.assertEqual([ 'argument', 'configuration', 'source', 'environment' ], [ _.name for _ in self.p.sources ])
+        self.assertEqual('source_multi', self.p['multi'])
+
+
+class SQLiteSourceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(shutil.rmtree, directory))
+
+        self.path = os.path.join(directory, 'crumbs.sqlite')
+
+        self.s = SQLiteSource(self.path, tenant = 'tenant', check_interval = 0)
+        self.addCleanup(self.s.close)
+
+        self.connection = sqlite3.connect(self.path)
+        self.addCleanup(self.connection.close)
+
+        with self.connection:
+            self.connection.executemany('INSERT INTO parameters VALUES (?, ?, ?, ?)', [
+                ( 'tenant', 'default', 'foo', 'tenant_foo' ),
+                ( 'tenant', 'db', 'bar', 'tenant_bar' ),
+                ( 'other', 'default', 'foo', 'other_foo' ),
+                ( 'tenant', 'service.cache', 'timeout', '5' ),
+            ])
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--foo' ])
+        self.p.add_parameter(group = 'db', options = [ '--bar' ])
+        self.p.add_parameter(group = 'db', options = [ '--baz' ])
+        self.p.add_parameter(group = 'service.cache', options = [ '--timeout' ], type = int)
+        self.p.add_source(self.s)
+
+        self.p.parse()
+
+    def test_read(self):
+        '''Parameters()[key]—sqlite'''
+
+        self.assertEqual('tenant_foo', self.p['foo'])
+        self.assertEqual('tenant_bar', self.p['db.bar'])
+        self.assertIsNone(self.p['db.baz'])
+
+    def test_read_nested_group(self):
+        '''Parameters()[key]—sqlite nested group'''
+
+        self.assertEqual(5, self.p['service.cache.timeout'])
+
+    def test_refresh(self):
+        '''SQLiteSource().refresh()—only changed values invalidated'''
+
+        self.p['foo']
+        self.p['db.bar']
+
+        with self.connection:
+            self.connection.execute('UPDATE parameters SET value = ? WHERE tenant = ? AND section = ? AND option = ?', ( 'changed', 'tenant', 'db', 'bar' ))
+
+        self.assertEqual(set([ 'db.bar' ]), self.s.refresh())
+        self.assertEqual(set(), self.s.refresh())
+
+    def test_read_after_change(self):
+        '''Parameters()[key]—sqlite changed'''
+
+        self.assertEqual('tenant_bar', self.p['db.bar'])
+
+        with self.connection:
+            self.connection.execute('UPDATE parameters SET value = ? WHERE tenant = ? AND section = ? AND option = ?', ( 'changed', 'tenant', 'db', 'bar' ))
+
+        self.assertEqual('changed', self.p['db.bar'])
+
+
+class SecretsSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(shutil.rmtree, self.directory))
+
+        with open(os.path.join(self.directory, 'password'), 'w') as fh:
+            fh.write('secret\n')
+
+        with open(os.path.join(self.directory, 'db.password'), 'w') as fh:
+            fh.write('db_secret')
+
+        self.s = SecretsSource(self.directory)
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--password' ])
+        self.p.add_parameter(options = [ '--token' ])
+        self.p.add_parameter(group = 'db', options = [ '--password' ])
+        self.p.add_source(self.s)
+
+        self.p.parse()
+
+    def test_read(self):
+        '''Parameters()[key]—secrets'''
+
+        self.assertEqual('secret', self.p['password'])
+        self.assertEqual('db_secret', self.p['db.password'])
+        self.assertIsNone(self.p['token'])
+
+    def test_read_lazily(self):
+        '''Parameters()[key]—secrets read lazily'''
+
+        self.p['password']
+
+        self.assertEqual([ 'default.password' ], list(self.s._secrets.keys()))
+
+    def test_read_after_change(self):
+        '''Parameters()[key]—secrets changed'''
+
+        self.assertEqual('secret', self.p['password'])
+
+        with open(os.path.join(self.directory, 'password'), 'w') as fh:
+            fh.write('changed secret')
+
+        self.assertEqual('changed secret', self.p['password'])
+
+    @unittest.skipUnless(_pyinotify_loaded, 'inotify module not available')
+    def test_read_after_change_with_inotify(self):
+        '''Parameters(inotify = True).snapshot()—secrets changed'''
+
+        self.p = Parameters(inotify = True)
+        self.p.add_parameter(options = [ '--password' ])
+        self.p.add_source(SecretsSource(self.directory))
+        self.p.parse()
+
+        group = self.p.group('default')
+
+        self.assertEqual('secret', self.p.snapshot()['default.password'])
+        self.assertEqual('secret', group['password'])
+
+        with open(os.path.join(self.directory, 'password'), 'w') as fh:
+            fh.write('changed secret')
+
+        self.assertEqual('changed secret', self.p.snapshot()['default.password'])
+        self.assertEqual({ 'default.password': 'changed secret' }, self.p.find('password'))
+        self.assertEqual('changed secret', group['password'])
+        self.assertEqual('changed secret', self.p.bind('default').password)
+
+
+class ParametersPublishTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(shutil.rmtree, directory))
+
+        self.path = os.path.join(directory, 'crumbs.snapshot')
+        self.file_name = os.path.join(directory, 'crumbs.ini')
+
+        with open(self.file_name, 'w') as fh:
+            fh.write(
+                '[default]\n'
+                'foo = bar\n'
+            )
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--foo' ])
+        self.p.add_parameter(options = [ '--number' ], type = int, default = 1)
+        self.p.add_configuration_file(self.file_name)
+        self.p.parse()
+
+    def test_snapshot(self):
+        '''Parameters().snapshot()'''
+
+        self.assertEqual({ 'default.foo': 'bar', 'default.number': 1 }, self.p.snapshot())
+
+    def test_publish(self):
+        '''Parameters().publish()'''
+
+        self.p.publish(self.path)
+
+        s = SharedSnapshot(self.path)
+        self.addCleanup(s.close)
+
+        self.assertEqual('bar', s['foo'])
+        self.assertEqual(1, s['default.number'])
+        self.assertEqual(set([ 'default.foo', 'default.number' ]), set(s.keys()))
+
+        with self.assertRaises(KeyError):
+            s['missing']
+
+    def test_publish_mode(self):
+        '''Parameters().publish(mode = 0o644)'''
+
+        self.p.publish(self.path)
+
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+        self.p.publish(self.path + '.shared', mode = 0o644)
+
+        self.assertEqual(0o644, os.stat(self.path + '.shared').st_mode & 0o777)
+
+    def test_publish_after_read(self):
+        '''Parameters().publish()—new generation after re-read'''
+
+        self.p.publish(self.path)
+
+        s = SharedSnapshot(self.path)
+        self.addCleanup(s.close)
+
+        self.assertEqual('bar', s['foo'])
+
+        generation = s.generation
+
+        with open(self.file_name, 'w') as fh:
+            fh.write(
+                '[default]\n'
+                'foo = baz\n'
+            )
+
+        self.p.read_configuration_files()
+
+        self.assertEqual('baz', s['foo'])
+        self.assertEqual(generation + 2, s.generation)
+
+    def test_publish_grow(self):
+        '''Parameters().publish(capacity = 1)—file replaced'''
+
+        self.p.publish(self.path, capacity = 1)
+
+        s = SharedSnapshot(self.path)
+        self.addCleanup(s.close)
+
+        self.assertEqual('bar', s['foo'])
+
+        self.p.add_parameter(options = [ '--large' ], default = 'x' * 4096)
+        self.p.publish(self.path)
+
+        self.assertEqual('x' * 4096, s['large'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'fork not available')
+    def test_publish_forked(self):
+        '''Parameters().publish()—read in forked worker'''
+
+        self.p.publish(self.path)
+
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+
+            try:
+                os.write(write_fd, SharedSnapshot(self.path)['foo'].encode('utf-8'))
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+
+        with os.fdopen(read_fd, 'rb') as fh:
+            self.assertEqual(b'bar', fh.read())
+
+
+class ParametersExportTest(unittest.TestCase):
+    def setUp(self):
+        self.original_argv0 = sys.argv[0]
+
+        def _():
+            sys.argv[0] = self.original_argv0
+        self.addCleanup(_)
+
+        sys.argv[0] = 'crumbs'
+
+        os.environ['CRUMBS_FOO'] = 'environment_foo'
+        self.addCleanup(functools.partial(os.unsetenv, 'CRUMBS_FOO'))
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--foo' ])
+        self.p.add_parameter(group = 'bar', options = [ '--baz' ], only = [ 'environment' ], type = lambda _: _.split(','), default = 'a,b')
+        self.p.parse()
+
+    def _assert_exported(self, p):
+        del os.environ['CRUMBS_FOO']
+
+        self.assertTrue(p.parsed)
+        self.assertEqual('environment_foo', p['foo'])
+        self.assertEqual([ 'a', 'b' ], p['bar.baz'])
+        self.assertEqual(set([ 'default', 'bar' ]), p.groups)
+        self.assertEqual(set([ 'baz' ]), set(p.grouped_parameters['bar'].keys()))
+
+    def test_pickle(self):
+        '''pickle.loads(pickle.dumps(Parameters()))'''
+
+        self._assert_exported(pickle.loads(pickle.dumps(self.p)))
+
+    def test_export(self):
+        '''Parameters.from_export(Parameters().export())'''
+
+        self._assert_exported(Parameters.from_export(self.p.export()))
+
+    def test_export_environment(self):
+        '''Parameters.from_export(environment = …)'''
+
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_EXPORT', None))
+
+        self.p.export(environment = 'CRUMBS_EXPORT')
+
+        self._assert_exported(Parameters.from_export(environment = 'CRUMBS_EXPORT'))
+
+    def test_export_fd(self):
+        '''Parameters.from_export(fd = …)'''
+
+        self._assert_exported(Parameters.from_export(fd = self.p.export(fd = True)))
+
+
+class GroupedParametersTest(BaseArgvTest):
+    argv = [ 'crumbs', '--db-host', 'argument_host' ]
+
+    def setUp(self):
+        super(GroupedParametersTest, self).setUp()
+
+        tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        tmp_fh.write(
+            '[db]\n'
+            'pool_size = 10\n'
+        )
+        tmp_fh.flush()
+
+        self.addCleanup(tmp_fh.close)
+
+        self.file_name = tmp_fh.name
+
+        self.p = Parameters()
+        self.p.add_parameter(group = 'db', options = [ '--host' ])
+        self.p.add_parameter(group = 'db', options = [ '--pool-size' ], type = int, default = 5)
+        self.p.add_configuration_file(self.file_name)
+
+
+class ParametersBindTest(GroupedParametersTest):
+    def test_bind(self):
+        '''Parameters().bind()'''
+
+        self.p.parse()
+
+        db = self.p.bind('db')
+
+        self.assertEqual('argument_host', db.host)
+        self.assertEqual(10, db.pool_size)
+
+        with self.assertRaises(AttributeError):
+            db.port = 5432
+
+    def test_bind_before_parse(self):
+        '''Parameters().bind()—before parse'''
+
+        db = self.p.bind('db')
+
+        self.p.parse()
+
+        self.assertEqual('argument_host', db.host)
+
+    def test_bind_refreshed(self):
+        '''Parameters().bind()—refreshed on re-read'''
+
+        self.p.parse()
+
+        db = self.p.bind('db')
+
+        with open(self.file_name, 'w') as fh:
+            fh.write('[db]\npool_size = 20\n')
+
+        self.p.read_configuration_files()
+
+        self.assertEqual(20, db.pool_size)
+
+    def test_bind_unknown_group(self):
+        '''Parameters().bind()—unknown group'''
+
+        with self.assertRaises(KeyError):
+            self.p.bind('cache')
+
+    def test_bind_group_parameter(self):
+        '''Parameters().bind()—parameter named group'''
+
+        self.p.add_parameter(group = 'acl', options = [ '--group' ], default = 'wheel')
+        self.p.parse()
+
+        self.assertEqual('wheel', self.p.bind('acl').group)
+
+    def test_bind_invalid_name(self):
+        '''Parameters().bind()—parameter name not an identifier'''
+
+        self.p.add_parameter(group = 'auth', options = [ '--2fa' ])
+        self.p.parse()
+
+        with self.assertRaises(ValueError):
+            self.p.bind('auth')
+
+
+class ParametersGroupTest(GroupedParametersTest):
+    def test_group(self):
+        '''Parameters().group()'''
+
+        self.p.parse()
+
+        db = self.p.group('db')
+
+        self.assertEqual(set([ 'host', 'pool_size' ]), set(db.keys()))
+        self.assertEqual(2, len(db))
+        self.assertIn('pool-size', db)
+
+        self.assertEqual({ 'host': 'argument_host', 'pool_size': 10 }, dict(db))
+        self.assertEqual(10, db['pool-size'])
+
+    def test_group_resolved_together(self):
+        '''Parameters().group()—resolved together'''
+
+        self.p.parse()
+
+        source = DictionarySource({}, precedence = 400)
+        self.p.add_source(source)
+
+        db = self.p.group('db')
+
+        db['host']
+        db['pool_size']
+        list(db.items())
+
+        self.assertEqual(1, len(source.requests))
+
+    def test_group_refreshed(self):
+        '''Parameters().group()—refreshed on re-read'''
+
+        self.p.parse()
+
+        db = self.p.group('db')
+
+        self.assertEqual(10, db['pool_size'])
+
+        with open(self.file_name, 'w') as fh:
+            fh.write('[db]\npool_size = 20\n')
+
+        self.p.read_configuration_files()
+
+        self.assertEqual(20, db['pool_size'])
+
+    def test_group_parameter_added(self):
+        '''Parameters().group()—parameter added after resolving'''
+
+        db = self.p.group('db')
+
+        self.assertEqual(10, db['pool_size'])
+
+        self.p.add_parameter(group = 'db', options = [ '--port' ], type = int, default = 5432)
+
+        self.assertIn('port', db)
+        self.assertEqual(5432, db['port'])
+
+    def test_group_unknown_group(self):
+        '''Parameters().group()—unknown group'''
+
+        with self.assertRaises(KeyError):
+            self.p.group('cache')
+
+
+class ParametersNestedGroupsTest(BaseArgvTest):
+    argv = [ 'crumbs', '--service-cache-redis-timeout', '5' ]
+
+    def setUp(self):
+        super(ParametersNestedGroupsTest, self).setUp()
+
+        tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        tmp_fh.write(
+            '[service.cache.memcached]\n'
+            'timeout = 7\n'
+        )
+        tmp_fh.flush()
+
+        self.addCleanup(tmp_fh.close)
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--host' ], default = 'localhost')
+        self.p.add_parameter(group = 'service', options = [ '--name' ], default = 'crumbs')
+        self.p.add_parameter(group = 'service.cache', options = [ '--size' ], type = int, default = 10)
+        self.p.add_parameter(group = 'service.cache.redis', options = [ '--timeout' ], type = int)
+        self.p.add_parameter(group = 'service.cache.memcached', options = [ '--timeout' ], type = int)
+        self.p.add_configuration_file(tmp_fh.name)
+        self.p.parse()
+
+    def test_nested_group(self):
+        '''Parameters().add_parameter(group = 'a.b.c')'''
+
+        self.assertEqual(5, self.p['service.cache.redis.timeout'])
+        self.assertEqual(7, self.p['service.cache.memcached.timeout'])
+        self.assertEqual({ 'timeout': 5 }, dict(self.p.group('service.cache.redis')))
+
+    def test_find_subtree(self):
+        '''Parameters().find('a.b.*')'''
+
+        self.assertEqual({
+            'service.cache.size': 10,
+            'service.cache.redis.timeout': 5,
+            'service.cache.memcached.timeout': 7,
+        }, self.p.find('service.cache.*'))
+
+    def test_find_segment(self):
+        '''Parameters().find('a.*.c')'''
+
+        self.assertEqual({
+            'service.cache.redis.timeout': 5,
+            'service.cache.memcached.timeout': 7,
+        }, self.p.find('service.cache.*.timeout'))
+
+        self.assertEqual({}, self.p.find('service.*.timeout'))
+
+    def test_find_exact(self):
+        '''Parameters().find('a.b')'''
+
+        self.assertEqual({ 'service.name': 'crumbs' }, self.p.find('service.name'))
+        self.assertEqual({}, self.p.find('service.cache'))
+
+    def test_find_default(self):
+        '''Parameters().find('a')—default group'''
+
+        self.assertEqual({ 'default.host': 'localhost' }, self.p.find('host'))
+        self.assertEqual({ 'default.host': 'localhost' }, self.p.find('default.host'))
+
+    def test_find_derived(self):
+        '''Parameters().find()—derived parameters'''
+
+        self.p.add_derived_parameter('service.cache.bytes', lambda _: _ * 1024, depends_on = [ 'service.cache.size' ])
+        self.p.add_derived_parameter('url', lambda _: 'x://' + _, depends_on = [ 'host' ])
+
+        self.assertEqual({
+            'service.cache.size': 10,
+            'service.cache.bytes': 10240,
+            'service.cache.redis.timeout': 5,
+            'service.cache.memcached.timeout': 7,
+        }, self.p.find('service.cache.*'))
+        self.assertEqual({ 'default.url': 'x://localhost' }, self.p.find('url'))
+
+
+class ParametersIncrementalTest(BaseArgvTest):
+    argv = [ 'crumbs', '--plugin', 'cache', '--cache-size', '5', '--verbose' ]
+
+    def setUp(self):
+        super(ParametersIncrementalTest, self).setUp()
+
+        self.p = Parameters(incremental = True)
+        self.p.add_parameter(options = [ '--plugin' ])
+
+    def test_phases(self):
+        '''Parameters(incremental = True).parse()—phases'''
+
+        self.p.parse(only_known = True)
+
+        self.assertEqual('cache', self.p['plugin'])
+        self.assertEqual([ '--cache-size', '5', '--verbose' ], self.p._remaining_arguments)
+
+        self.p.add_parameter(group = 'cache', options = [ '--size' ], type = int)
+        self.p.parse(only_known = True)
+
+        self.assertEqual(5, self.p['cache.size'])
+        self.assertEqual([ '--verbose' ], self.p._remaining_arguments)
+
+        self.p.add_parameter(options = [ '--verbose' ], action = 'store_true')
+        self.p.parse()
+
+        self.assertTrue(self.p['verbose'])
+        self.assertEqual([], self.p._remaining_arguments)
+
+    def test_unrecognized(self):
+        '''Parameters(incremental = True).parse()—unrecognized arguments'''
+
+        self.p.parse(only_known = True)
+
+        with self.assertRaises(SystemExit):
+            self.p.parse()
+
+    def test_help(self):
+        '''Parameters(incremental = True).parse()—help'''
+
+        sys.argv.append('--help')
+
+        self.p.parse(only_known = True)
+
+        self.assertEqual('cache', self.p['plugin'])
+
+        with self.assertRaises(SystemExit):
+            self.p.parse()
+
+
+class ParametersSubcommandTest(BaseArgvTest):
+    argv = [ 'crumbs', '--verbose', 'serve', '--serve-port', '80' ]
+
+    def setUp(self):
+        super(ParametersSubcommandTest, self).setUp()
+
+        self.called = []
+
+        def serve(parameters):
+            self.called.append('serve')
+            parameters.add_parameter(group = 'serve', options = [ '--port' ], type = int)
+
+        def build(parameters):
+            self.called.append('build')
+            parameters.add_parameter(group = 'build', options = [ '--target' ])
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--verbose' ], action = 'store_true')
+        self.p.add_subcommand('serve', serve, help = 'serve requests')
+        self.p.add_subcommand('build', build, help = 'build targets')
+
+    def test_selected(self):
+        '''Parameters().add_subcommand()'''
+
+        self.p.parse()
+
+        self.assertEqual([ 'serve' ], self.called)
+        self.assertEqual('serve', self.p['subcommand'])
+        self.assertEqual(80, self.p['serve.port'])
+        self.assertTrue(self.p['verbose'])
+        self.assertNotIn('build.target', self.p.parameters)
+
+    def test_selected_once(self):
+        '''Parameters().add_subcommand()—callback called once'''
+
+        self.p.parse(only_known = True)
+        self.p.parse()
+
+        self.assertEqual([ 'serve' ], self.called)
+
+    def test_help(self):
+        '''Parameters().add_subcommand()—with --help'''
+
+        sys.argv.append('--help')
+
+        with self.assertRaises(SystemExit):
+            self.p.parse()
+
+        self.assertEqual([ 'serve' ], self.called)
+
+    def test_none(self):
+        '''Parameters().add_subcommand()—no subcommand'''
+
+        sys.argv = [ 'crumbs' ]
+
+        self.p.parse()
+
+        self.assertEqual([], self.called)
+        self.assertIsNone(self.p['subcommand'])
+
+
+class ParametersCompletionIndexTest(BaseArgvTest):
+    argv = [ 'crumbs' ]
+
+    def setUp(self):
+        super(ParametersCompletionIndexTest, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(functools.partial(shutil.rmtree, self.directory))
+
+        self.index = os.path.join(self.directory, 'index.json')
+
+        os.environ['CRUMBS_COMPLETION_INDEX'] = self.index
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_COMPLETION_INDEX'))
+
+        self.p = Parameters()
+        self.p.add_parameter(group = 'db', options = [ '--driver' ], choices = [ 'mysql', 'sqlite' ])
+        self.p.add_subcommand('serve', lambda _: _.add_parameter(group = 'serve', options = [ '--port' ], type = int), help = 'serve requests')
+
+    def test_write_index(self):
+        '''Parameters().parse()—CRUMBS_COMPLETION_INDEX'''
+
+        with self.assertRaises(SystemExit):
+            self.p.parse()
+
+        index = load_index(self.index)
+
+        self.assertEqual([ '--db-driver' ], complete(index, [ '--d' ]))
+        self.assertEqual([ 'mysql', 'sqlite' ], complete(index, [ '--db-driver', '' ]))
+        self.assertEqual([ 'serve' ], complete(index, [ '' ]))
+        self.assertEqual([ '--serve-port' ], complete(index, [ 'serve', '--s' ]))
+
+    def test_parse_only_known(self):
+        '''Parameters().parse(only_known = True)—CRUMBS_COMPLETION_INDEX'''
+
+        self.p.parse(only_known = True)
+
+        self.assertFalse(os.path.exists(self.index))
+
+    def test_main(self):
+        '''crumbs.completion.main()'''
+
+        with self.assertRaises(SystemExit):
+            self.p.parse()
+
+        output = tempfile.TemporaryFile(mode = 'w+')
+        self.addCleanup(output.close)
+
+        original_stdout, sys.stdout = sys.stdout, output
+
+        try:
+            status = main([ self.index ], { 'COMP_LINE': 'crumbs serve --serve-', 'COMP_POINT': '21' })
+        finally:
+            sys.stdout = original_stdout
+
+        output.seek(0)
+
+        self.assertEqual(0, status)
+        self.assertEqual('--serve-port\n', output.read())
+
+
+class ParametersInterpolationTest(BaseArgvTest):
+    argv = [ 'crumbs', '--paths-base', '/opt' ]
+
+    def setUp(self):
+        super(ParametersInterpolationTest, self).setUp()
+
+        self.tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        self.addCleanup(self.tmp_fh.close)
+
+        self.write(
+            '[paths]\n'
+            'base = /srv\n'
+            'log = ${paths.base}/log\n'
+            'data = ${paths.data_base}/data\n'
+            'data_base = /var\n'
+            '\n'
+            '[service]\n'
+            'port = ${service.base_port}1\n'
+            'base_port = 808\n'
+            'name = ${HOME}\n'
+        )
+
+        self.p = Parameters()
+        self.p.add_parameter(group = 'paths', options = [ '--base' ])
+        self.p.add_parameter(group = 'paths', options = [ '--log' ])
+        self.p.add_parameter(group = 'paths', options = [ '--data' ])
+        self.p.add_parameter(group = 'paths', options = [ '--data-base' ])
+        self.p.add_parameter(group = 'paths', options = [ '--cache' ], default = '${paths.log}/cache')
+        self.p.add_parameter(group = 'service', options = [ '--port' ], type = int)
+        self.p.add_parameter(group = 'service', options = [ '--base-port' ])
+        self.p.add_parameter(group = 'service', options = [ '--name' ])
+        self.p.add_configuration_file(self.tmp_fh.name)
+        self.p.parse()
+
+    def write(self, contents):
+        self.tmp_fh.seek(0)
+        self.tmp_fh.truncate()
+        self.tmp_fh.write(contents)
+        self.tmp_fh.flush()
+
+    def test_interpolation(self):
+        '''Parameters()['a']—with ${group.option} references'''
+
+        self.assertEqual('/opt/log', self.p['paths.log'])
+        self.assertEqual('/opt/log/cache', self.p['paths.cache'])
+        self.assertEqual(8081, self.p['service.port'])
+        self.assertEqual('${HOME}', self.p['service.name'])
+
+    def test_reload(self):
+        '''Parameters().read_configuration_files()—interpolated'''
+
+        self.assertEqual('/var/data', self.p['paths.data'])
+        self.assertEqual('/opt/log', self.p['paths.log'])
+
+        self.write(
+            '[paths]\n'
+            'base = /srv\n'
+            'log = ${paths.base}/log\n'
+            'data = ${paths.data_base}/data\n'
+            'data_base = /tmp\n'
+        )
+
+        self.p.read_configuration_files()
+
+        self.assertIn('paths.log', self.p._interpolations)
+        self.assertNotIn('paths.data', self.p._interpolations)
+
+        self.assertEqual('/tmp/data', self.p['paths.data'])
+        self.assertEqual('/opt/log', self.p['paths.log'])
+
+    def test_circular(self):
+        '''Parameters()['a']—circular references'''
+
+        self.write(
+            '[paths]\n'
+            'log = ${paths.data}/log\n'
+            'data = ${paths.log}/data\n'
+        )
+
+        self.p.read_configuration_files()
+
+        with self.assertRaises(ValidationError) as context:
+            self.p['paths.log']
+
+        self.assertIn('paths.log -> paths.data -> paths.log', str(context.exception))
+
+
+class ParametersDerivedTest(BaseArgvTest):
+    argv = [ 'crumbs' ]
+
+    def setUp(self):
+        super(ParametersDerivedTest, self).setUp()
+
+        self.tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        self.addCleanup(self.tmp_fh.close)
+
+        self.write(5432, 1500)
+
+        self.calls = []
+
+        def dsn(host, port):
+            self.calls.append('dsn')
+            return '{}:{}'.format(host, port)
+
+        self.p = Parameters()
+        self.p.add_parameter(group = 'db', options = [ '--host' ], default = 'localhost')
+        self.p.add_parameter(group = 'db', options = [ '--port' ], type = int)
+        self.p.add_parameter(group = 'db', options = [ '--timeout-ms' ], type = int)
+        self.p.add_derived_parameter('db.dsn', dsn, depends_on = [ 'db.host', 'db.port' ])
+        self.p.add_derived_parameter('db.timeout', lambda _: _ / 1000.0, depends_on = [ 'db.timeout_ms' ])
+        self.p.add_derived_parameter('url', lambda _: 'db://' + _, depends_on = [ 'db.dsn' ])
+        self.p.add_configuration_file(self.tmp_fh.name)
+        self.p.parse()
+
+    def write(self, port, timeout_ms):
+        self.tmp_fh.seek(0)
+        self.tmp_fh.truncate()
+        self.tmp_fh.write(
+            '[db]\n'
+            'port = {}\n'
+            'timeout_ms = {}\n'.format(port, timeout_ms)
+        )
+        self.tmp_fh.flush()
+
+    def test_derived(self):
+        '''Parameters().add_derived_parameter()'''
+
+        self.assertEqual([], self.calls)
+
+        self.assertEqual('localhost:5432', self.p['db.dsn'])
+        self.assertEqual('localhost:5432', self.p['db.dsn'])
+        self.assertEqual(1.5, self.p['db.timeout'])
+        self.assertEqual('db://localhost:5432', self.p['url'])
+
+        self.assertEqual([ 'dsn' ], self.calls)
+
+    def test_derived_reload(self):
+        '''Parameters().add_derived_parameter()—re-read'''
+
+        self.p['url']
+
+        self.write(5432, 2500)
+        self.p.read_configuration_files()
+
+        self.assertEqual('db://localhost:5432', self.p['url'])
+        self.assertEqual(2.5, self.p['db.timeout'])
+        self.assertEqual([ 'dsn' ], self.calls)
+
+        self.write(6543, 2500)
+        self.p.read_configuration_files()
+
+        self.assertEqual('db://localhost:6543', self.p['url'])
+        self.assertEqual([ 'dsn', 'dsn' ], self.calls)
+
+    def test_derived_refresh(self):
+        '''Parameters().refresh()'''
+
+        self.p['db.dsn']
+
+        os.environ['CRUMBS_DB_HOST'] = 'environment_host'
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_DB_HOST'))
+
+        self.assertEqual('localhost:5432', self.p['db.dsn'])
+
+        self.p.refresh([ 'db.host' ])
+
+        self.assertEqual('environment_host:5432', self.p['db.dsn'])
+
+    @unittest.skipUnless(_contextvars_loaded, 'contextvars module not available')
+    def test_derived_override(self):
+        '''Parameters().add_derived_parameter()—with override()'''
+
+        with self.p.override({ 'db.port': 1234 }):
+            self.assertEqual('db://localhost:1234', self.p['url'])
+
+        self.assertEqual('db://localhost:5432', self.p['url'])
+
+    def test_derived_overlay(self):
+        '''Parameters().overlay()—derived'''
+
+        overlay = self.p.overlay({ 'db.port': '1234' })
+
+        self.assertEqual(1234, overlay['db.port'])
+        self.assertEqual('db://localhost:1234', overlay['url'])
+        self.assertEqual('localhost:1234', overlay.snapshot()['db.dsn'])
+        self.assertEqual('db://localhost:5432', self.p['url'])
+
+        overlay = overlay.overlay({ 'db.host': 'overlay_host' })
+
+        self.assertEqual('db://overlay_host:1234', overlay['url'])
+
+    def test_derived_overlay_invalid(self):
+        '''Parameters().overlay()—unconvertible value'''
+
+        with self.assertRaises(ValidationError):
+            self.p.overlay({ 'db.port': 'port' })
+
+    def test_derived_overlay_reference(self):
+        '''Parameters().overlay()—with ${a} references'''
+
+        p = Parameters(strict = True)
+        p.add_parameter(options = [ '--host' ], default = 'localhost')
+        p.add_parameter(options = [ '--url' ], default = 'x://${host}')
+        p.parse()
+
+        self.assertEqual('x://localhost', p['url'])
+        self.assertEqual('x://overlay_host', p.overlay({ 'host': 'overlay_host' })['url'])
+        self.assertEqual('x://localhost', p['url'])
+
+    @unittest.skipUnless(_contextvars_loaded, 'contextvars module not available')
+    def test_derived_override_reference(self):
+        '''Parameters().override()—with ${a} references'''
+
+        p = Parameters()
+        p.add_parameter(options = [ '--host' ], default = 'localhost')
+        p.add_parameter(options = [ '--url' ], default = 'x://${host}')
+        p.parse()
+
+        self.assertEqual('x://localhost', p['url'])
+
+        with p.override({ 'host': 'override_host' }):
+            self.assertEqual('x://override_host', p['url'])
+            self.assertEqual('x://override_host', p.group('default')['url'])
+
+        self.assertEqual('x://localhost', p['url'])
+
+    def test_derived_snapshot(self):
+        '''Parameters().snapshot()—derived'''
+
+        snapshot = self.p.snapshot()
+
+        self.assertEqual('localhost:5432', snapshot['db.dsn'])
+        self.assertEqual('db://localhost:5432', snapshot['default.url'])
+        self.assertEqual('derived', self.p.trace('url')['source'])
+
+    def test_derived_export(self):
+        '''Parameters.from_export()—derived'''
+
+        p = Parameters.from_export(self.p.export())
+
+        self.assertEqual('db://localhost:5432', p['url'])
+
+    def test_derived_reference(self):
+        '''Parameters()['a']—with ${derived} references'''
+
+        p = Parameters()
+        p.add_parameter(options = [ '--host' ], default = 'localhost')
+        p.add_parameter(options = [ '--url' ], default = 'x://${dsn}')
+        p.add_derived_parameter('dsn', lambda _: _ + ':5432', depends_on = [ 'host' ])
+        p.parse()
+
+        self.assertEqual('x://localhost:5432', p['url'])
+        self.assertIn('default.url', p._dependents['default.dsn'])
+
+    def test_derived_reference_circular(self):
+        '''Parameters()['a']—with circular ${derived} references'''
+
+        p = Parameters()
+        p.add_parameter(options = [ '--url' ], default = 'x://${dsn}')
+        p.add_derived_parameter('dsn', lambda _: _, depends_on = [ 'url' ])
+        p.parse()
+
+        with self.assertRaises(ValidationError) as context:
+            p['url']
+
+        self.assertIn('default.dsn -> default.url -> default.dsn', str(context.exception))
+
+    def test_derived_errors(self):
+        '''Parameters().add_derived_parameter()—errors'''
+
+        with self.assertRaises(ValueError):
+            self.p.add_derived_parameter('db.host', str, depends_on = [ 'db.port' ])
+
+        with self.assertRaises(KeyError):
+            self.p.add_derived_parameter('db.user', str, depends_on = [ 'db.quux' ])
+
+
+class ParametersStrictTest(BaseArgvTest):
+    argv = [ 'crumbs' ]
+
+    def setUp(self):
+        super(ParametersStrictTest, self).setUp()
+
+        tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        tmp_fh.write(
+            '[db]\n'
+            'pool_size = 10\n'
+            'mode = rw\n'
+        )
+        tmp_fh.flush()
+
+        self.addCleanup(tmp_fh.close)
+
+        self.file_name = tmp_fh.name
+
+        self.p = Parameters(strict = True)
+        self.p.add_parameter(group = 'db', options = [ '--pool-size' ], type = int, default = 5)
+        self.p.add_parameter(group = 'db', options = [ '--mode' ], choices = [ 'ro', 'rw' ], default = 'ro')
+        self.p.add_configuration_file(self.file_name)
+
+    def _write(self, pool_size, mode):
+        with open(self.file_name, 'w') as fh:
+            fh.write('[db]\npool_size = {}\nmode = {}\n'.format(pool_size, mode))
+
+    def test_strict(self):
+        '''Parameters(strict = True)'''
+
+        self.p.parse()
+
+        self.assertEqual(10, self.p['db.pool_size'])
+        self.assertEqual('rw', self.p['db.mode'])
+
+    def test_strict_invalid(self):
+        '''Parameters(strict = True).parse()—invalid values'''
+
+        self._write('ten', 'rx')
+
+        self.p.read_configuration_files()
+
+        with self.assertRaises(ValidationError) as context:
+            self.p.parse()
+
+        self.assertEqual(set([ 'db.pool_size', 'db.mode' ]), set(context.exception.errors.keys()))
+
+    def test_strict_invalid_reread(self):
+        '''Parameters(strict = True).read_configuration_files()—rejected'''
+
+        self.p.parse()
+
+        self._write(20, 'rx')
+
+        with self.assertRaises(ValidationError):
+            self.p.read_configuration_files()
+
+        self.assertEqual(10, self.p['db.pool_size'])
+        self.assertEqual('rw', self.p['db.mode'])
+
+        self._write(20, 'ro')
+
+        self.p.read_configuration_files()
+
+        self.assertEqual(20, self.p['db.pool_size'])
+        self.assertEqual('ro', self.p['db.mode'])
+
+    def test_strict_reread_interpolated(self):
+        '''Parameters(strict = True).read_configuration_files()—interpolated dependent'''
+
+        with open(self.file_name, 'w') as fh:
+            fh.write('[db]\nroot = /one\nlog = ${db.root}/log\n')
+
+        self.p.add_parameter(group = 'db', options = [ '--root' ])
+        self.p.read_configuration_files()
+        self.p.parse()
+
+        # Not stored by parse; thus, its interpolated value is remembered.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.p.add_parameter(group = 'db', options = [ '--log' ])
+
+        self.assertEqual('/one/log', self.p['db.log'])
+
+        bound = self.p.bind('db')
+
+        with open(self.file_name, 'w') as fh:
+            fh.write('[db]\nroot = /two\nlog = ${db.root}/log\n')
+
+        self.p.read_configuration_files()
+
+        self.assertEqual('/two', self.p['db.root'])
+        self.assertEqual('/two/log', self.p['db.log'])
+        self.assertEqual('/two/log', bound.log)
+
+
+class ParametersStatsTest(BaseArgvTest):
+    argv = [ 'crumbs', '--foo', 'argument_foo' ]
+
+    def setUp(self):
+        super(ParametersStatsTest, self).setUp()
+
+        tmp_fh = tempfile.NamedTemporaryFile(mode = 'w')
+        tmp_fh.write(
+            '[default]\n'
+            'bar = configuration_bar\n'
+        )
+        tmp_fh.flush()
+
+        self.addCleanup(tmp_fh.close)
+
+        self.p = Parameters(instrument = True)
+        self.p.add_parameter(options = [ '--foo' ])
+        self.p.add_parameter(options = [ '--bar' ])
+        self.p.add_parameter(options = [ '--baz' ], default = 'default_baz')
+        self.p.add_configuration_file(tmp_fh.name)
+        self.p.parse()
+
+    def test_stats(self):
+        '''Parameters(instrument = True).stats()'''
+
+        self.p['foo']
+        self.p['foo']
+        self.p['bar']
+        self.p['baz']
+
+        self.p.read_configuration_files()
+
+        stats = self.p.stats()
+
+        self.assertEqual({ 'default.foo': 2, 'default.bar': 1, 'default.baz': 1 }, stats['lookups'])
+        self.assertEqual({
+            'default.foo': { 'argument': 2 },
+            'default.bar': { 'configuration': 1 },
+            'default.baz': { 'default': 1 },
+        }, stats['sources'])
+
+        self.assertEqual(4, stats['latency']['count'])
+        self.assertEqual(4, sum([ _[1] for _ in stats['latency']['buckets'] ]))
+        self.assertEqual(1, stats['reloads']['count'])
+
+    def test_stats_lookups_only(self):
+        '''Parameters(instrument = True).stats()—only lookups recorded'''
+
+        sys.argv = [ 'crumbs' ]
+
+        p = Parameters(instrument = True)
+        p.add_parameter(options = [ '--base' ], default = '/srv')
+        p.add_parameter(options = [ '--log' ], default = '${base}/log')
+        p.parse()
+
+        p.snapshot()
+        p.bind('default')
+
+        self.assertEqual({}, p.stats()['sources'])
+
+        self.assertEqual('/srv/log', p['log'])
+
+        self.assertEqual({ 'default.log': { 'default': 1 } }, p.stats()['sources'])
+
+    def test_stats_reset(self):
+        '''Parameters(instrument = True).stats(reset = True)'''
+
+        self.p['foo']
+
+        self.assertEqual(1, self.p.stats(reset = True)['latency']['count'])
+        self.assertEqual(0, self.p.stats()['latency']['count'])
+
+    def test_trace(self):
+        '''Parameters().trace()'''
+
+        trace = self.p.trace('bar')
+
+        self.assertEqual('default.bar', trace['parameter'])
+        self.assertEqual('configuration_bar', trace['value'])
+        self.assertEqual('configuration', trace['source'])
+
+        self.assertEqual([ 'argument', 'configuration', 'environment', 'default' ], [ _['source'] for _ in trace['path'] ])
+        self.assertEqual([ False, True, False, True ], [ _['found'] for _ in trace['path'] ])
+        self.assertEqual([ False, True, False, False ], [ _['used'] for _ in trace['path'] ])
+
+    def test_tracing(self):
+        '''Parameters().tracing'''
+
+        self.assertFalse(self.p.tracing)
+
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append(record.getMessage())
+
+        handler = Handler()
+
+        crumbs_logger = logging.getLogger('crumbs')
+        crumbs_logger.addHandler(handler)
+        self.addCleanup(functools.partial(crumbs_logger.removeHandler, handler))
+
+        level = crumbs_logger.level
+        crumbs_logger.setLevel(logging.INFO)
+        self.addCleanup(functools.partial(crumbs_logger.setLevel, level))
+
+        self.p['foo']
+
+        self.assertEqual([], records)
+
+        self.p.tracing = True
+
+        self.p['foo']
+
+        self.assertIn('finding value of foo', records)
+
+    def test_tracing_explicit(self):
+        '''Parameters().tracing—kept by parse()'''
+
+        handler = logging.NullHandler()
+
+        crumbs_logger = logging.getLogger('crumbs')
+        crumbs_logger.addHandler(handler)
+        self.addCleanup(functools.partial(crumbs_logger.removeHandler, handler))
+
+        level = crumbs_logger.level
+        crumbs_logger.setLevel(logging.INFO)
+        self.addCleanup(functools.partial(crumbs_logger.setLevel, level))
+
+        self.p.tracing = False
+        self.p.parse()
+
+        self.assertFalse(self.p.tracing)
+
+    def test_stats_disabled(self):
+        '''Parameters().stats()'''
+
+        self.assertIsNone(Parameters().stats())
+
+
+class ParametersSchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.original_argv0 = sys.argv[0]
+
+        def _():
+            sys.argv[0] = self.original_argv0
+        self.addCleanup(_)
+
+        sys.argv[0] = 'crumbs'
+
+        self.schema = Schema()
+        self.schema.add_parameter(options = [ '--foo' ])
+        self.schema.add_parameter(group = 'bar', options = [ '--baz' ], default = 'default_baz')
+
+    def test_shared_schema(self):
+        '''Parameters(schema = …)—shared'''
+
+        p = Parameters(schema = self.schema)
+        p.parse()
+
+        q = Parameters(schema = self.schema)
+        q.add_source(DictionarySource({ 'default.foo': 'dictionary_foo' }, precedence = 400))
+        q.parse()
+
+        self.assertIsNone(p['foo'])
+        self.assertEqual('dictionary_foo', q['foo'])
+
+        self.assertEqual('default_baz', p['bar.baz'])
+        self.assertEqual('default_baz', q['bar.baz'])
+
+
+class ParametersOverlayTest(unittest.TestCase):
+    def setUp(self):
+        self.original_argv0 = sys.argv[0]
+
+        def _():
+            sys.argv[0] = self.original_argv0
+        self.addCleanup(_)
+
+        sys.argv[0] = 'crumbs'
+
+        os.environ['CRUMBS_FOO'] = 'environment_foo'
+        self.addCleanup(functools.partial(os.environ.pop, 'CRUMBS_FOO', None))
+
+        self.p = Parameters()
+        self.p.add_parameter(options = [ '--foo' ])
+        self.p.add_parameter(group = 'bar', options = [ '--baz-qux' ], default = 'default_baz')
+        self.p.parse()
+
+    def test_overlay(self):
+        '''Parameters().overlay()'''
+
+        overlay = self.p.overlay({ 'bar.baz-qux': 'overlay_baz' })
+
+        self.assertEqual('overlay_baz', overlay['bar.baz_qux'])
+        self.assertEqual('environment_foo', overlay['foo'])
+        self.assertEqual('default_baz', self.p['bar.baz_qux'])
+
+        self.assertEqual({ 'default.foo': 'environment_foo', 'bar.baz_qux': 'overlay_baz' }, overlay.snapshot())
+
+    def test_overlay_layered(self):
+        '''Parameters().overlay().overlay()'''
+
+        overlay = self.p.overlay({ 'foo': 'overlay_foo', 'bar.baz_qux': 'overlay_baz' }).overlay({ 'foo': 'request_foo' })
+
+        self.assertEqual('request_foo', overlay['foo'])
+        self.assertEqual('overlay_baz', overlay['bar.baz_qux'])
+
+    def test_overlay_unknown_parameter(self):
+        '''Parameters().overlay()—unknown parameter'''
+
+        with self.assertRaises(KeyError):
+            self.p.overlay({ 'quux': 'overlay_quux' })
+
+    @unittest.skipUnless(_contextvars_loaded, 'contextvars module not available')
+    def test_override(self):
+        '''Parameters().override()'''
+
+        with self.p.override({ 'foo': 'override_foo' }):
+            self.assertEqual('override_foo', self.p['foo'])
+
+            with self.p.override({ 'bar.baz_qux': 'override_baz' }):
+                self.assertEqual('override_foo', self.p['foo'])
+                self.assertEqual('override_baz', self.p['bar.baz_qux'])
+
+            self.assertEqual('default_baz', self.p['bar.baz_qux'])
+
+        self.assertEqual('environment_foo', self.p['foo'])
+
+    @unittest.skipUnless(_contextvars_loaded, 'contextvars module not available')
+    def test_override_other_thread(self):
+        '''Parameters().override()—other threads unaffected'''
+
+        values = []
+
+        with self.p.override({ 'foo': 'override_foo' }):
+            thread = threading.Thread(target = lambda: values.append(self.p['foo']))
+            thread.start()
+            thread.join()
+
+        self.assertEqual([ 'environment_foo' ], values)
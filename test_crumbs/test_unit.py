@@ -10,6 +10,7 @@ import copy
 import functools
 import logging
 import sys
+import warnings
 
 try:
     import unittest2 as unittest
@@ -17,7 +18,12 @@ except ImportError:
     import unittest
 
 from crumbs import Parameters
+from crumbs import Source
 from crumbs import _pyinotify_loaded
+from crumbs.completion import complete
+from crumbs.schema import Schema
+from crumbs.sources import EXPLICIT
+from crumbs.sources import record_explicit
 
 from test_crumbs.test_common import BaseParametersTest
 
@@ -48,6 +54,26 @@ class ParametersCreateTest(unittest.TestCase):
 
         self._assert_properties_set()
 
+    def test_parameters_create_schema(self):
+        '''Parameters(schema = Schema())'''
+
+        schema = Schema()
+
+        self.p = Parameters(schema = schema)
+
+        self._assert_properties_set()
+
+        self.assertIs(schema.parameters, self.p.parameters)
+        self.assertTrue(schema.frozen)
+
+    def test_parameters_create_schema_frozen(self):
+        '''Parameters(schema = Schema()).add_parameter()—frozen'''
+
+        self.p = Parameters(schema = Schema())
+
+        with self.assertRaises(RuntimeError):
+            self.p.add_parameter(options = [ '--foo' ])
+
 
 class ParametersAddParametersTest(BaseParametersTest):
     def _assert_parameters_add(self, parameters, group_prefix = True):
@@ -173,3 +199,174 @@ class ParametersParseTest(unittest.TestCase):
         self.p.parse(only_known = True)
 
         self.assertFalse(self.p.parsed)
+
+    def test_unparsed_lookups(self):
+        '''Parameters()[]—unparsed'''
+
+        self.p.add_parameter(options = [ '--foo' ])
+
+        with warnings.catch_warnings(record = True) as caught:
+            warnings.simplefilter('always')
+
+            for _ in range(3):
+                self.p['foo']
+
+            self.p['foo']
+
+        caught = [ _ for _ in caught if issubclass(_.category, RuntimeWarning) ]
+
+        self.assertEqual(2, len(caught))
+        self.assertEqual(__file__.replace('.pyc', '.py'), caught[0].filename)
+
+        self.assertEqual([ 3, 1 ], sorted(self.p.unparsed_lookups.values(), reverse = True))
+        self.assertEqual(set([ ( __name__, 'test_unparsed_lookups' ) ]), set([ _[:2] for _ in self.p.unparsed_lookups.keys() ]))
+
+
+class RecordExplicitTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = argparse.ArgumentParser()
+
+        record_explicit(self.parser.add_argument('--foo', default = 'foo'), self.parser)
+        record_explicit(self.parser.add_argument('--bar', action = 'store_true'), self.parser)
+        record_explicit(self.parser.add_argument('baz', nargs = '*'), self.parser)
+        record_explicit(self.parser.add_argument('count', nargs = '?', default = '5', type = int), self.parser)
+
+    def test_record_explicit(self):
+        '''record_explicit()'''
+
+        namespace = self.parser.parse_args([ '--foo', 'foo', 'baz' ])
+
+        self.assertEqual(set([ 'foo', 'baz' ]), getattr(namespace, EXPLICIT))
+
+    def test_record_explicit_empty_positional(self):
+        '''record_explicit()—empty positional'''
+
+        namespace = self.parser.parse_args([ '--bar' ])
+
+        self.assertEqual(set([ 'bar' ]), getattr(namespace, EXPLICIT))
+
+    def test_record_explicit_converted_default(self):
+        '''record_explicit()—positional with converted default'''
+
+        namespace = self.parser.parse_args([ '--bar' ])
+
+        self.assertEqual(5, namespace.count)
+        self.assertNotIn('count', getattr(namespace, EXPLICIT))
+
+    def test_record_explicit_positional(self):
+        '''record_explicit()—positional given'''
+
+        parser = argparse.ArgumentParser()
+
+        record_explicit(parser.add_argument('count', nargs = '?', default = '5', type = int), parser)
+
+        namespace = parser.parse_args([ '5' ])
+
+        self.assertEqual(set([ 'count' ]), getattr(namespace, EXPLICIT))
+
+
+class CountingSource(Source):
+    def __init__(self, values, **kwargs):
+        super(CountingSource, self).__init__(**kwargs)
+
+        self.values = values
+        self.requests = []
+
+    def get_many(self, keys):
+        self.requests.append(list(keys))
+
+        return dict([ ( _, self.values[_] ) for _ in keys if _ in self.values ])
+
+
+class SourceFetchTest(unittest.TestCase):
+    def test_fetch_without_ttl(self):
+        '''Source().fetch()—ttl = None'''
+
+        s = CountingSource({ 'default.foo': 'foo' })
+
+        self.assertEqual({ 'default.foo': 'foo' }, s.fetch([ 'default.foo', 'default.bar' ]))
+        self.assertEqual({ 'default.foo': 'foo' }, s.fetch([ 'default.foo', 'default.bar' ]))
+
+        self.assertEqual(2, len(s.requests))
+
+    def test_fetch_with_ttl(self):
+        '''Source(ttl = 60).fetch()'''
+
+        s = CountingSource({ 'default.foo': 'foo' }, ttl = 60)
+
+        self.assertEqual({ 'default.foo': 'foo' }, s.fetch([ 'default.foo', 'default.bar' ]))
+        self.assertEqual({ 'default.foo': 'foo' }, s.fetch([ 'default.foo', 'default.bar' ]))
+        self.assertEqual({}, s.fetch([ 'default.baz' ]))
+
+        self.assertEqual([ [ 'default.foo', 'default.bar' ], [ 'default.baz' ] ], s.requests)
+
+    def test_fetch_with_expired_ttl(self):
+        '''Source(ttl = 0).fetch()—expired'''
+
+        s = CountingSource({ 'default.foo': 'foo' }, ttl = -1)
+
+        s.fetch([ 'default.foo' ])
+        s.fetch([ 'default.foo' ])
+
+        self.assertEqual(2, len(s.requests))
+
+    def test_fetch_with_eviction(self):
+        '''Source(ttl = 60, maxsize = 1).fetch()—evicted'''
+
+        s = CountingSource({}, ttl = 60, maxsize = 1)
+
+        s.fetch([ 'default.foo' ])
+        s.fetch([ 'default.bar' ])
+        s.fetch([ 'default.foo' ])
+
+        self.assertEqual([ [ 'default.foo' ], [ 'default.bar' ], [ 'default.foo' ] ], s.requests)
+
+    def test_fetch_after_invalidate(self):
+        '''Source(ttl = 60).invalidate()'''
+
+        s = CountingSource({ 'default.foo': 'foo' }, ttl = 60)
+
+        s.fetch([ 'default.foo' ])
+        s.invalidate([ 'default.foo' ])
+        s.fetch([ 'default.foo' ])
+
+        self.assertEqual(2, len(s.requests))
+
+
+class CompleteTest(unittest.TestCase):
+    def setUp(self):
+        self.index = {
+            'version': 1,
+            'prog': 'crumbs',
+            'options': [
+                { 'options': [ '--verbose' ], 'group': 'optional arguments', 'choices': None, 'value': False, 'help': None },
+                { 'options': [ '--db-driver' ], 'group': 'db', 'choices': [ 'mysql', 'sqlite' ], 'value': True, 'help': None },
+            ],
+            'subcommands': {
+                'build': { 'help': None, 'options': [] },
+                'serve': { 'help': None, 'options': [ { 'options': [ '--serve-port' ], 'group': 'serve', 'choices': None, 'value': True, 'help': None } ] },
+            },
+        }
+
+    def test_complete_options(self):
+        '''complete()—options'''
+
+        self.assertEqual([ '--db-driver' ], complete(self.index, [ '--d' ]))
+
+    def test_complete_choices(self):
+        '''complete()—choices'''
+
+        self.assertEqual([ 'mysql', 'sqlite' ], complete(self.index, [ '--db-driver', '' ]))
+        self.assertEqual([], complete(self.index, [ 'serve', '--serve-port', '' ]))
+
+    def test_complete_subcommands(self):
+        '''complete()—subcommands'''
+
+        self.assertEqual([ 'build', 'serve' ], complete(self.index, [ '--verbose', '' ]))
+        self.assertEqual([], complete(self.index, [ 'serve', '' ]))
+
+    def test_complete_subcommand_options(self):
+        '''complete()—subcommand options'''
+
+        self.assertEqual([ '--serve-port' ], complete(self.index, [ 'serve', '--s' ]))
+        self.assertEqual([], complete(self.index, [ 'build', '--s' ]))